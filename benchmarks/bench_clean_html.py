@@ -0,0 +1,100 @@
+"""Compare the throughput, peak memory and output of the HTML cleaning backends.
+
+Runs every backend of ``src.html_cleaner`` over saved HTML pages and reports
+pages/sec, MB/s and peak traced memory, and whether the text matches the
+reference ``bs4`` backend:
+
+    python -m benchmarks.bench_clean_html
+    python -m benchmarks.bench_clean_html --fixtures path/to/saved/html --json results.json
+"""
+import argparse
+import glob
+import json
+import os
+import time
+import tracemalloc
+from typing import Dict, List
+
+from src.html_cleaner import HTML_BACKENDS, lxml
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'html')
+
+
+def load_pages(directory: str) -> Dict[str, str]:
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.htm*'))):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+
+def measure(backend: str, pages: Dict[str, str], min_time: float) -> Dict[str, float]:
+    """Clean all pages repeatedly for at least ``min_time`` seconds and return throughput figures."""
+    clean = HTML_BACKENDS[backend]
+    total_bytes = sum(len(html.encode('utf-8')) for html in pages.values())
+
+    rounds = 0
+    start = time.perf_counter()
+    while True:
+        for html in pages.values():
+            clean(html)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+
+    tracemalloc.start()
+    for html in pages.values():
+        clean(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'pages_per_sec': rounds * len(pages) / elapsed,
+        'mb_per_sec': rounds * total_bytes / elapsed / 1_000_000,
+        'peak_memory_mb': peak / 1_000_000,
+    }
+
+
+def mismatches(backend: str, pages: Dict[str, str]) -> List[str]:
+    """Return the pages on which a backend's text differs from the ``bs4`` backend."""
+    reference = HTML_BACKENDS['bs4']
+    return [name for name, html in pages.items() if HTML_BACKENDS[backend](html) != reference(html)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='Directory of saved .html pages')
+    parser.add_argument('--backends', nargs='+', default=list(HTML_BACKENDS), choices=list(HTML_BACKENDS))
+    parser.add_argument('--min-time', type=float, default=2.0, help='Seconds spent timing each backend')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    pages = load_pages(args.fixtures)
+    if not pages:
+        parser.error(f"No .html files found in {args.fixtures}")
+    total_mb = sum(len(html.encode('utf-8')) for html in pages.values()) / 1_000_000
+    print(f"{len(pages)} pages, {total_mb:.2f} MB from {args.fixtures}\n")
+    print(f"{'backend':<8} {'pages/s':>10} {'MB/s':>8} {'peak MB':>9}  output")
+
+    results = {}
+    for backend in args.backends:
+        if backend == 'lxml' and lxml is None:
+            print(f"{backend:<8} skipped, lxml is not installed")
+            continue
+        figures = measure(backend, pages, args.min_time)
+        different = mismatches(backend, pages)
+        figures['mismatched_pages'] = different
+        results[backend] = figures
+        output = 'identical' if not different else f"differs on {', '.join(different)}"
+        print(f"{backend:<8} {figures['pages_per_sec']:>10.1f} {figures['mb_per_sec']:>8.2f} "
+              f"{figures['peak_memory_mb']:>9.1f}  {output}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'fixtures': args.fixtures, 'pages': len(pages), 'total_mb': total_mb, 'results': results},
+                      f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
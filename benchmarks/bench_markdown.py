@@ -0,0 +1,157 @@
+"""Measure Postprocessor.document_to_markdown throughput against the previous per-pattern implementation.
+
+Converts a generated multi-megabyte text dump, or the given files, with both
+implementations, checks that the output is byte-identical and reports MB/s:
+
+    python -m benchmarks.bench_markdown
+    python -m benchmarks.bench_markdown --input data/output/example.com/*.txt --json results.json
+"""
+import argparse
+import json
+import random
+import re
+import time
+from typing import Callable, Dict, List
+
+from src.config_manager import ConfigManager
+from src.postprocessor import Postprocessor
+
+LINE_KINDS = [
+    lambda rng: '',
+    lambda rng: '   ',
+    lambda rng: f"# Heading {rng.randint(1, 99)}",
+    lambda rng: f"{' ' * rng.choice([0, 2, 4])}- bullet item {rng.random():.4f}",
+    lambda rng: f"{rng.randint(1, 20)}. numbered item",
+    lambda rng: f"$ pip install package-{rng.randint(1, 999)}",
+    lambda rng: f"  $ ls -la /var/log/{rng.randint(1, 9)}",
+    lambda rng: "> quoted text from a previous message",
+    lambda rng: "[a link](https://example.com/page)",
+    lambda rng: "**bold lead-in** followed by text",
+    lambda rng: "*emphasis* and more",
+    lambda rng: "`inline code` at the start",
+    lambda rng: "```",
+    lambda rng: "  indented with unicode spaces",
+    lambda rng: ' '.join(rng.choice(['lorem', 'ipsum', 'dolor', 'sit', 'amet', '$5', '*', '#tag', '1.5'])
+                         for _ in range(rng.randint(3, 30))),
+]
+LINE_WEIGHTS = [8, 1, 2, 4, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 30]
+
+
+def legacy_document_to_markdown(input_text: str, progress_callback: Callable[[int, int], None],
+                                progress_update_frequency: int = 10) -> str:
+    """The implementation that ran up to nine uncompiled patterns per line, kept as the baseline."""
+    markdown_content = []
+    bullet_point_pattern = re.compile(r"^\s*[-*+]\s+.*")
+    numbered_list_pattern = re.compile(r"^\s*\d+\.\s+.*")
+    code_block_pattern = re.compile(r"^\s*\$.*")
+
+    def detect_existing_markdown(line: str) -> bool:
+        markdown_patterns = [
+            r"^\s*#+\s+.*", r"^\s*[-*+]\s+.*", r"^\s*\d+\.\s+.*", r"^\s*>.*", r"^\s*```",
+            r"^\s*`[^`]+`", r"^\s*\[.*\]\(.*\)", r"^\s*\*\*[^*]+\*\*", r"^\s*\*[^*]+\*",
+        ]
+        return any(re.match(pattern, line) for pattern in markdown_patterns)
+
+    def format_bullet_point(line: str, indent_level: int, is_numbered: bool = False) -> str:
+        indent = "  " * indent_level
+        if is_numbered:
+            return f"{indent}{line.strip()}\n"
+        return f"{indent}- {line.strip()[1:]}\n"
+
+    lines = input_text.splitlines()
+    total_lines = len(lines)
+    inside_code_block = False
+
+    for idx, line in enumerate(lines):
+        if not line.strip():
+            markdown_content.append("\n")
+            continue
+        if detect_existing_markdown(line):
+            markdown_content.append(line + "\n")
+            continue
+        if code_block_pattern.match(line):
+            if not inside_code_block:
+                markdown_content.append("```\n")
+                inside_code_block = True
+            markdown_content.append(f"{line.strip()}\n")
+        elif inside_code_block:
+            markdown_content.append("```\n\n")
+            inside_code_block = False
+        elif bullet_point_pattern.match(line):
+            indentation = len(line) - len(line.lstrip())
+            markdown_content.append(format_bullet_point(line, indentation // 2))
+        elif numbered_list_pattern.match(line):
+            indentation = len(line) - len(line.lstrip())
+            markdown_content.append(format_bullet_point(line, indentation // 2, is_numbered=True))
+        else:
+            markdown_content.append(f"{line.strip()}\n\n")
+        if idx % progress_update_frequency == 0:
+            progress_callback(idx + 1, total_lines)
+
+    return ''.join(markdown_content)
+
+
+def generate_text(size_mb: float, seed: int = 42) -> str:
+    rng = random.Random(seed)
+    lines: List[str] = []
+    size = 0
+    while size < size_mb * 1_000_000:
+        line = rng.choices(LINE_KINDS, LINE_WEIGHTS)[0](rng)
+        lines.append(line)
+        size += len(line) + 1
+    return '\n'.join(lines)
+
+
+def throughput(convert: Callable[[str], str], text: str, min_time: float) -> float:
+    size_mb = len(text.encode('utf-8')) / 1_000_000
+    rounds = 0
+    start = time.perf_counter()
+    while True:
+        convert(text)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return rounds * size_mb / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--input', nargs='*', help='Text files to convert instead of the generated dump')
+    parser.add_argument('--size-mb', type=float, default=5.0, help='Size of the generated dump')
+    parser.add_argument('--min-time', type=float, default=3.0, help='Seconds spent timing each implementation')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    if args.input:
+        texts = []
+        for path in args.input:
+            with open(path, 'r', encoding='utf-8') as f:
+                texts.append(f.read())
+        text = '\n'.join(texts)
+    else:
+        text = generate_text(args.size_mb)
+
+    postprocessor = Postprocessor(ConfigManager('configs/config.yaml'))
+    no_progress = lambda current, total: None
+    implementations: Dict[str, Callable[[str], str]] = {
+        'before': lambda t: legacy_document_to_markdown(t, no_progress),
+        'after': lambda t: postprocessor.document_to_markdown(t, no_progress),
+    }
+
+    identical = implementations['before'](text) == implementations['after'](text)
+    size_mb = len(text.encode('utf-8')) / 1_000_000
+    print(f"{size_mb:.2f} MB, {text.count(chr(10)) + 1} lines, output {'byte-identical' if identical else 'DIFFERS'}")
+
+    results = {'size_mb': size_mb, 'identical': identical}
+    for name, convert in implementations.items():
+        results[f'{name}_mb_per_sec'] = throughput(convert, text, args.min_time)
+        print(f"{name:<7} {results[f'{name}_mb_per_sec']:8.2f} MB/s")
+    print(f"speedup {results['after_mb_per_sec'] / results['before_mb_per_sec']:.1f}x")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""Serve a generated, deterministic site from a local HTTP server for the benchmarks.
+
+The site has four kinds of pages, each linked from ``/index.html``:
+
+- ``/static/<n>.html``: server-rendered articles
+- ``/scroll/<n>.html``: a client-rendered feed that loads more items on every scroll
+- ``/heavy/<n>.html``: articles referencing large images, fonts, stylesheets and scripts
+- ``/slow/<n>.html``: articles answered after a fixed, per-page delay
+
+Run it on its own to look at the pages in a browser:
+
+    python -m benchmarks.fixture_server --port 8000
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.generate_fixtures import article_page, paragraph, sentence
+
+KINDS = ('static', 'scroll', 'heavy', 'slow')
+
+ASSET_SIZES = {
+    'jpg': (200_000, 'image/jpeg'),
+    'woff2': (60_000, 'font/woff2'),
+    'css': (40_000, 'text/css'),
+    'js': (80_000, 'application/javascript'),
+}
+
+
+class FixtureSite:
+    """The pages of the benchmark site, generated on demand from a seed."""
+
+    def __init__(self, pages_per_kind: int = 20, seed: int = 42, scroll_batches: int = 5,
+                 slow_delay: Tuple[float, float] = (0.2, 1.0)):
+        """
+        Initialize the FixtureSite.
+
+        Args:
+            pages_per_kind (int): Number of pages of each kind.
+            seed (int): Seed of the generated content.
+            scroll_batches (int): Number of item batches a scroll page loads before it ends.
+            slow_delay (Tuple[float, float]): Range of the response delay of slow pages, in seconds.
+        """
+        self.pages_per_kind = pages_per_kind
+        self.seed = seed
+        self.scroll_batches = scroll_batches
+        self.slow_delay = slow_delay
+        # Rendered pages and item batches, kept per site rather than in a class-wide lru_cache.
+        self._rendered: Dict[tuple, str] = {}
+
+    def _cached(self, key: tuple, render) -> str:
+        if key not in self._rendered:
+            self._rendered[key] = render()
+        return self._rendered[key]
+
+    def rng(self, *key) -> random.Random:
+        return random.Random('-'.join(map(str, (self.seed,) + key)))
+
+    def paths(self, kind: str) -> List[str]:
+        """Return the paths of all pages of a kind."""
+        return [f"/{kind}/{n}.html" for n in range(self.pages_per_kind)]
+
+    def delay(self, n: int) -> float:
+        return self.rng('delay', n).uniform(*self.slow_delay)
+
+    def page(self, kind: str, n: int) -> str:
+        return self._cached(('page', kind, n), lambda: self._render_page(kind, n))
+
+    def _render_page(self, kind: str, n: int) -> str:
+        rng = self.rng(kind, n)
+        if kind == 'scroll':
+            return self.scroll_page(n)
+        html = article_page(rng, 20)
+        if kind == 'heavy':
+            assets = ''.join(f'<img src="/assets/{n}-{i}.jpg" alt="">' for i in range(25))
+            head = ('<link rel="stylesheet" href="/assets/site.css">'
+                    '<link rel="preload" as="font" href="/assets/body.woff2" crossorigin>'
+                    '<script src="/assets/vendor.js"></script>')
+            html = html.replace('</head>', head + '</head>', 1).replace('</article>', assets + '</article>', 1)
+        return html
+
+    def scroll_page(self, n: int) -> str:
+        return ('<!DOCTYPE html><html><head><title>Feed</title></head><body><div id="root"></div><script>'
+                f'let batch = 0; const last = {self.scroll_batches};'
+                'async function more() {'
+                f'  const response = await fetch("/scroll/{n}/items?batch=" + batch++);'
+                '  document.getElementById("root").insertAdjacentHTML("beforeend", await response.text());'
+                '}'
+                'more();'
+                'window.addEventListener("scroll", () => {'
+                '  if (batch < last && window.innerHeight + window.scrollY >= document.body.scrollHeight - 50) more();'
+                '});'
+                '</script></body></html>')
+
+    def scroll_items(self, n: int, batch: int) -> str:
+        return self._cached(('items', n, batch), lambda: self._render_scroll_items(n, batch))
+
+    def _render_scroll_items(self, n: int, batch: int) -> str:
+        rng = self.rng('items', n, batch)
+        return ''.join(f'<article class="item"><h3>{sentence(rng, 5)}</h3><p>{paragraph(rng, 3)}</p></article>'
+                       for _ in range(10))
+
+    def index(self) -> str:
+        links = ''.join(f'<li><a href="{path}">{path}</a></li>' for kind in KINDS for path in self.paths(kind))
+        return f'<!DOCTYPE html><html><body><main><h1>Benchmark site</h1><ul>{links}</ul></main></body></html>'
+
+    def respond(self, path: str, query: Dict[str, List[str]]) -> Optional[Tuple[bytes, str, float]]:
+        """Return the body, content type and delay for a path, or None if there is no such page."""
+        parts = path.strip('/').split('/')
+        if path in ('/', '/index.html'):
+            return self.index().encode(), 'text/html; charset=utf-8', 0.0
+        if len(parts) == 2 and parts[0] == 'assets':
+            extension = parts[1].rsplit('.', 1)[-1]
+            if extension in ASSET_SIZES:
+                size, content_type = ASSET_SIZES[extension]
+                return b'\0' * size, content_type, 0.0
+        if len(parts) == 3 and parts[0] == 'scroll' and parts[2] == 'items' and parts[1].isdigit():
+            batch = int(query.get('batch', ['0'])[0])
+            return self.scroll_items(int(parts[1]), batch).encode(), 'text/html; charset=utf-8', 0.0
+        if len(parts) == 2 and parts[0] in KINDS and parts[1].endswith('.html'):
+            number = parts[1][:-len('.html')]
+            if number.isdigit() and int(number) < self.pages_per_kind:
+                n = int(number)
+                delay = self.delay(n) if parts[0] == 'slow' else 0.0
+                return self.page(parts[0], n).encode(), 'text/html; charset=utf-8', delay
+        return None
+
+
+class FixtureServer:
+    """Threaded HTTP server for a FixtureSite, running in the background."""
+
+    def __init__(self, site: FixtureSite, host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize the FixtureServer; port 0 picks a free port.
+
+        Args:
+            site (FixtureSite): The site to serve.
+            host (str): Interface to listen on.
+            port (int): Port to listen on.
+        """
+        self.site = site
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                answer = site.respond(url.path, parse_qs(url.query))
+                if answer is None:
+                    self.send_error(404)
+                    return
+                body, content_type, delay = answer
+                if delay:
+                    time.sleep(delay)
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def __enter__(self) -> 'FixtureServer':
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--pages', type=int, default=20, help='Pages of each kind')
+    args = parser.parse_args()
+    with FixtureServer(FixtureSite(args.pages), port=args.port) as server:
+        print(f"Serving the benchmark site on {server.base_url}/index.html, press Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""Generate the synthetic HTML pages used by the benchmarks.
+
+The pages are deterministic for a given seed, so the files under
+``benchmarks/fixtures/html`` can be regenerated at any time:
+
+    python -m benchmarks.generate_fixtures
+"""
+import argparse
+import os
+import random
+from typing import Dict
+
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore '
+         'et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris nisi aliquip '
+         'ex ea commodo consequat duis aute irure in reprehenderit voluptate velit esse cillum fugiat nulla').split()
+
+
+def sentence(rng: random.Random, words: int = 12) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def paragraph(rng: random.Random, sentences: int = 5) -> str:
+    return ' '.join(sentence(rng, rng.randint(6, 18)) for _ in range(sentences))
+
+
+def chrome(rng: random.Random) -> Dict[str, str]:
+    """Navigation, header, footer and sidebar shared by most pages."""
+    nav = ''.join(f'<li><a href="/section/{i}">{rng.choice(WORDS).title()}</a></li>' for i in range(40))
+    return {
+        'head': ('<head><meta charset="utf-8"><title>Fixture page</title>'
+                 '<link rel="stylesheet" href="/static/site.css">'
+                 '<style>body { font-family: sans-serif; } .content { margin: 0 auto; }</style>'
+                 '<script>window.dataLayer = window.dataLayer || []; function gtag(){dataLayer.push(arguments);}</script>'
+                 '</head>'),
+        'header': f'<header><div class="logo">Site</div><nav><ul>{nav}</ul></nav></header>',
+        'aside': f'<aside><h3>Related</h3><ul>{"".join(f"<li>{sentence(rng, 6)}</li>" for _ in range(15))}</ul></aside>',
+        'footer': f'<footer><p>{sentence(rng)}</p><nav><a href="/privacy">Privacy</a></nav></footer>',
+        'script': '<script>(function(){ var x = "<div>not text</div>"; console.log(x); })();</script>',
+    }
+
+
+def article_page(rng: random.Random, paragraphs: int) -> str:
+    parts = chrome(rng)
+    body = ''.join(f'<h2>{sentence(rng, 5)}</h2><p>{paragraph(rng)}</p>' for _ in range(paragraphs))
+    return (f'<!DOCTYPE html><html>{parts["head"]}<body>{parts["header"]}'
+            f'<main><article><h1>{sentence(rng, 6)}</h1>{body}</article></main>'
+            f'{parts["aside"]}{parts["footer"]}{parts["script"]}</body></html>')
+
+
+def content_div_page(rng: random.Random, paragraphs: int) -> str:
+    parts = chrome(rng)
+    items = ''.join(f'<li>{sentence(rng, 8)} &amp; {rng.choice(WORDS)} &copy; &#8212; &nbsp;</li>' for _ in range(paragraphs))
+    return (f'<html>{parts["head"]}<body>{parts["header"]}'
+            f'<div id="wrapper"><div class="page content wide"><p>{paragraph(rng)}</p><ul>{items}</ul>'
+            f'<table><tr><th>Key</th><th>Value</th></tr>'
+            f'{"".join(f"<tr><td>{rng.choice(WORDS)}</td><td>{rng.randint(0, 9999)}</td></tr>" for _ in range(paragraphs))}'
+            f'</table></div></div>{parts["footer"]}</body></html>')
+
+
+def body_only_page(rng: random.Random, paragraphs: int) -> str:
+    parts = chrome(rng)
+    body = ''.join(f'<div class="block"><span>{sentence(rng)}</span><br>{paragraph(rng, 3)}<!-- comment {i} --></div>'
+                   for i in range(paragraphs))
+    return (f'<html>{parts["head"]}<body>{parts["header"]}{body}'
+            f'<template><p>template text</p></template><ruby>漢<rt>kan</rt></ruby>{parts["footer"]}</body></html>')
+
+
+def malformed_page(rng: random.Random, paragraphs: int) -> str:
+    parts = chrome(rng)
+    body = ''.join(f'<p>{sentence(rng)}<b>{sentence(rng, 4)}<i>{sentence(rng, 3)}</b></i>'
+                   f'<div><span>{paragraph(rng, 2)}</div></span></td>' for _ in range(paragraphs))
+    return f'{parts["head"]}<body>{parts["header"]}<article>{body}<img src="/a.png"/><br/><hr>{parts["aside"]}'
+
+
+def listing_page(rng: random.Random, items: int) -> str:
+    parts = chrome(rng)
+    rows = ''.join(f'<article class="card"><h3><a href="/item/{i}">{sentence(rng, 5)}</a></h3>'
+                   f'<p>{paragraph(rng, 2)}</p><aside>Sponsored {i}</aside></article>' for i in range(items))
+    return (f'<!DOCTYPE html><html>{parts["head"]}<body>{parts["header"]}'
+            f'<main><section class="list">{rows}</section></main>{parts["footer"]}{parts["script"] * 20}</body></html>')
+
+
+FIXTURES = {
+    'article_small.html': (article_page, 5),
+    'article_large.html': (article_page, 400),
+    'content_div.html': (content_div_page, 300),
+    'body_only.html': (body_only_page, 200),
+    'malformed.html': (malformed_page, 200),
+    'listing_1mb.html': (listing_page, 3500),
+}
+
+
+def generate(directory: str, seed: int = 42) -> None:
+    """Write every fixture page to ``directory``."""
+    os.makedirs(directory, exist_ok=True)
+    for name, (builder, size) in FIXTURES.items():
+        rng = random.Random(f"{seed}-{name}")
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            f.write(builder(rng, size))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'fixtures', 'html'))
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    generate(args.output, args.seed)
\ No newline at end of file
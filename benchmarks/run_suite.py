@@ -0,0 +1,247 @@
+"""Run the offline benchmark suite against a local fixture site and write the results as JSON.
+
+Scrapes each kind of page of ``benchmarks.fixture_server`` with ``Scraper.scrape_urls``,
+extracts the links of its index page with ``LinkExtractor.extract_links`` and
+measures the HTML cleaning and Markdown conversion throughput. Pages/sec and
+per-URL latency percentiles are reported for the network stages and MB/s for
+the postprocessor. Nothing leaves the machine, and everything the scraper
+writes goes to a temporary directory:
+
+    python -m benchmarks.run_suite --json results/before.json
+    python -m benchmarks.run_suite --json results/after.json --compare results/before.json
+
+Scenarios that need the browser are reported with their error if Chromium is
+not installed, and the remaining ones still run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.bench_clean_html import DEFAULT_FIXTURES, load_pages, measure
+from benchmarks.bench_markdown import generate_text, throughput
+from benchmarks.fixture_server import FixtureServer, FixtureSite
+from src.config_manager import ConfigManager
+from src.html_cleaner import HTML_BACKENDS, lxml
+from src.link_extractor import LinkExtractor
+from src.postprocessor import Postprocessor
+from src.scraper import Scraper
+
+CONFIG_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'configs', 'config.yaml'))
+
+# Page kind scraped by each scenario and the configuration it runs with.
+SCRAPE_SCENARIOS: Dict[str, Dict[str, Any]] = {
+    'static_http': {'kind': 'static', 'config': {'fetch_mode': 'auto'}},
+    'static_browser': {'kind': 'static', 'config': {'fetch_mode': 'browser'}},
+    'infinite_scroll': {'kind': 'scroll', 'config': {'fetch_mode': 'auto'}},
+    'heavy_assets': {'kind': 'heavy', 'config': {'fetch_mode': 'browser'}},
+    'slow_endpoints': {'kind': 'slow', 'config': {'fetch_mode': 'auto'}},
+}
+
+# Settings shared by every scenario: no politeness pauses against our own
+# server, and no fetch cache, so that every run does the same work.
+BENCHMARK_CONFIG = {'delay_min': 0, 'delay_max': 0, 'fetch_cache': False, 'max_per_host': 4}
+
+
+class TimedScraper(Scraper):
+    """Scraper that records how long each URL took."""
+
+    def __init__(self, config: ConfigManager):
+        super().__init__(config)
+        self.latencies: List[float] = []
+
+    async def scrape_url(self, page, url: str) -> bool:
+        start = time.perf_counter()
+        try:
+            return await super().scrape_url(page, url)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def load_config(overrides: Dict[str, Any]) -> ConfigManager:
+    config = ConfigManager(CONFIG_FILE)
+    config.update(BENCHMARK_CONFIG)
+    config.update(overrides)
+    return config
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Return the nearest-rank p50/p90/p99 and the maximum of some latencies, in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))] * 1000
+
+    return {'p50_ms': rank(0.50), 'p90_ms': rank(0.90), 'p99_ms': rank(0.99), 'max_ms': ordered[-1] * 1000}
+
+
+def run_scenario(run: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Run one scenario, turning an exception into an ``error`` entry so the suite carries on."""
+    try:
+        return run()
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"}
+
+
+def bench_scrape(server: FixtureServer, kind: str, overrides: Dict[str, Any]) -> Dict[str, Any]:
+    scraper = TimedScraper(load_config(overrides))
+    urls = [server.url(path) for path in server.site.paths(kind)]
+    start = time.perf_counter()
+    successes, failures = asyncio.run(scraper.scrape_urls(urls))
+    elapsed = time.perf_counter() - start
+    return {
+        'urls': len(urls),
+        'successful': successes,
+        'failed': failures,
+        'seconds': elapsed,
+        'pages_per_sec': len(urls) / elapsed,
+        'latency': percentiles(scraper.latencies),
+        'fetched_via_http': scraper.fetch_counts['http'],
+        'fetched_via_browser': scraper.fetch_counts['browser'],
+        'blocked_requests': scraper.resource_blocker.blocked_requests,
+    }
+
+
+def bench_extract_links(server: FixtureServer, repeats: int) -> Dict[str, Any]:
+    extractor = LinkExtractor(load_config({}))
+    latencies = []
+    links = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        links = len(asyncio.run(extractor.extract_links(server.url('/index.html'))))
+        latencies.append(time.perf_counter() - start)
+    if not links:
+        raise RuntimeError("no links were extracted, see logs/link_extractor.log")
+    return {
+        'repeats': repeats,
+        'links': links,
+        'pages_per_sec': repeats / sum(latencies),
+        'latency': percentiles(latencies),
+    }
+
+
+def bench_postprocessor(markdown_mb: float, min_time: float) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+
+    pages = load_pages(DEFAULT_FIXTURES)
+    for backend in HTML_BACKENDS:
+        if backend == 'lxml' and lxml is None:
+            continue
+        results[f'clean_html_{backend}'] = measure(backend, pages, min_time)
+
+    postprocessor = Postprocessor(load_config({}))
+    convert = lambda text: postprocessor.document_to_markdown(text, lambda current, total: None)
+    results['document_to_markdown'] = {'mb_per_sec': throughput(convert, generate_text(markdown_mb), min_time)}
+
+    input_dir = Path('convert_input')
+    input_dir.mkdir(exist_ok=True)
+    for n in range(20):
+        (input_dir / f'page_{n}.txt').write_text(generate_text(markdown_mb / 20, seed=n), encoding='utf-8')
+    total_mb = sum(f.stat().st_size for f in input_dir.iterdir()) / 1_000_000
+    config = load_config({'incremental_conversion': False})
+    start = time.perf_counter()
+    Postprocessor(config).convert_files(str(input_dir), 'convert_output')
+    results['convert_files'] = {'files': 20, 'mb_per_sec': total_mb / (time.perf_counter() - start)}
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(CONFIG_FILE)).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print the throughput of every benchmark next to a baseline run."""
+    def rates(section: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+        found = {}
+        for name, value in section.items():
+            if isinstance(value, dict):
+                found.update(rates(value, f"{prefix}{name}."))
+            elif name in ('pages_per_sec', 'mb_per_sec', 'p50_ms', 'p90_ms', 'p99_ms'):
+                found[prefix + name] = value
+        return found
+
+    current, previous = rates(results['results']), rates(baseline['results'])
+    print(f"\nCompared with {baseline['environment'].get('commit')} ({baseline['environment'].get('timestamp')}):")
+    for name in sorted(current.keys() & previous.keys()):
+        if previous[name]:
+            print(f"  {name:<55} {previous[name]:>10.2f} -> {current[name]:>10.2f}  ({current[name] / previous[name]:.2f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=20, help='Pages of each kind on the fixture site')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCRAPE_SCENARIOS), default=list(SCRAPE_SCENARIOS))
+    parser.add_argument('--link-repeats', type=int, default=5, help='Link extractions of the index page')
+    parser.add_argument('--markdown-mb', type=float, default=5.0, help='Size of the text converted to Markdown')
+    parser.add_argument('--min-time', type=float, default=2.0, help='Seconds spent timing each postprocessor benchmark')
+    parser.add_argument('--skip-browser', action='store_true', help='Skip the scenarios that need Chromium')
+    parser.add_argument('--json', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare with')
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results: Dict[str, Any] = {'scrape': {}}
+    site = FixtureSite(args.pages)
+    workdir = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch, FixtureServer(site) as server:
+        # The components write to data/ and logs/ relative to the working directory.
+        os.chdir(scratch)
+        os.makedirs('logs')
+        try:
+            for name in args.scenarios:
+                scenario = SCRAPE_SCENARIOS[name]
+                if args.skip_browser and (scenario['config']['fetch_mode'] == 'browser' or scenario['kind'] == 'scroll'):
+                    continue
+                print(f"scrape {name} ...", file=sys.stderr)
+                results['scrape'][name] = run_scenario(
+                    lambda scenario=scenario: bench_scrape(server, scenario['kind'], scenario['config']))
+            if not args.skip_browser:
+                print("extract_links ...", file=sys.stderr)
+                results['extract_links'] = run_scenario(lambda: bench_extract_links(server, args.link_repeats))
+            print("postprocessor ...", file=sys.stderr)
+            results['postprocessor'] = run_scenario(lambda: bench_postprocessor(args.markdown_mb, args.min_time))
+        finally:
+            os.chdir(workdir)
+
+    report = {
+        'environment': environment(),
+        'parameters': {'pages_per_kind': args.pages, 'link_repeats': args.link_repeats,
+                       'markdown_mb': args.markdown_mb, 'min_time': args.min_time},
+        'results': results,
+    }
+    print(json.dumps(report, indent=2))
+    if json_path:
+        os.makedirs(os.path.dirname(json_path), exist_ok=True)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if baseline:
+        compare(report, baseline)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -1,7 +1,12 @@
+import sys
 from src.integrated_app import IntegratedApp
+from src.settings import ConfigError
 
 def main():
-    app = IntegratedApp()
+    try:
+        app = IntegratedApp()
+    except ConfigError as e:
+        sys.exit(str(e))
     app.run()
 
 if __name__ == "__main__":
@@ -19,16 +19,17 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.7",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
     ],
-    python_requires=">=3.7",
+    python_requires=">=3.10",
     install_requires=[
         "aiofiles>=0.8.0",
         "asyncio>=3.4.3",
         "beautifulsoup4>=4.9.3",
         "gradio>=3.23.0",
+        "httpx>=0.23.0",
+        "numpy>=1.20.0",
         "pandas>=1.3.3",
         "playwright>=1.17.2",
         "PyYAML>=5.4.1",
@@ -36,6 +37,7 @@ setup(
     entry_points={
         "console_scripts": [
             "web_content_processor=src.integrated_app:main",
+            "web_content_processor_cli=src.cli:main",
         ],
     },
 )
\ No newline at end of file
@@ -0,0 +1,168 @@
+import argparse
+import asyncio
+import os
+import sys
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from src.config_manager import ConfigManager
+from src.settings import ConfigError
+
+
+def print_progress(fraction: float, desc: Optional[str] = None) -> None:
+    """Progress callback that rewrites a single status line on stderr."""
+    sys.stderr.write(f"\r{fraction:6.1%} {desc or ''}\033[K")
+    sys.stderr.flush()
+
+
+def print_summary(summary: Dict[str, float]) -> None:
+    """Print the figures of a run, one per line."""
+    width = max(len(name) for name in summary)
+    for name, value in summary.items():
+        print(f"{name:<{width}}  {value}")
+
+
+def run_extract(config: ConfigManager, args: argparse.Namespace, progress: Optional[Callable]) -> int:
+    from src.link_extractor import LinkExtractor
+
+    output_file = args.output or os.path.join('data', 'input', f"{urlparse(args.url).netloc}_links.txt")
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    extractor = LinkExtractor(config)
+    pages_fetched, links_written = asyncio.run(
+        extractor.discover(args.url, output_file, args.depth, args.max_pages, progress))
+    print_summary({"Pages Crawled": pages_fetched, "Sitemaps Read": extractor.sitemaps_read,
+                   "Links Saved": links_written, "Duplicates Skipped": extractor.duplicate_links})
+    print(f"Links saved to {output_file}")
+    return 0 if links_written else 1
+
+
+def run_scrape(config: ConfigManager, args: argparse.Namespace, progress: Optional[Callable]) -> int:
+    from src.scraper import Scraper
+
+    scraper = Scraper(config)
+    urls = scraper.read_urls_from_file(args.urls_file)
+    if not urls:
+        print(f"No valid URLs found in {args.urls_file}", file=sys.stderr)
+        return 1
+    successes, failures = scraper.scrape(urls, progress, resume=False if args.fresh else None)
+    print_summary(scraper.run_summary(len(urls), successes, failures))
+    return 0
+
+
+def run_convert(config: ConfigManager, args: argparse.Namespace, progress: Optional[Callable]) -> int:
+    from src.postprocessor import Postprocessor
+
+    message = Postprocessor(config).convert_files(args.input_dir, args.output_dir or args.input_dir, progress)
+    print(message)
+    return 1 if message.startswith("Error") else 0
+
+
+def run_pipeline(config: ConfigManager, args: argparse.Namespace, progress: Optional[Callable]) -> int:
+    from src.pipeline import Pipeline
+
+    pipeline = Pipeline(config)
+    urls = pipeline.scraper.read_urls_from_file(args.urls_file) if args.urls_file else []
+    if not args.url and not urls:
+        print("Give a start URL with --url and/or a file of URLs with --urls-file", file=sys.stderr)
+        return 1
+    asyncio.run(pipeline.run(args.url, urls, args.depth, args.max_pages, progress))
+    print_summary(pipeline.run_summary())
+    return 0
+
+
+def run_reprocess(config: ConfigManager, args: argparse.Namespace, progress: Optional[Callable]) -> int:
+    from src.reprocessor import Reprocessor
+
+    reprocessor = Reprocessor(config)
+    counts = reprocessor.run(args.markdown, progress)
+    print_summary(reprocessor.run_summary())
+    return 1 if counts['failed'] else 0
+
+
+def run_dedup(config: ConfigManager, args: argparse.Namespace, progress: Optional[Callable]) -> int:
+    from src.dedup import Deduplicator
+
+    if not os.path.isdir(args.directory):
+        print(f"{args.directory} is not a directory", file=sys.stderr)
+        return 1
+    counts = Deduplicator(config).run(args.directory, progress)
+    print_summary({"Documents": counts['documents'], "Boilerplate Lines": counts['boilerplate_lines'],
+                   "Documents Stripped": counts['stripped_documents'], "Bytes Removed": counts['bytes_removed'],
+                   "Near Duplicates": counts['near_duplicates']})
+    print(f"Report saved to {os.path.join(args.directory, 'dedup_report.json')}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='web_content_processor_cli',
+        description='Extract links, scrape pages and convert them to Markdown without the web interface.')
+    parser.add_argument('--config', default=os.path.join('configs', 'config.yaml'),
+                        help='Configuration file (.yaml or .json)')
+    parser.add_argument('--progress', action='store_true', help='Show progress on stderr')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    extract = commands.add_parser('extract', help='Crawl a site and save its internal links')
+    extract.add_argument('url', help='Page to start from')
+    extract.add_argument('--depth', type=int, default=0, help='Link hops to follow; 0 only reads the start page')
+    extract.add_argument('--max-pages', type=int, help='Maximum number of pages to fetch')
+    extract.add_argument('--discovery', choices=('crawl', 'sitemap', 'auto'),
+                         help='Crawl the pages, read the sitemaps, or read the sitemaps and crawl if they list nothing '
+                              '(default: link_discovery setting)')
+    extract.add_argument('--output', help='File to save the links to (default: data/input/<host>_links.txt)')
+    extract.set_defaults(handler=run_extract)
+
+    scrape = commands.add_parser('scrape', help='Scrape the text of every URL in a file')
+    scrape.add_argument('urls_file', help='File with one URL per line')
+    scrape.add_argument('--fresh', action='store_true',
+                        help='Scrape every URL again instead of resuming an interrupted run of the same file')
+    scrape.set_defaults(handler=run_scrape)
+
+    convert = commands.add_parser('convert', help='Convert scraped text files to Markdown')
+    convert.add_argument('input_dir', nargs='?', default=os.path.join('data', 'output'))
+    convert.add_argument('output_dir', nargs='?', help='Defaults to the input directory')
+    convert.set_defaults(handler=run_convert)
+
+    pipeline = commands.add_parser('pipeline', help='Crawl and/or scrape straight to Markdown in one pass')
+    pipeline.add_argument('--url', help='Page to scrape and crawl from')
+    pipeline.add_argument('--urls-file', help='File with further URLs, one per line')
+    pipeline.add_argument('--depth', type=int, default=0, help='Link hops to follow from --url')
+    pipeline.add_argument('--max-pages', type=int, help='Maximum number of pages to fetch while crawling')
+    pipeline.add_argument('--discovery', choices=('crawl', 'sitemap', 'auto'),
+                          help='How to find the links of --url (default: link_discovery setting)')
+    pipeline.set_defaults(handler=run_pipeline)
+
+    reprocess = commands.add_parser('reprocess', help='Clean the cached raw HTML again without fetching anything')
+    reprocess.add_argument('--markdown', action='store_true', help='Also convert the text to markdown')
+    reprocess.set_defaults(handler=run_reprocess)
+
+    dedup = commands.add_parser('dedup', help='Strip site boilerplate from scraped text and find near-duplicate pages')
+    dedup.add_argument('directory', nargs='?', default=os.path.join('data', 'output'),
+                       help='Scraped text files, one subdirectory per host, or a shard directory')
+    dedup.set_defaults(handler=run_dedup)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface and return its exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        config = ConfigManager(args.config)
+        if getattr(args, 'discovery', None):
+            config.update({'link_discovery': args.discovery})
+    except ConfigError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    # The components log to files under logs/.
+    os.makedirs('logs', exist_ok=True)
+    progress = print_progress if args.progress else None
+    try:
+        return args.handler(config, args, progress)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if progress:
+            sys.stderr.write('\n')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
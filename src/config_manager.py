@@ -1,48 +1,126 @@
+import os
 import yaml
 import json
-from typing import Any, Dict
+import dataclasses
+from typing import Any, Dict, Mapping, Optional
+from src.settings import ConfigError, DomainProfile, Settings, build_settings, parse_setting, setting_names
+
+# Environment variables with this prefix override settings, e.g. WCP_MAX_WORKERS=8.
+ENV_PREFIX = 'WCP_'
 
 class ConfigManager:
     """Manages configuration settings for the integrated application."""
 
-    def __init__(self, config_file: str):
+    def __init__(self, config_file: str, environ: Optional[Mapping[str, str]] = None):
         """
         Initialize the ConfigManager.
 
         Args:
             config_file (str): Path to the main configuration file.
+            environ (Optional[Mapping[str, str]]): Environment to take ``WCP_`` overrides from; defaults to ``os.environ``.
+
+        Raises:
+            ConfigError: If the configuration holds unknown keys or invalid values.
         """
         self.config: Dict[str, Any] = {}
-        self.load_config(config_file)
+        self.settings = Settings()
+        self._values: Dict[str, Any] = {}
+        self._host_profiles: Dict[str, Optional[DomainProfile]] = {}
+        self.load_config(config_file, os.environ if environ is None else environ)
 
-    def load_config(self, config_file: str) -> None:
+    def load_config(self, config_file: str, environ: Optional[Mapping[str, str]] = None) -> None:
         """
-        Load configuration from a file.
+        Load configuration from a file and resolve it into typed settings.
+
+        Keys are case-insensitive, and the sections of a nested file (such as
+        ``scraper`` in ``config.json``) are flattened. ``WCP_<KEY>``
+        environment variables override the file.
 
         Args:
             config_file (str): Path to the configuration file.
+            environ (Optional[Mapping[str, str]]): Environment to take overrides from, if any.
+
+        Raises:
+            ConfigError: If the file cannot be read or parsed, or holds unknown keys or invalid values.
         """
+        if not config_file.endswith(('.yaml', '.yml', '.json')):
+            raise ConfigError(f"Unsupported config file format: {config_file} (expected .yaml or .json)")
         try:
-            with open(config_file, 'r') as f:
-                if config_file.endswith('.yaml'):
-                    self.config = yaml.safe_load(f)
-                elif config_file.endswith('.json'):
-                    self.config = json.load(f)
-                else:
-                    raise ValueError("Unsupported config file format")
-        except Exception as e:
-            print(f"Error loading config file: {str(e)}")
-            self.config = {}
-
-    def get(self, key: str, default: Any = None) -> Any:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                loaded = json.load(f) if config_file.endswith('.json') else yaml.safe_load(f)
+        except OSError as e:
+            raise ConfigError(f"Cannot read config file {config_file}: {e.strerror or str(e)}") from e
+        except (yaml.YAMLError, ValueError) as e:
+            raise ConfigError(f"Cannot parse config file {config_file}:\n  {str(e)}") from e
+        if loaded is not None and not isinstance(loaded, Mapping):
+            raise ConfigError(f"Config file {config_file} must hold a mapping of settings, got {type(loaded).__name__}")
+
+        values = self.flatten(loaded or {})
+        for name, text in (environ or {}).items():
+            if name.upper().startswith(ENV_PREFIX):
+                key = name[len(ENV_PREFIX):].lower()
+                values[key] = parse_setting(key, text)
+        self.apply(values)
+
+    @staticmethod
+    def flatten(loaded: Mapping[str, Any]) -> Dict[str, Any]:
+        """Merge the sections of a nested configuration into one level of lowercase keys."""
+        names = set(setting_names())
+        values: Dict[str, Any] = {}
+        for key, value in loaded.items():
+            if isinstance(value, Mapping) and str(key).lower() not in names:
+                values.update((str(name).lower(), item) for name, item in value.items())
+            else:
+                values[str(key).lower()] = value
+        return values
+
+    def apply(self, values: Mapping[str, Any]) -> None:
+        """Validate raw setting values and make them the current configuration."""
+        self.settings = build_settings(values)
+        self._values = dict(values)
+        self.config = {f.name: getattr(self.settings, f.name) for f in dataclasses.fields(self.settings)}
+        self._host_profiles = {}
+
+    def update(self, overrides: Mapping[str, Any]) -> None:
+        """
+        Override settings after loading, with the same validation as the file.
+
+        Args:
+            overrides (Mapping[str, Any]): Setting names to new values.
+
+        Raises:
+            ConfigError: If an override is unknown or invalid.
+        """
+        self.apply({**self._values, **{str(key).lower(): value for key, value in overrides.items()}})
+
+    def profile_for(self, host: str) -> Optional[DomainProfile]:
+        """Return the domain profile of a host, matching the most specific of its parent domains."""
+        host = host.lower().split(':', 1)[0]
+        if host not in self._host_profiles:
+            profiles = self.settings.domain_profiles
+            domain = host
+            while domain and domain not in profiles:
+                domain = domain.partition('.')[2]
+            self._host_profiles[host] = profiles.get(domain)
+        return self._host_profiles[host]
+
+    def get(self, key: str, default: Any = None, host: Optional[str] = None) -> Any:
         """
         Get a configuration value.
 
         Args:
-            key (str): The configuration key.
-            default (Any, optional): Default value if key is not found.
+            key (str): The configuration key, in any case.
+            default (Any, optional): Default value if key is not found or not set.
+            host (Optional[str]): Host whose domain profile may override the value.
 
         Returns:
             Any: The configuration value.
         """
-        return self.config.get(key, default)
\ No newline at end of file
+        key = key.lower()
+        if host:
+            profile = self.profile_for(host)
+            value = getattr(profile, key, None) if profile is not None else None
+            if value is not None:
+                return value
+        value = self.config.get(key)
+        return default if value is None else value
\ No newline at end of file
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+from typing import Dict, NamedTuple, Optional, Set
+
+MANIFEST_NAME = '.conversion_manifest.json'
+
+
+class ManifestEntry(NamedTuple):
+    """What is remembered about a source file from the last time it was converted."""
+    size: int
+    mtime_ns: int
+    content_hash: str
+    output: str
+
+
+class ConversionManifest:
+    """
+    Record of converted source files, kept in the output directory, used to skip up-to-date outputs.
+
+    Sources are keyed by absolute path and outputs are stored as paths
+    relative to the output directory, such as ``a.com/index.md``. Paths are plain strings, which keeps a
+    scan of a large corpus cheap.
+    """
+
+    def __init__(self, output_directory: str):
+        """
+        Initialize the ConversionManifest, loading the existing manifest if there is one.
+
+        Args:
+            output_directory (str): Absolute path of the directory the markdown files are written to.
+        """
+        self.output_directory = output_directory
+        self.path = os.path.join(output_directory, MANIFEST_NAME)
+        self.entries: Dict[str, ManifestEntry] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = {source: ManifestEntry(*entry) for source, entry in json.load(f).items()}
+            except (ValueError, TypeError):
+                # A damaged manifest only costs one full conversion.
+                self.entries = {}
+
+    @staticmethod
+    def content_hash(path: str) -> str:
+        """Return the hash of a file's content, read in chunks."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def relative_output(self, output: str) -> str:
+        """Return the path of an output relative to the output directory, as it is recorded."""
+        return os.path.relpath(output, self.output_directory)
+
+    def outputs(self) -> Set[str]:
+        """Return the paths of all recorded outputs and of the manifest itself."""
+        outputs = {os.path.join(self.output_directory, entry.output) for entry in self.entries.values()}
+        outputs.add(self.path)
+        return outputs
+
+    def describe(self, source: str, output: str) -> ManifestEntry:
+        """Return the entry describing a source file as it is now."""
+        stat = os.stat(source)
+        return ManifestEntry(stat.st_size, stat.st_mtime_ns, self.content_hash(source), self.relative_output(output))
+
+    def check(self, source: str, output: str) -> Optional[ManifestEntry]:
+        """
+        Check whether a source file has to be converted.
+
+        The content is only hashed when the size or modification time changed,
+        so unchanged files cost a single ``stat``.
+
+        Args:
+            source (str): Absolute path of the source file.
+            output (str): Absolute path of the markdown file it converts to.
+
+        Returns:
+            Optional[ManifestEntry]: None if the output is up to date, otherwise
+            the entry to ``record`` once the file was converted.
+        """
+        entry = self.entries.get(source)
+        up_to_date = entry is not None and entry.output == self.relative_output(output) and os.path.exists(output)
+        if up_to_date:
+            stat = os.stat(source)
+            if entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                return None
+
+        current = self.describe(source, output)
+        if up_to_date and entry.content_hash == current.content_hash:
+            # Touched but unchanged: remember the new stat so the next run skips the hash.
+            self.entries[source] = current
+            return None
+        return current
+
+    def record(self, source: str, entry: ManifestEntry) -> None:
+        """Remember that a source file was converted."""
+        self.entries[source] = entry
+
+    def save(self) -> None:
+        """Write the manifest, replacing the previous one atomically."""
+        partial_path = self.path + '.part'
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(partial_path, self.path)
\ No newline at end of file
@@ -0,0 +1,279 @@
+import itertools
+import json
+import logging
+import os
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from src.config_manager import ConfigManager
+from src.shard_store import IndexEntry, ShardStore
+
+# Odd 64-bit constants of the shingle polynomial hash and the splitmix64 finalizer.
+SHINGLE_BASE = np.uint64(0x100000001B3)
+MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_2 = np.uint64(0x94D049BB133111EB)
+BIT_POSITIONS = np.arange(64, dtype=np.uint64)
+
+# The 64-bit fingerprints are split into this many bands for candidate lookup; two
+# fingerprints within ``max_distance`` < SIMHASH_BANDS bits agree on at least one band.
+SIMHASH_BANDS = 8
+
+
+def line_hashes(lines: Iterable[str]) -> np.ndarray:
+    """Return the hashes of the stripped, non-blank lines of a document."""
+    return np.fromiter((hash(stripped) for stripped in (line.strip() for line in lines) if stripped), dtype=np.int64)
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """Spread the bits of 64-bit hashes evenly (splitmix64 finalizer), vectorized."""
+    values = values ^ (values >> np.uint64(30))
+    values = values * MIX_1
+    values = values ^ (values >> np.uint64(27))
+    values = values * MIX_2
+    return values ^ (values >> np.uint64(31))
+
+
+def simhash(text: str, shingle_size: int = 4) -> int:
+    """
+    Compute the 64-bit SimHash of a document over its word shingles.
+
+    Words are hashed once and combined into shingle hashes with a rolling
+    polynomial over whole arrays, so the cost per word is a few numpy
+    operations rather than a Python loop.
+
+    Args:
+        text (str): The document.
+        shingle_size (int): Number of consecutive words per shingle.
+
+    Returns:
+        int: The fingerprint; documents differing in a few shingles differ in a few bits.
+    """
+    words = text.split()
+    if not words:
+        return 0
+    word_hashes = np.fromiter((hash(word) for word in words), dtype=np.int64, count=len(words)).view(np.uint64)
+    size = min(shingle_size, len(words))
+    shingles = np.zeros(len(words) - size + 1, dtype=np.uint64)
+    for offset in range(size):
+        shingles = shingles * SHINGLE_BASE + word_hashes[offset:len(words) - size + 1 + offset]
+    shingles = _mix(shingles)
+    ones = np.zeros(64, dtype=np.int64)
+    # Bits are counted in slices to bound the 64-column temporary array.
+    for start in range(0, len(shingles), 8192):
+        ones += ((shingles[start:start + 8192, None] >> BIT_POSITIONS) & np.uint64(1)).sum(axis=0, dtype=np.int64)
+    votes = ones * 2 > len(shingles)
+    return int(np.packbits(votes[::-1]).view('>u8')[0])
+
+
+class Deduplicator:
+    """
+    Removes site-level boilerplate and finds near-duplicate documents among scraped text.
+
+    Documents are grouped by host. Lines found on at least ``dedup_boilerplate_ratio``
+    of a host's pages (cookie banners, related-article blocks, repeated
+    sidebars) are stripped, counted over hashed lines with numpy. The
+    remaining text is fingerprinted with SimHash, and a document within
+    ``dedup_max_distance`` bits of an earlier one is flagged as a near
+    duplicate, or removed when ``dedup_action`` is ``skip``.
+
+    Works on a directory of scraped text files (one subdirectory per host) or
+    on a shard store, and rewrites the documents in place.
+    """
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize the Deduplicator.
+
+        Args:
+            config (ConfigManager): Configuration manager instance.
+        """
+        self.config = config
+        self.boilerplate_ratio = float(config.get('dedup_boilerplate_ratio', 0.5))
+        self.min_pages = int(config.get('dedup_min_pages', 5))
+        self.max_distance = int(config.get('dedup_max_distance', 6))
+        self.shingle_size = int(config.get('dedup_shingle_size', 4))
+        self.action = config.get('dedup_action', 'flag')
+        self.counts: Dict[str, int] = {}
+        self.duplicates: Dict[str, str] = {}
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Set up logging for the deduplicator."""
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                            filename='logs/dedup.log')
+        self.logger = logging.getLogger(__name__)
+
+    def boilerplate_lines(self, documents: Iterable[str]) -> np.ndarray:
+        """
+        Find the hashes of the lines that recur on most documents of a host.
+
+        Args:
+            documents (Iterable[str]): The texts of all documents of the host.
+
+        Returns:
+            np.ndarray: Sorted hashes of the boilerplate lines.
+        """
+        unique_values = np.empty(0, dtype=np.int64)
+        unique_counts = np.empty(0, dtype=np.int64)
+        chunk: List[np.ndarray] = []
+        total = 0
+
+        def fold() -> None:
+            nonlocal unique_values, unique_counts
+            values, counts = np.unique(np.concatenate(chunk), return_counts=True)
+            merged, inverse = np.unique(np.concatenate([unique_values, values]), return_inverse=True)
+            unique_counts = np.bincount(inverse, weights=np.concatenate([unique_counts, counts]),
+                                        minlength=len(merged)).astype(np.int64)
+            unique_values = merged
+            chunk.clear()
+
+        for text in documents:
+            # Each line is counted once per document, so the count is the number of pages it is on.
+            chunk.append(np.unique(line_hashes(text.splitlines())))
+            total += 1
+            if len(chunk) >= 1000:
+                fold()
+        if chunk:
+            fold()
+        if total < self.min_pages:
+            return np.empty(0, dtype=np.int64)
+        return unique_values[unique_counts >= max(2, self.boilerplate_ratio * total)]
+
+    def strip_boilerplate(self, text: str, boilerplate: np.ndarray) -> str:
+        """Remove the boilerplate lines from a document, keeping its blank lines and layout."""
+        if not len(boilerplate):
+            return text
+        lines = text.splitlines()
+        stripped = [line.strip() for line in lines]
+        hashes = np.fromiter((hash(line) if line else 0 for line in stripped), dtype=np.int64, count=len(lines))
+        keep = ~np.isin(hashes, boilerplate)
+        keep[hashes == 0] = True
+        if keep.all():
+            return text
+        return '\n'.join(itertools.compress(lines, keep))
+
+    def find_near_duplicates(self, fingerprints: List[int]) -> Dict[int, int]:
+        """
+        Match each document to an earlier one within ``max_distance`` bits, using banded lookup.
+
+        Returns:
+            Dict[int, int]: Index of each near-duplicate document to the index of the document it duplicates.
+        """
+        buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        band_bits = 64 // SIMHASH_BANDS
+        mask = (1 << band_bits) - 1
+        duplicates: Dict[int, int] = {}
+        for index, fingerprint in enumerate(fingerprints):
+            bands = [(band, (fingerprint >> (band * band_bits)) & mask) for band in range(SIMHASH_BANDS)]
+            for band in bands:
+                match = next((other for other in buckets.get(band, ())
+                              if bin(fingerprints[other] ^ fingerprint).count('1') <= self.max_distance), None)
+                if match is not None:
+                    duplicates[index] = match
+                    break
+            else:
+                for band in bands:
+                    buckets[band].append(index)
+        return duplicates
+
+    def process_host(self, host: str, names: List[str], read: Callable[[int], str],
+                     write: Callable[[int, str], None], remove: Callable[[int], None]) -> None:
+        """
+        Deduplicate the documents of one host.
+
+        Args:
+            host (str): The host, for logging.
+            names (List[str]): A name for each document, used in the report.
+            read (Callable[[int], str]): Returns the text of a document by index.
+            write (Callable[[int, str], None]): Replaces the text of a document.
+            remove (Callable[[int], None]): Removes a document.
+        """
+        boilerplate = self.boilerplate_lines(read(index) for index in range(len(names)))
+        fingerprints = []
+        for index in range(len(names)):
+            text = read(index)
+            stripped = self.strip_boilerplate(text, boilerplate)
+            if stripped != text:
+                write(index, stripped)
+                self.counts['stripped_documents'] += 1
+                self.counts['bytes_removed'] += len(text.encode('utf-8')) - len(stripped.encode('utf-8'))
+            fingerprints.append(simhash(stripped, self.shingle_size))
+
+        duplicates = self.find_near_duplicates(fingerprints)
+        for index, original in sorted(duplicates.items()):
+            self.duplicates[names[index]] = names[original]
+            if self.action == 'skip':
+                remove(index)
+        self.counts['documents'] += len(names)
+        self.counts['boilerplate_lines'] += len(boilerplate)
+        self.counts['near_duplicates'] += len(duplicates)
+        self.logger.info(f"{host or '(no host)'}: {len(names)} documents, {len(boilerplate)} boilerplate lines, "
+                         f"{len(duplicates)} near duplicates")
+
+    def run(self, directory: str, progress: Optional[Callable] = None) -> Dict[str, int]:
+        """
+        Deduplicate a directory of scraped text files or a shard store, and write ``dedup_report.json`` into it.
+
+        Args:
+            directory (str): The output directory of the scraper, or a shard directory.
+            progress (Optional[Callable]): Progress callback receiving a fraction and a description.
+
+        Returns:
+            Dict[str, int]: The figures of the run.
+        """
+        self.counts = defaultdict(int, dict.fromkeys(
+            ('documents', 'boilerplate_lines', 'stripped_documents', 'bytes_removed', 'near_duplicates'), 0))
+        self.duplicates = {}
+        if ShardStore.is_store(directory):
+            self._run_on_shards(directory, progress)
+        else:
+            self._run_on_files(directory, progress)
+
+        with open(os.path.join(directory, 'dedup_report.json'), 'w', encoding='utf-8') as f:
+            json.dump({'counts': dict(self.counts), 'action': self.action, 'near_duplicates': self.duplicates}, f, indent=2)
+        self.logger.info(f"Deduplicated {self.counts['documents']} documents: {self.counts['boilerplate_lines']} "
+                         f"boilerplate lines removed from {self.counts['stripped_documents']} documents "
+                         f"({self.counts['bytes_removed']} bytes), {self.counts['near_duplicates']} near duplicates "
+                         f"{'removed' if self.action == 'skip' else 'flagged'}")
+        return dict(self.counts)
+
+    def _run_on_files(self, directory: str, progress: Optional[Callable]) -> None:
+        hosts: Dict[str, List[str]] = defaultdict(list)
+        for root, _, file_names in os.walk(directory):
+            relative = os.path.relpath(root, directory)
+            host = '' if relative == '.' else relative.split(os.sep)[0]
+            hosts[host].extend(os.path.join(root, name) for name in sorted(file_names) if name.endswith('.txt'))
+
+        def read(paths: List[str], index: int) -> str:
+            with open(paths[index], 'r', encoding='utf-8') as f:
+                return f.read()
+
+        def write(paths: List[str], index: int, text: str) -> None:
+            with open(paths[index], 'w', encoding='utf-8') as f:
+                f.write(text)
+
+        for number, (host, paths) in enumerate(sorted(hosts.items())):
+            if progress:
+                progress(number / len(hosts), desc=f"Deduplicating {host}")
+            if paths:
+                self.process_host(host, paths, lambda index, paths=paths: read(paths, index),
+                                  lambda index, text, paths=paths: write(paths, index, text),
+                                  lambda index, paths=paths: os.remove(paths[index]))
+
+    def _run_on_shards(self, directory: str, progress: Optional[Callable]) -> None:
+        store = ShardStore(directory)
+        try:
+            hosts: Dict[str, List[IndexEntry]] = defaultdict(list)
+            for entry in store.entries():
+                hosts[entry.key.split('/', 1)[0]].append(entry)
+            for number, (host, entries) in enumerate(sorted(hosts.items())):
+                if progress:
+                    progress(number / len(hosts), desc=f"Deduplicating {host}")
+                self.process_host(
+                    host, [entry.url for entry in entries],
+                    lambda index, entries=entries: store.read(entries[index]).text,
+                    lambda index, text, entries=entries: store.add(entries[index].url, text, entries[index].key,
+                                                                   entries[index].fetched_at),
+                    lambda index, entries=entries: store.remove(entries[index].url))
+        finally:
+            store.close()
\ No newline at end of file
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import sqlite3
+import time
+from typing import NamedTuple, Optional
+from src.url_utils import canonicalize_url
+
+
+class CacheEntry(NamedTuple):
+    """What is remembered about a page from the last time it was scraped."""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    fetched_at: float
+
+
+class FetchCache:
+    """
+    Persistent per-URL record of HTTP validators and cleaned-text hashes, keyed by canonical URL.
+
+    The database runs in WAL mode, so the worker processes of a scrape can
+    share it; each of them should then commit every update, as an open
+    transaction keeps the others from writing.
+    """
+
+    def __init__(self, path: str, commit_every: int = 100, timeout: float = 30):
+        """
+        Initialize the FetchCache, creating the database if needed.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            commit_every (int): Number of updates grouped into a single transaction.
+            timeout (float): Seconds to wait for another process's write lock.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=timeout)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.connection.commit()
+        self.commit_every = commit_every
+        self._uncommitted = 0
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Return the hash used to detect unchanged cleaned text."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Return the cache key of a URL, its canonical form, so that distinct pages never share an entry."""
+        return canonicalize_url(url) or url
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Look up the entry stored for a URL.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            Optional[CacheEntry]: The stored entry, or None if the page was never scraped.
+        """
+        row = self.connection.execute(
+            "SELECT url, etag, last_modified, content_hash, fetched_at FROM entries WHERE key = ?", (self.key(url),)
+        ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], content_hash: str) -> None:
+        """
+        Store or replace the entry for a URL.
+
+        Args:
+            url (str): The URL the page was fetched from.
+            etag (Optional[str]): The ETag response header, if any.
+            last_modified (Optional[str]): The Last-Modified response header, if any.
+            content_hash (str): Hash of the cleaned text.
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries (key, url, etag, last_modified, content_hash, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (self.key(url), url, etag, last_modified, content_hash, time.time()),
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.commit()
+
+    def commit(self) -> None:
+        """Write pending updates to disk."""
+        self.connection.commit()
+        self._uncommitted = 0
+
+    def close(self) -> None:
+        """Commit pending updates and close the database."""
+        self.commit()
+        self.connection.close()
\ No newline at end of file
@@ -0,0 +1,176 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Awaitable, Dict, Mapping, Optional, TypeVar
+import httpx
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from src.config_manager import ConfigManager
+
+T = TypeVar('T')
+
+# Error kinds worth retrying after a pause: the same request may well succeed.
+TRANSIENT_ERRORS = frozenset({'timeout', 'connection', 'http_429', 'http_5xx'})
+# Error kinds that say something about the host rather than the URL; they count towards its circuit breaker.
+HOST_ERRORS = TRANSIENT_ERRORS | {'dns', 'bot_check'}
+
+# Statuses saying the page itself is gone, whatever the client. Other 4xx statuses, such as the
+# 401 and 403 that bot protection sends to non-browser clients, may well not hold for the browser.
+MISSING_PAGE_STATUSES = frozenset({404, 410})
+
+# Chromium network error codes, as they appear in Playwright error messages.
+DNS_ERROR_CODES = ('net::ERR_NAME_NOT_RESOLVED', 'net::ERR_NAME_RESOLUTION_FAILED')
+CONNECTION_ERROR_CODES = ('net::ERR_CONNECTION', 'net::ERR_ADDRESS_UNREACHABLE', 'net::ERR_EMPTY_RESPONSE',
+                          'net::ERR_NETWORK_CHANGED', 'net::ERR_INTERNET_DISCONNECTED', 'net::ERR_SSL_PROTOCOL_ERROR')
+CRASH_MESSAGES = ('Target crashed', 'Target closed', 'has been closed')
+
+# Default timeout of each stage of a browser fetch, in seconds.
+STAGE_TIMEOUTS = {'navigate': 30.0, 'scroll': 60.0, 'content': 15.0}
+
+
+class FetchError(Exception):
+    """A fetch that failed for a known reason, such as an HTTP error status or a bot check page."""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Classify an exception raised while fetching a page.
+
+    Returns:
+        str: One of ``dns``, ``timeout``, ``connection``, ``http_4xx``,
+        ``http_429``, ``http_5xx``, ``bot_check``, ``crash`` or ``other``.
+    """
+    if isinstance(error, FetchError):
+        return error.kind
+    if isinstance(error, (PlaywrightTimeoutError, asyncio.TimeoutError, httpx.TimeoutException)):
+        return 'timeout'
+    message = str(error)
+    if any(code in message for code in DNS_ERROR_CODES):
+        return 'dns'
+    if 'net::ERR_TIMED_OUT' in message:
+        return 'timeout'
+    if any(code in message for code in CONNECTION_ERROR_CODES) or isinstance(error, httpx.TransportError):
+        return 'connection'
+    if any(text in message for text in CRASH_MESSAGES):
+        return 'crash'
+    return 'other'
+
+
+def status_error_kind(status: int) -> Optional[str]:
+    """Return the error kind of an HTTP status, or None if it is not an error."""
+    if status == 429:
+        return 'http_429'
+    if status >= 500:
+        return 'http_5xx'
+    if status >= 400:
+        return 'http_4xx'
+    return None
+
+
+class FetchPolicy:
+    """
+    Timeouts, retries and per-host circuit breakers for browser fetches.
+
+    Every browser stage runs under its own timeout (``navigate_timeout``,
+    ``scroll_timeout`` and ``content_timeout``, which domain profiles may
+    override). Failures are classified,
+    and transient ones (timeouts, dropped connections, 429 and 5xx
+    responses) are retried up to ``fetch_retries`` times after a jittered
+    exponential backoff. After ``breaker_threshold`` consecutive host-level
+    failures a host's circuit opens: its remaining URLs fail immediately for
+    ``breaker_cooldown`` seconds, after which one URL is let through to
+    probe the host again.
+    """
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize the FetchPolicy.
+
+        Args:
+            config (ConfigManager): Configuration manager instance.
+        """
+        self.config = config
+        self.retries = int(config.get('fetch_retries', 2))
+        self.backoff_base = float(config.get('retry_backoff_base', 1.0))
+        self.backoff_max = float(config.get('retry_backoff_max', 30.0))
+        self.breaker_threshold = int(config.get('breaker_threshold', 5))
+        self.breaker_cooldown = float(config.get('breaker_cooldown', 300))
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the per-run counters and close every circuit."""
+        self.errors: Counter = Counter()
+        self.counts: Counter = Counter()
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+
+    def timeout(self, stage: str, host: str = '') -> float:
+        """Return the timeout of a stage (``navigate``, ``scroll`` or ``content``) for a host, in seconds."""
+        return float(self.config.get(f"{stage}_timeout", STAGE_TIMEOUTS[stage], host=host))
+
+    async def stage(self, name: str, awaitable: Awaitable[T], host: str = '') -> T:
+        """Await one stage of a browser fetch under the stage's timeout."""
+        timeout = self.timeout(name, host)
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise FetchError('timeout', f"{name} timed out after {timeout:g} s") from None
+
+    @staticmethod
+    def check_response(status: int, headers: Mapping[str, str]) -> None:
+        """Raise a FetchError for an error status or a bot check challenge."""
+        if headers.get('cf-mitigated') == 'challenge':
+            raise FetchError('bot_check', f"bot check challenge (HTTP {status})")
+        kind = status_error_kind(status)
+        if kind is not None:
+            raise FetchError(kind, f"HTTP {status}")
+
+    def allow(self, host: str) -> bool:
+        """Check whether a host's circuit lets a request through; once the cooldown is over, one probe passes."""
+        open_until = self._open_until.get(host)
+        if open_until is None:
+            return True
+        if time.monotonic() < open_until:
+            self.counts['circuit_open'] += 1
+            return False
+        # Half open: a single further failure opens the circuit again.
+        del self._open_until[host]
+        self._failures[host] = self.breaker_threshold - 1
+        return True
+
+    def retry_after(self, host: str) -> float:
+        """Return the seconds left until a host's open circuit lets a probe through, 0 if it is closed."""
+        open_until = self._open_until.get(host)
+        return max(0.0, open_until - time.monotonic()) if open_until is not None else 0.0
+
+    def record_success(self, host: str) -> None:
+        self._failures.pop(host, None)
+
+    def record_failure(self, host: str, kind: str) -> None:
+        """Count a failed fetch, opening the host's circuit after too many host-level failures in a row."""
+        self.errors[kind] += 1
+        if kind not in HOST_ERRORS:
+            return
+        self._failures[host] = self._failures.get(host, 0) + 1
+        if self._failures[host] >= self.breaker_threshold and host not in self._open_until:
+            self._open_until[host] = time.monotonic() + self.breaker_cooldown
+            self.counts['circuits_opened'] += 1
+
+    def should_retry(self, host: str, kind: str, attempt: int) -> bool:
+        """Check whether a failed attempt (counted from 0) is retried."""
+        return kind in TRANSIENT_ERRORS and attempt < self.retries and host not in self._open_until
+
+    def backoff(self, attempt: int) -> float:
+        """Return the pause before retry number ``attempt`` (counted from 0), with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def summary(self) -> str:
+        """Return a one-line description of the errors, retries and open circuits of the run."""
+        by_kind = ', '.join(f"{kind}: {count}" for kind, count in self.errors.most_common()) or 'none'
+        return (f"Fetch errors: {by_kind}; {self.counts['retries']} retries, "
+                f"{self.counts['circuits_opened']} host circuits opened, "
+                f"{self.counts['circuit_open']} URLs skipped on open circuits")
\ No newline at end of file
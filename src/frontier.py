@@ -0,0 +1,126 @@
+import hashlib
+import math
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set: membership tests may give false positives but never false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize the BloomFilter.
+
+        Args:
+            capacity (int): Number of items the filter is sized for.
+            error_rate (float): Target false positive rate once ``capacity`` items were added.
+        """
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: bytes):
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: bytes) -> bool:
+        """
+        Add an item to the filter.
+
+        Args:
+            item (bytes): The item to add.
+
+        Returns:
+            bool: True if the item was not in the filter before.
+        """
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        return added
+
+    def __contains__(self, item: bytes) -> bool:
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+
+class CrawlFrontier:
+    """Breadth-first queue of same-site URLs with a compact seen-filter."""
+
+    def __init__(self, origin: str, expected_urls: int = 1_000_000, error_rate: float = 0.001):
+        """
+        Initialize the CrawlFrontier.
+
+        URLs are stored without the shared ``origin`` prefix, as UTF-8 bytes,
+        and the visited set is a Bloom filter, so memory grows with the length
+        of the URL paths only. A false positive of the filter means a URL is
+        occasionally treated as already seen.
+
+        Args:
+            origin (str): Scheme and host shared by every URL of the crawl, e.g. ``https://example.com``.
+            expected_urls (int): Number of distinct URLs the seen-filter is sized for.
+            error_rate (float): False positive rate of the seen-filter at ``expected_urls``.
+        """
+        self.origin = origin.rstrip('/')
+        self.seen = BloomFilter(expected_urls, error_rate)
+        self._levels: Dict[int, Deque[bytes]] = {}
+        self._depth = 0
+        self.queued = 0
+
+    def _compress(self, url: str) -> bytes:
+        return url[len(self.origin):].encode('utf-8')
+
+    def _expand(self, suffix: bytes) -> str:
+        return self.origin + suffix.decode('utf-8')
+
+    def is_internal(self, url: str) -> bool:
+        """Check whether a URL has exactly the frontier's scheme, host and port."""
+        return url == self.origin or url.startswith(self.origin + '/')
+
+    def add(self, url: str, depth: int, enqueue: bool = True) -> bool:
+        """
+        Record a discovered URL.
+
+        Args:
+            url (str): An absolute URL.
+            depth (int): Number of link hops from the start page.
+            enqueue (bool): Whether the URL should also be queued for fetching.
+
+        Returns:
+            bool: True if the URL had not been seen before. URLs outside the
+            frontier's origin are ignored and also return False.
+        """
+        if not self.is_internal(url):
+            return False
+        suffix = self._compress(url)
+        if not self.seen.add(suffix):
+            return False
+        if enqueue:
+            self._levels.setdefault(depth, deque()).append(suffix)
+            self.queued += 1
+        return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """
+        Take the next URL to fetch, shallowest depth first.
+
+        Returns:
+            Optional[Tuple[str, int]]: The URL and its depth, or None if nothing is queued.
+        """
+        while self._levels:
+            level = self._levels.get(self._depth)
+            if level:
+                self.queued -= 1
+                return self._expand(level.popleft()), self._depth
+            self._levels.pop(self._depth, None)
+            if self._levels:
+                self._depth = min(self._levels)
+        return None
+
+    def __len__(self) -> int:
+        return self.queued
\ No newline at end of file
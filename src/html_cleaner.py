@@ -0,0 +1,243 @@
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Elements whose whole subtree is dropped before the text is extracted.
+REMOVED_TAGS = ('nav', 'header', 'footer', 'aside', 'script', 'style')
+
+# Elements without an end tag.
+VOID_TAGS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem',
+    'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+    'image', 'isindex', 'nextid', 'spacer',
+})
+
+# Elements whose text BeautifulSoup's get_text() leaves out.
+NON_TEXT_CONTAINERS = frozenset({'template', 'rt', 'rp'})
+
+
+def _join_lines(strings) -> str:
+    """Strip every line of the given strings and join the non-empty ones."""
+    lines = []
+    for string in strings:
+        for line in string.split('\n'):
+            line = line.strip()
+            if line:
+                lines.append(line)
+    return '\n'.join(lines)
+
+
+def clean_html_bs4(html_content: str) -> str:
+    """Clean HTML content and extract main text with BeautifulSoup and the built-in html.parser."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    for element in soup(list(REMOVED_TAGS)):
+        element.decompose()
+
+    main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
+
+    if main_content:
+        text = main_content.get_text(separator='\n', strip=True)
+    else:
+        text = soup.body.get_text(separator='\n', strip=True) if soup.body else soup.get_text(separator='\n', strip=True)
+
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    text = '\n'.join(lines)
+
+    return text
+
+
+def clean_html_lxml(html_content: str) -> str:
+    """
+    Clean HTML content and extract main text with lxml.
+
+    lxml repairs broken markup the way browsers do, which differs from
+    html.parser on malformed pages, so the output can differ slightly from
+    the ``bs4`` backend there.
+    """
+    if lxml is None:
+        raise ImportError("The 'lxml' HTML backend requires the lxml package")
+    try:
+        root = lxml.html.document_fromstring(html_content)
+    except lxml.etree.ParserError:
+        # Raised for documents without any element, such as an empty string.
+        return ''
+
+    for element in list(root.iter(*REMOVED_TAGS)):
+        element.drop_tree()
+
+    main_content = None
+    for path in ('.//main', './/article', ".//div[contains(concat(' ', normalize-space(@class), ' '), ' content ')]"):
+        found = root.xpath(path)
+        if found:
+            main_content = found[0]
+            break
+    if main_content is None:
+        main_content = root.find('body')
+    if main_content is None:
+        main_content = root
+
+    strings: List[str] = []
+    _collect_lxml_strings(main_content, strings)
+    return _join_lines(strings)
+
+
+def _collect_lxml_strings(element, strings: List[str]) -> None:
+    """Append the text of an lxml element and its descendants, in document order, to ``strings``."""
+    if element.text:
+        strings.append(element.text)
+    for child in element:
+        # Comments and processing instructions have a non-string tag; only their tail is text.
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_CONTAINERS:
+            _collect_lxml_strings(child, strings)
+        if child.tail:
+            strings.append(child.tail)
+
+
+class _MainTextParser(HTMLParser):
+    """Single-pass tokenizer that keeps the text of the candidate main-content elements."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.strings: List[str] = []
+        self.stack: List[str] = []
+        self.skip_depth = 0
+        self.non_text_depth = 0
+        # First element of each kind, as (open stack depth, first string index, end string index).
+        self.candidates: Dict[str, List[Optional[int]]] = {}
+        # Void elements closed implicitly, whose redundant end tag BeautifulSoup swallows
+        # without ending the current string.
+        self.already_closed: List[str] = []
+        # Whether the last string is still open, i.e. only data and swallowed end tags followed it.
+        self.string_open = False
+
+    def _candidate_kind(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> Optional[str]:
+        if tag in ('main', 'article', 'body'):
+            return tag
+        if tag == 'div':
+            for name, value in attrs:
+                if name == 'class' and value and 'content' in value.split():
+                    return 'div.content'
+        return None
+
+    def handle_starttag(self, tag, attrs, self_closing=False):
+        self.string_open = False
+        if tag in VOID_TAGS and not self_closing:
+            self.already_closed.append(tag)
+            return
+        self.stack.append(tag)
+        if self.skip_depth:
+            self.skip_depth += 1
+            return
+        if tag in REMOVED_TAGS:
+            self.skip_depth = 1
+            return
+        if tag in NON_TEXT_CONTAINERS:
+            self.non_text_depth += 1
+        kind = self._candidate_kind(tag, attrs)
+        if kind and kind not in self.candidates:
+            self.candidates[kind] = [len(self.stack), len(self.strings), None]
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, self_closing=True)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self.already_closed:
+            self.already_closed.remove(tag)
+            return
+        self.string_open = False
+        if tag not in self.stack:
+            return
+        while self.stack:
+            name = self.stack.pop()
+            if self.skip_depth:
+                self.skip_depth -= 1
+            else:
+                if name in NON_TEXT_CONTAINERS:
+                    self.non_text_depth -= 1
+                for candidate in self.candidates.values():
+                    if candidate[2] is None and candidate[0] == len(self.stack) + 1:
+                        candidate[2] = len(self.strings)
+            if name == tag:
+                break
+
+    def handle_data(self, data):
+        if self.skip_depth or self.non_text_depth:
+            return
+        if self.string_open:
+            self.strings[-1] += data
+        else:
+            self.strings.append(data)
+            self.string_open = True
+
+    def handle_comment(self, data):
+        self.string_open = False
+
+    def handle_decl(self, decl):
+        self.string_open = False
+
+    def handle_pi(self, data):
+        self.string_open = False
+
+    def unknown_decl(self, data):
+        self.string_open = False
+        # CDATA sections are kept even inside template and ruby text, like get_text() does.
+        if data.upper().startswith('CDATA[') and not self.skip_depth:
+            self.strings.append(data[len('CDATA['):])
+
+    def main_strings(self) -> List[str]:
+        for kind in ('main', 'article', 'div.content', 'body'):
+            candidate = self.candidates.get(kind)
+            if candidate:
+                return self.strings[candidate[1]:candidate[2]]
+        return self.strings
+
+
+def clean_html_stream(html_content: str) -> str:
+    """
+    Clean HTML content and extract main text in a single tokenizer pass.
+
+    Removed subtrees are skipped while tokenizing instead of being built and
+    then decomposed, and no tree is kept. The element selection follows the
+    ``bs4`` backend: the first ``main``, else ``article``, else
+    ``div.content``, else ``body``, else the whole document.
+    """
+    parser = _MainTextParser()
+    parser.feed(html_content)
+    parser.close()
+    return _join_lines(parser.main_strings())
+
+
+HTML_BACKENDS: Dict[str, Callable[[str], str]] = {
+    'bs4': clean_html_bs4,
+    'lxml': clean_html_lxml,
+    'stream': clean_html_stream,
+}
+
+
+def get_html_backend(name: str) -> Callable[[str], str]:
+    """
+    Look up an HTML cleaning backend by name.
+
+    Args:
+        name (str): One of the keys of ``HTML_BACKENDS``.
+
+    Returns:
+        Callable[[str], str]: A function turning HTML into cleaned text.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the backend's parser is not installed.
+    """
+    if name not in HTML_BACKENDS:
+        raise ValueError(f"Unknown HTML backend '{name}', expected one of {sorted(HTML_BACKENDS)}")
+    if name == 'lxml' and lxml is None:
+        raise ImportError("The 'lxml' HTML backend requires the lxml package")
+    return HTML_BACKENDS[name]
\ No newline at end of file
@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Iterator, NamedTuple
+
+
+class HtmlEntry(NamedTuple):
+    """The raw HTML last fetched for a URL."""
+    url: str
+    key: str
+    content_hash: str
+    fetched_at: float
+    fetched_via: str
+
+
+class HtmlStore:
+    """
+    Content-addressed store of raw, compressed HTML with a URL to content hash map.
+
+    Each distinct page is stored once as ``objects/<2 hex>/<hash>.html.gz``,
+    however many URLs served it, and the SQLite map records which content
+    each URL had when it was last fetched. Blobs are written to a temporary
+    file and renamed into place, so they can be written from worker threads
+    while the map is only used from the thread that created the store.
+    Several processes may open the same store: the map runs in WAL mode and
+    waits up to ``timeout`` for a write lock, and processes sharing it should
+    commit every update.
+    """
+
+    def __init__(self, directory: str, commit_every: int = 100, timeout: float = 30):
+        """
+        Initialize the HtmlStore, creating the directory and map if needed.
+
+        Args:
+            directory (str): Directory holding the blobs and the map.
+            commit_every (int): Number of map updates grouped into a single transaction.
+            timeout (float): Seconds to wait for another process's write lock.
+        """
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self.directory = directory
+        self.connection = sqlite3.connect(os.path.join(directory, 'pages.sqlite3'), timeout=timeout)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                key TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                fetched_via TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self.connection.commit()
+        self.commit_every = commit_every
+        self._uncommitted = 0
+
+    @staticmethod
+    def content_hash(html: str) -> str:
+        return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+    def blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, 'objects', content_hash[:2], f"{content_hash}.html.gz")
+
+    def write_blob(self, html: str) -> str:
+        """
+        Store a page's HTML unless the same content is already stored.
+
+        Args:
+            html (str): The raw HTML.
+
+        Returns:
+            str: The content hash the HTML is stored under.
+        """
+        content_hash = self.content_hash(html)
+        path = self.blob_path(content_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary_path = f"{path}.{os.getpid()}.{id(html)}.tmp"
+            with open(temporary_path, 'wb') as f:
+                f.write(gzip.compress(html.encode('utf-8'), mtime=0))
+            os.replace(temporary_path, path)
+        return content_hash
+
+    @staticmethod
+    def read_blob(path: str) -> str:
+        with open(path, 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
+
+    def put(self, url: str, key: str, content_hash: str, fetched_via: str) -> None:
+        """
+        Record that a URL served the content stored under a hash.
+
+        Args:
+            url (str): The fetched URL.
+            key (str): The URL's output key.
+            content_hash (str): Hash returned by ``write_blob``.
+            fetched_via (str): ``http`` or ``browser``.
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO pages (url, key, content_hash, fetched_at, fetched_via) VALUES (?, ?, ?, ?, ?)",
+            (url, key, content_hash, time.time(), fetched_via))
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.commit()
+
+    def entries(self) -> Iterator[HtmlEntry]:
+        """Yield the entry of every URL, grouped by content hash."""
+        cursor = self.connection.execute(
+            "SELECT url, key, content_hash, fetched_at, fetched_via FROM pages ORDER BY content_hash")
+        for row in cursor:
+            yield HtmlEntry(*row)
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def blob_count(self) -> int:
+        """Return the number of distinct pages the URLs map to."""
+        return self.connection.execute("SELECT COUNT(DISTINCT content_hash) FROM pages").fetchone()[0]
+
+    def commit(self) -> None:
+        self.connection.commit()
+        self._uncommitted = 0
+
+    def close(self) -> None:
+        self.commit()
+        self.connection.close()
\ No newline at end of file
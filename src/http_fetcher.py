@@ -0,0 +1,96 @@
+import re
+from typing import Optional
+import httpx
+
+# Text shown by sites that refuse to render without JavaScript.
+JS_CHECK_MARKER = "Please turn JavaScript on and reload the page."
+
+# An empty mount point of a client-side rendered application.
+EMPTY_APP_ROOT_PATTERN = re.compile(
+    r"<div[^>]+id=[\"'](?:root|app|__next|__nuxt)[\"'][^>]*>\s*</div>", re.IGNORECASE)
+# The classic "You need to enable JavaScript to run this app" fallback.
+NOSCRIPT_JS_PATTERN = re.compile(r"<noscript[^>]*>[^<]*(?:enable|turn on)[^<]*javascript", re.IGNORECASE)
+
+
+class HttpFetcher:
+    """Fetches pages over plain HTTP with a pooled client and tells when a browser is needed instead."""
+
+    def __init__(self, user_agent: str, max_connections: int = 20, timeout: float = 15.0,
+                 min_text_length: int = 200):
+        """
+        Initialize the HttpFetcher.
+
+        Args:
+            user_agent (str): User agent sent with every request.
+            max_connections (int): Size of the shared connection pool.
+            timeout (float): Timeout of a single request in seconds.
+            min_text_length (int): Cleaned pages shorter than this are assumed to need JavaScript.
+        """
+        self.user_agent = user_agent
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.min_text_length = min_text_length
+        self.client: Optional[httpx.AsyncClient] = None
+
+    async def open(self) -> None:
+        """Create the pooled HTTP client."""
+        self.client = httpx.AsyncClient(
+            headers={'User-Agent': self.user_agent},
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            timeout=self.timeout,
+            follow_redirects=True,
+        )
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def fetch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> httpx.Response:
+        """
+        Fetch a page without a browser, conditionally if validators are given.
+
+        Args:
+            url (str): The URL to fetch.
+            etag (Optional[str]): ETag from a previous fetch, sent as If-None-Match.
+            last_modified (Optional[str]): Last-Modified from a previous fetch, sent as If-Modified-Since.
+
+        Returns:
+            httpx.Response: The response, with status 304 if the page did not change.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return await self.client.get(url, headers=headers)
+
+    @staticmethod
+    def html_of(response: httpx.Response) -> Optional[str]:
+        """Return the HTML of a successful HTML response, or None for anything else."""
+        if response.status_code != 200:
+            return None
+        if 'html' not in response.headers.get('content-type', 'text/html'):
+            return None
+        return response.text
+
+    def needs_javascript(self, html_content: str, cleaned_text: str) -> bool:
+        """
+        Decide whether a page fetched over HTTP has to be rendered in a browser.
+
+        Args:
+            html_content (str): The raw HTML of the page.
+            cleaned_text (str): The text extracted from it by ``Scraper.clean_html``.
+
+        Returns:
+            bool: True if the page looks like it relies on JavaScript for its content.
+        """
+        if JS_CHECK_MARKER in cleaned_text:
+            return True
+        if len(cleaned_text) < self.min_text_length:
+            return True
+        if EMPTY_APP_ROOT_PATTERN.search(html_content):
+            return True
+        return bool(NOSCRIPT_JS_PATTERN.search(html_content))
\ No newline at end of file
@@ -3,6 +3,7 @@ from src.config_manager import ConfigManager
 from src.scraper import Scraper
 from src.postprocessor import Postprocessor
 from src.link_extractor import LinkExtractor
+from src.pipeline import Pipeline
 import logging
 
 class IntegratedApp:
@@ -14,6 +15,7 @@ class IntegratedApp:
         self.scraper = Scraper(self.config)
         self.postprocessor = Postprocessor(self.config)
         self.link_extractor = LinkExtractor(self.config)
+        self.pipeline = Pipeline(self.config)
         self.setup_logging()
 
     def setup_logging(self):
@@ -22,6 +24,25 @@ class IntegratedApp:
                             filename='logs/integrated_app.log')
         self.logger = logging.getLogger(__name__)
 
+    # The components report progress to an optional callback; these wrappers
+    # declare a gr.Progress() default, which is how Gradio knows to pass one.
+
+    def run_scraper(self, file_path, progress=gr.Progress()):
+        """Run the scraper from the Scrape tab."""
+        return self.scraper.run_scraper(file_path, progress)
+
+    def run_extractor(self, url, max_depth, max_pages, progress=gr.Progress()):
+        """Run the link extractor from the Extract Links tab."""
+        return self.link_extractor.run_extractor(url, max_depth, max_pages, progress)
+
+    def convert_files(self, input_directory, output_directory, progress=gr.Progress()):
+        """Run the markdown conversion from the Postprocess tab."""
+        return self.postprocessor.convert_files(input_directory, output_directory, progress)
+
+    def run_pipeline(self, start_url, urls_file, max_depth, max_pages, progress=gr.Progress()):
+        """Run the pipeline from the Pipeline tab."""
+        return self.pipeline.run_pipeline(start_url, urls_file, max_depth, max_pages, progress)
+
     def create_interface(self):
         """Create the Gradio interface for the integrated application."""
         with gr.Blocks() as demo:
@@ -35,6 +56,8 @@ class IntegratedApp:
 
             with gr.Tab("Extract Links"):
                 link_input = gr.Textbox(label="Enter URL")
+                link_depth = gr.Number(label="Crawl Depth (0 = this page only)", value=0, precision=0)
+                link_max_pages = gr.Number(label="Max Pages to Crawl", value=self.config.get('crawl_max_pages', 1000), precision=0)
                 link_button = gr.Button("Extract Links")
                 link_output = gr.DataFrame(label="Extracted Links")
                 link_info = gr.Markdown()
@@ -45,24 +68,39 @@ class IntegratedApp:
                 postprocess_button = gr.Button("Convert to Markdown")
                 postprocess_info = gr.Markdown()
 
+            with gr.Tab("Pipeline"):
+                pipeline_url = gr.Textbox(label="Start URL (optional if a URLs file is uploaded)")
+                pipeline_file = gr.File(label="Upload URLs File (optional)", file_types=[".txt"], file_count="single")
+                pipeline_depth = gr.Number(label="Crawl Depth (0 = start page and its links)", value=0, precision=0)
+                pipeline_max_pages = gr.Number(label="Max Pages to Crawl", value=self.config.get('crawl_max_pages', 1000), precision=0)
+                pipeline_button = gr.Button("Crawl, Scrape and Convert")
+                pipeline_output = gr.DataFrame(label="Pipeline Results")
+                pipeline_info = gr.Markdown()
+
             scrape_button.click(
-                self.scraper.run_scraper,
+                self.run_scraper,
                 inputs=[scrape_input],
                 outputs=[scrape_output, scrape_info]
             )
 
             link_button.click(
-                self.link_extractor.run_extractor,
-                inputs=[link_input],
+                self.run_extractor,
+                inputs=[link_input, link_depth, link_max_pages],
                 outputs=[link_output, link_info]
             )
 
             postprocess_button.click(
-                self.postprocessor.convert_files,
+                self.convert_files,
                 inputs=[postprocess_input, postprocess_output],
                 outputs=[postprocess_info]
             )
 
+            pipeline_button.click(
+                self.run_pipeline,
+                inputs=[pipeline_url, pipeline_file, pipeline_depth, pipeline_max_pages],
+                outputs=[pipeline_output, pipeline_info]
+            )
+
         return demo
 
     def run(self):
@@ -1,14 +1,88 @@
 import asyncio
+import itertools
 import os
+from html.parser import HTMLParser
 from urllib.parse import urljoin, urlparse
-from playwright.async_api import async_playwright, Page
-from bs4 import BeautifulSoup
-import pandas as pd
-import gradio as gr
-from typing import Tuple
+from playwright.async_api import async_playwright, Browser, Page
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, Tuple
 from src.config_manager import ConfigManager
+from src.frontier import CrawlFrontier
+from src.resource_blocker import ResourceBlocker
+from src.settings import DEFAULT_USER_AGENT
+from src.sitemap import SitemapReader
+from src.url_utils import UrlDedupIndex, canonicalize_url
 import logging
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Number of saved links shown in the interface after a run.
+PREVIEW_ROWS = 1000
+
+# Resolves the anchors inside the page, including those inserted by scripts, and keeps the
+# http(s) ones pointing to the page's own host; ``a.href`` already honours any <base> element.
+HARVEST_LINKS_JS = """() => Array.from(document.querySelectorAll('a[href]'))
+    .filter(a => (a.protocol === 'http:' || a.protocol === 'https:') && a.host === location.host)
+    .map(a => a.href)"""
+
+# Number of sitemap links between two flushes of the output file and progress updates.
+SITEMAP_FLUSH_EVERY = 1000
+
+
+class _LinkParser(HTMLParser):
+    """Collects the ``href`` of every anchor, and of the first ``<base>`` element, of an HTML document."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.base: Optional[str] = None
+        self.hrefs: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in ('a', 'base'):
+            return
+        href = dict(attrs).get('href')
+        if href is None:
+            return
+        if tag == 'a':
+            self.hrefs.append(href.strip())
+        elif self.base is None:
+            self.base = href.strip()
+
+
+def links_in_html(html_content: str, url: str) -> List[str]:
+    """
+    Collect the canonical links of an HTML document that point to its own host, like ``HARVEST_LINKS_JS``.
+
+    Used when the page was already fetched, so that it is not loaded again
+    just for its links. Only anchors present in the given HTML are seen, so
+    pass the rendered content of pages that insert their links with scripts.
+
+    Args:
+        html_content (str): The page's HTML.
+        url (str): The URL the page was fetched from, which relative links are resolved against.
+
+    Returns:
+        List[str]: The canonical internal links, in document order.
+    """
+    parser = _LinkParser()
+    parser.feed(html_content)
+    parser.close()
+    try:
+        base = urljoin(url, parser.base) if parser.base else url
+    except ValueError:
+        base = url
+    host = urlparse(canonicalize_url(url) or url).netloc
+    links = []
+    for href in parser.hrefs:
+        try:
+            link = canonicalize_url(urljoin(base, href))
+        except ValueError:
+            # Such as an unterminated IPv6 address.
+            continue
+        if link and urlparse(link).netloc == host:
+            links.append(link)
+    return links
+
 class LinkExtractor:
     """Extracts internal links from a given URL."""
 
@@ -20,6 +94,10 @@ class LinkExtractor:
             config (ConfigManager): Configuration manager instance.
         """
         self.config = config
+        self.duplicate_links = 0
+        self.sitemaps_read = 0
+        self.resource_blocker = ResourceBlocker(self.config.get('link_blocking_profile', 'links-only'),
+                                                self.config.get('blocked_hosts'))
         self.setup_logging()
 
     def setup_logging(self):
@@ -28,17 +106,38 @@ class LinkExtractor:
                             filename='logs/link_extractor.log')
         self.logger = logging.getLogger(__name__)
 
-    async def setup_page(self, playwright):
-        """Set up a new browser page for link extraction."""
-        browser = await playwright.chromium.launch(headless=True)
+    async def new_page(self, browser: Browser) -> Page:
+        """Open a fresh browser context and page configured for link extraction."""
         context = await browser.new_context(
-            user_agent=self.config.get('user_agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'),
+            user_agent=self.config.get('user_agent', DEFAULT_USER_AGENT),
             viewport={'width': 1920, 'height': 1080},
         )
-        page = await context.new_page()
+        await self.resource_blocker.attach(context)
+        return await context.new_page()
+
+    async def setup_page(self, playwright):
+        """Set up a new browser page for link extraction."""
+        browser = await playwright.chromium.launch(headless=True)
+        page = await self.new_page(browser)
         return page, browser
 
-    async def extract_links(self, url: str) -> pd.DataFrame:
+    async def links_on_page(self, page: Page, url: str) -> List[str]:
+        """
+        Load a page and collect the canonical links that point to the same host.
+
+        Args:
+            page (Page): The browser page to load the URL in.
+            url (str): The URL to extract links from.
+
+        Returns:
+            List[str]: The canonical internal links, in document order. Links
+            that are not http(s), such as ``mailto:`` or ``javascript:``, are dropped.
+        """
+        await page.goto(url, wait_until='networkidle')
+        hrefs = await page.evaluate(HARVEST_LINKS_JS)
+        return [link for link in map(canonicalize_url, hrefs) if link]
+
+    async def extract_links(self, url: str) -> "pd.DataFrame":
         """
         Extract internal links from the given URL.
 
@@ -48,49 +147,243 @@ class LinkExtractor:
         Returns:
             pd.DataFrame: A DataFrame containing the extracted links.
         """
+        import pandas as pd
+
+        self.resource_blocker.reset()
         async with async_playwright() as playwright:
             page, browser = await self.setup_page(playwright)
             try:
-                await page.goto(url, wait_until='networkidle')
-                content = await page.content()
-                soup = BeautifulSoup(content, 'html.parser')
-                base_url = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
-                
-                internal_links = []
-                for a in soup.find_all('a', href=True):
-                    href = a['href']
-                    full_url = urljoin(base_url, href)
-                    if urlparse(full_url).netloc == urlparse(base_url).netloc:
-                        internal_links.append(full_url)
-                
-                return pd.DataFrame(internal_links, columns=['Internal Links'])
+                index = UrlDedupIndex()
+                internal_links = [link for link in map(index.add, await self.links_on_page(page, url)) if link]
+                self.logger.info(f"Skipped {index.duplicates} duplicate links on {url}")
+                return pd.DataFrame(internal_links[:self.config.get('max_links')], columns=['Internal Links'])
             except Exception as e:
                 self.logger.error(f"Error extracting links from {url}: {str(e)}")
                 return pd.DataFrame()
             finally:
                 await browser.close()
+                self.logger.info(self.resource_blocker.summary())
+
+    async def crawl(self, start_url: str, output_file: str, max_depth: int = 0, max_pages: Optional[int] = None,
+                    progress: Optional[Callable] = None,
+                    on_link: Optional[Callable[[str], Awaitable[None]]] = None) -> Tuple[int, int]:
+        """
+        Crawl a site breadth-first and stream every internal link found to a file.
+
+        Pages up to ``max_depth`` link hops away from the start page are
+        fetched concurrently by ``max_workers`` pages. Each distinct link is
+        written to ``output_file`` as soon as it is discovered, until
+        ``max_links`` links were written or ``max_pages`` pages were fetched.
 
-    def run_extractor(self, url: str) -> Tuple[pd.DataFrame, str]:
+        Args:
+            start_url (str): The page to start from.
+            output_file (str): Path of the file the links are written to, one per line.
+            max_depth (int): Number of link hops to follow; 0 only reads the start page.
+            max_pages (Optional[int]): Maximum number of pages to fetch.
+            progress (Optional[Callable]): Progress callback receiving a fraction and a description.
+            on_link (Optional[Callable[[str], Awaitable[None]]]): Awaited with every new link after it
+                was written, outside the crawl's lock, so a slow consumer holds up the crawl.
+
+        Returns:
+            Tuple[int, int]: The number of pages fetched and of links written.
+        """
+        start_url = canonicalize_url(start_url) or start_url
+        parsed_url = urlparse(start_url)
+        frontier = CrawlFrontier(
+            f"{parsed_url.scheme}://{parsed_url.netloc}",
+            expected_urls=int(self.config.get('crawl_expected_urls', 1_000_000)),
+            error_rate=float(self.config.get('crawl_false_positive_rate', 0.001)),
+        )
+        max_pages = max_pages or int(self.config.get('crawl_max_pages', 1000))
+        max_links = self.config.get('max_links')
+        frontier.add(start_url, 0)
+
+        condition = asyncio.Condition()
+        pages_fetched = 0
+        links_written = 0
+        duplicates = 0
+        in_flight = 0
+
+        def budget_left() -> bool:
+            return pages_fetched < max_pages and (not max_links or links_written < max_links)
+
+        async def worker(browser: Browser, output) -> None:
+            nonlocal pages_fetched, links_written, duplicates, in_flight
+            page = await self.new_page(browser)
+            try:
+                while True:
+                    async with condition:
+                        while True:
+                            item = frontier.pop() if budget_left() else None
+                            if item is not None or in_flight == 0:
+                                break
+                            await condition.wait()
+                        if item is None:
+                            condition.notify_all()
+                            return
+                        in_flight += 1
+                        pages_fetched += 1
+
+                    url, depth = item
+                    try:
+                        links = await self.links_on_page(page, url)
+                    except Exception as e:
+                        self.logger.error(f"Error extracting links from {url}: {str(e)}")
+                        links = []
+
+                    new_links = []
+                    async with condition:
+                        for link in links:
+                            if max_links and links_written >= max_links:
+                                break
+                            if frontier.add(link, depth + 1, enqueue=depth + 1 <= max_depth):
+                                output.write(link + '\n')
+                                new_links.append(link)
+                                links_written += 1
+                            else:
+                                duplicates += 1
+                        output.flush()
+                        in_flight -= 1
+                        condition.notify_all()
+                    if on_link:
+                        for link in new_links:
+                            await on_link(link)
+                    if progress:
+                        progress(min(1.0, pages_fetched / max_pages),
+                                 desc=f"Crawled {pages_fetched} pages, found {links_written} links")
+            finally:
+                await page.context.close()
+
+        self.resource_blocker.reset()
+        with open(output_file, 'w', encoding='utf-8') as output:
+            async with async_playwright() as playwright:
+                browser = await playwright.chromium.launch(headless=True)
+                try:
+                    workers = max(1, int(self.config.get('max_workers', 4)))
+                    await asyncio.gather(*(worker(browser, output) for _ in range(workers)))
+                finally:
+                    await browser.close()
+        self.logger.info(f"Crawled {pages_fetched} pages of {start_url} and saved {links_written} links to {output_file}, "
+                         f"skipping {duplicates} duplicates")
+        self.duplicate_links = duplicates
+        self.logger.info(self.resource_blocker.summary())
+        return pages_fetched, links_written
+
+    async def read_sitemaps(self, start_url: str, output_file: str, progress: Optional[Callable] = None,
+                            on_link: Optional[Callable[[str], Awaitable[None]]] = None) -> int:
+        """
+        Stream the internal links listed in a site's sitemaps to a file, without rendering any page.
+
+        Args:
+            start_url (str): Any page of the site.
+            output_file (str): Path of the file the links are written to, one per line.
+            progress (Optional[Callable]): Progress callback receiving a fraction and a description.
+            on_link (Optional[Callable[[str], Awaitable[None]]]): Awaited with every new link after it was written.
+
+        Returns:
+            int: The number of links written.
+        """
+        start_url = canonicalize_url(start_url) or start_url
+        parsed_url = urlparse(start_url)
+        frontier = CrawlFrontier(
+            f"{parsed_url.scheme}://{parsed_url.netloc}",
+            expected_urls=int(self.config.get('crawl_expected_urls', 1_000_000)),
+            error_rate=float(self.config.get('crawl_false_positive_rate', 0.001)),
+        )
+        max_links = self.config.get('max_links')
+        reader = SitemapReader(self.config.get('user_agent', DEFAULT_USER_AGENT),
+                               float(self.config.get('http_timeout', 15)),
+                               int(self.config.get('sitemap_max_files', 1000)))
+        links_written = 0
+        duplicates = 0
+        external = 0
+        locations = reader.urls(start_url)
+        with open(output_file, 'w', encoding='utf-8') as output:
+            try:
+                async for location in locations:
+                    link = canonicalize_url(location)
+                    if not link or not frontier.is_internal(link):
+                        external += 1
+                        continue
+                    if not frontier.add(link, 0, enqueue=False):
+                        duplicates += 1
+                        continue
+                    output.write(link + '\n')
+                    links_written += 1
+                    if on_link:
+                        await on_link(link)
+                    if links_written % SITEMAP_FLUSH_EVERY == 0:
+                        output.flush()
+                        if progress:
+                            progress(links_written / max_links if max_links else 0.0,
+                                     desc=f"Read {reader.sitemaps_read} sitemaps, found {links_written} links")
+                    if max_links and links_written >= max_links:
+                        break
+            finally:
+                await locations.aclose()
+        self.sitemaps_read = reader.sitemaps_read
+        self.duplicate_links = duplicates
+        self.logger.info(f"Read {reader.sitemaps_read} sitemaps of {start_url} ({reader.sitemap_errors} failed) and "
+                         f"saved {links_written} links to {output_file}, skipping {duplicates} duplicates and "
+                         f"{external} URLs of other sites")
+        return links_written
+
+    async def discover(self, start_url: str, output_file: str, max_depth: int = 0, max_pages: Optional[int] = None,
+                       progress: Optional[Callable] = None,
+                       on_link: Optional[Callable[[str], Awaitable[None]]] = None) -> Tuple[int, int]:
+        """
+        Find the internal links of a site as set by ``link_discovery`` and stream them to a file.
+
+        ``crawl`` renders pages breadth-first with ``crawl``, ``sitemap`` only
+        reads the site's sitemaps, and ``auto`` reads the sitemaps and crawls
+        only if they list no links. The arguments are those of ``crawl``.
+
+        Returns:
+            Tuple[int, int]: The number of pages fetched, 0 when the sitemaps
+            were used, and of links written.
+        """
+        mode = self.config.get('link_discovery', 'crawl')
+        self.sitemaps_read = 0
+        if mode != 'crawl':
+            links_written = await self.read_sitemaps(start_url, output_file, progress, on_link)
+            if links_written or mode == 'sitemap':
+                return 0, links_written
+            self.logger.info(f"No links in the sitemaps of {start_url}, crawling instead")
+        return await self.crawl(start_url, output_file, max_depth, max_pages, progress, on_link)
+
+    def run_extractor(self, url: str, max_depth: int = 0, max_pages: Optional[int] = None,
+                      progress: Optional[Callable] = None) -> Tuple["pd.DataFrame", str]:
         """
         Run the link extractor and return results.
 
         Args:
             url (str): The URL to extract links from.
+            max_depth (int): Number of link hops to follow; 0 only reads the given page.
+            max_pages (Optional[int]): Maximum number of pages to fetch while crawling.
+            progress (Optional[Callable]): Progress callback receiving a fraction and a description.
 
         Returns:
-            Tuple[pd.DataFrame, str]: A tuple containing the DataFrame of links and a status message.
+            Tuple[pd.DataFrame, str]: A tuple containing a preview of the saved links and a status message.
         """
+        import pandas as pd
+
         try:
-            df = asyncio.run(self.extract_links(url))
-            if df.empty:
-                return df, "No internal links found or an error occurred."
-            
-            # Save the extracted links to a file
             os.makedirs('data/input', exist_ok=True)
             output_file = os.path.join('data/input', f"{urlparse(url).netloc}_links.txt")
-            df['Internal Links'].to_csv(output_file, index=False, header=False)
-            
-            return df, f"Successfully extracted and saved {len(df)} internal links to {output_file}."
+            pages_fetched, links_written = asyncio.run(self.discover(
+                url, output_file, int(max_depth or 0), int(max_pages) if max_pages else None, progress))
+            if not links_written:
+                return pd.DataFrame(), "No internal links found or an error occurred."
+
+            with open(output_file, 'r', encoding='utf-8') as f:
+                preview = [line.strip() for line in itertools.islice(f, PREVIEW_ROWS)]
+            df = pd.DataFrame(preview, columns=['Internal Links'])
+
+            if self.sitemaps_read:
+                return df, (f"Successfully saved {links_written} internal links from {self.sitemaps_read} sitemaps "
+                            f"to {output_file}, skipping {self.duplicate_links} duplicates.")
+            return df, (f"Successfully extracted and saved {links_written} internal links from {pages_fetched} pages "
+                        f"to {output_file}, skipping {self.duplicate_links} duplicates. {self.resource_blocker.summary()}.")
         except Exception as e:
             self.logger.error(f"An error occurred while running the extractor: {str(e)}")
             return pd.DataFrame(), f"An error occurred: {str(e)}"
\ No newline at end of file
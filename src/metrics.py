@@ -0,0 +1,330 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from src.config_manager import ConfigManager
+
+# Upper bounds of the duration histogram buckets, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = 'web_content_processor'
+
+
+class Histogram:
+    """Bucketed durations of one stage, with the total bytes it handled."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'max', 'bytes')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One count per bucket plus the +Inf bucket, not cumulative.
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.bytes = 0
+
+    def observe(self, seconds: float, nbytes: int = 0) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.bytes += nbytes
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, state: list) -> None:
+        """Add the counts of a histogram exported with ``state``."""
+        counts, count, total, maximum, nbytes = state
+        self.counts = [a + b for a, b in zip(self.counts, counts, strict=True)]
+        self.count += count
+        self.sum += total
+        self.max = max(self.max, maximum)
+        self.bytes += nbytes
+
+    def state(self) -> list:
+        return [self.counts, self.count, self.sum, self.max, self.bytes]
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket, as Prometheus does."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.max
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = min(self.buckets[index], self.max)
+                return lower + (max(upper, lower) - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'seconds': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': round(self.quantile(0.50), 6),
+            'p90': round(self.quantile(0.90), 6),
+            'p99': round(self.quantile(0.99), 6),
+            'max': round(self.max, 6),
+            'bytes': self.bytes,
+        }
+
+
+class StageTimer:
+    """
+    Context manager timing one stage of one URL or file.
+
+    The outcome is ``ok`` unless an exception escapes the block (``error``)
+    or the block sets ``outcome`` itself; it may also set ``nbytes``.
+    """
+
+    __slots__ = ('recorder', 'stage', 'host', 'nbytes', 'outcome', 'start')
+
+    def __init__(self, recorder: 'MetricsRecorder', stage: str, host: str, nbytes: int):
+        self.recorder = recorder
+        self.stage = stage
+        self.host = host
+        self.nbytes = nbytes
+        self.outcome = 'ok'
+
+    def __enter__(self) -> 'StageTimer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None and self.outcome == 'ok':
+            self.outcome = 'error'
+        self.recorder.observe(self.stage, time.perf_counter() - self.start, self.host, self.nbytes, self.outcome)
+
+
+class _NullTimer:
+    """Timer handed out while metrics are disabled; accepts the same attributes and records nothing."""
+
+    nbytes = 0
+    outcome = 'ok'
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        pass
+
+    def __setattr__(self, name, value) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRecorder:
+    """
+    Records per-stage durations, bytes and outcomes, aggregated per stage and host.
+
+    Only bucket counts and totals are kept, never individual samples, so
+    memory does not grow with the number of URLs and recording costs about a
+    microsecond; it is meant to stay on in production. The recorder is safe
+    to use from the event loop and worker threads at the same time.
+    """
+
+    def __init__(self, enabled: bool = True, directory: str = os.path.join('data', 'metrics'),
+                 per_host: bool = False, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize the MetricsRecorder.
+
+        Args:
+            enabled (bool): Whether anything is recorded and exported.
+            directory (str): Directory the JSON summary and Prometheus textfile are written to.
+            per_host (bool): Keep separate figures for every host; otherwise all hosts are merged.
+                Every host then becomes a label value of its own, so this is only meant for runs over
+                a handful of hosts.
+            buckets (Tuple[float, ...]): Upper bounds of the duration buckets, in seconds.
+        """
+        self.enabled = enabled
+        self.directory = directory
+        self.per_host = per_host
+        self.buckets = tuple(buckets)
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.outcomes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> 'MetricsRecorder':
+        """Create a recorder following the ``metrics_*`` settings."""
+        return cls(enabled=bool(config.get('metrics_enabled', True)),
+                   directory=config.get('metrics_dir', os.path.join('data', 'metrics')),
+                   per_host=bool(config.get('metrics_per_host', False)))
+
+    def time(self, stage: str, host: str = '', nbytes: int = 0):
+        """
+        Time a block as one run of a stage.
+
+        Args:
+            stage (str): Name of the stage, e.g. ``navigate`` or ``clean_html``.
+            host (str): Host of the URL being processed; empty for local files.
+            nbytes (int): Bytes handled by the stage, if already known.
+
+        Returns:
+            A context manager whose ``nbytes`` and ``outcome`` may be set inside the block.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return StageTimer(self, stage, host, nbytes)
+
+    def observe(self, stage: str, seconds: float, host: str = '', nbytes: int = 0,
+                outcome: Optional[str] = 'ok') -> None:
+        """Record one run of a stage that took ``seconds``; an outcome of None is not counted."""
+        if not self.enabled:
+            return
+        if not self.per_host:
+            host = ''
+        key = (stage, host)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds, nbytes)
+            if outcome is not None:
+                self.outcomes[(stage, host, outcome)] += 1
+
+    def count(self, stage: str, outcome: str, host: str = '') -> None:
+        """Count an outcome of a stage without timing it."""
+        if self.enabled:
+            with self._lock:
+                self.outcomes[(stage, host if self.per_host else '', outcome)] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms = {}
+            self.outcomes = Counter()
+
+    def drain(self) -> dict:
+        """Return everything recorded so far in a picklable form and reset, for merging into another process's recorder."""
+        with self._lock:
+            state = {
+                'histograms': [[stage, host, histogram.state()] for (stage, host), histogram in self.histograms.items()],
+                'outcomes': [[stage, host, outcome, n] for (stage, host, outcome), n in self.outcomes.items()],
+            }
+            self.histograms = {}
+            self.outcomes = Counter()
+        return state
+
+    def merge(self, state: dict) -> None:
+        """Add figures returned by another recorder's ``drain``."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for stage, host, histogram_state in state['histograms']:
+                host = host if self.per_host else ''
+                histogram = self.histograms.get((stage, host))
+                if histogram is None:
+                    histogram = self.histograms[(stage, host)] = Histogram(self.buckets)
+                histogram.merge(histogram_state)
+            for stage, host, outcome, n in state['outcomes']:
+                self.outcomes[(stage, host if self.per_host else '', outcome)] += n
+
+    def summary(self) -> dict:
+        """
+        Summarize the recorded figures.
+
+        Returns:
+            dict: For every stage, the figures over all hosts, per host, and the count of each outcome.
+        """
+        with self._lock:
+            histograms = dict(self.histograms)
+            outcomes = dict(self.outcomes)
+
+        stages: Dict[str, dict] = {}
+        for (stage, host), histogram in sorted(histograms.items()):
+            entry = stages.setdefault(stage, {'total': Histogram(self.buckets), 'hosts': {}, 'outcomes': Counter()})
+            entry['total'].merge(histogram.state())
+            if host:
+                entry['hosts'][host] = histogram.summary()
+        for (stage, _, outcome), n in outcomes.items():
+            stages.setdefault(stage, {'total': Histogram(self.buckets), 'hosts': {}, 'outcomes': Counter()})
+            stages[stage]['outcomes'][outcome] += n
+        for entry in stages.values():
+            entry['total'] = entry['total'].summary()
+            entry['outcomes'] = dict(entry['outcomes'])
+        return {'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'stages': stages}
+
+    def log_summary(self, logger) -> None:
+        """Log one line of figures per stage."""
+        for stage, entry in self.summary()['stages'].items():
+            total = entry['total']
+            outcomes = ', '.join(f"{outcome}={n}" for outcome, n in sorted(entry['outcomes'].items()))
+            logger.info(f"Stage {stage}: {total['count']} runs, {total['seconds']:.2f}s in total, "
+                        f"mean {total['mean'] * 1000:.1f}ms, p90 {total['p90'] * 1000:.1f}ms, "
+                        f"max {total['max'] * 1000:.1f}ms, {total['bytes']} bytes ({outcomes})")
+
+    def prometheus_text(self) -> str:
+        """Render the recorded figures in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            outcomes = sorted(self.outcomes.items())
+
+        def labels(**values: str) -> str:
+            escaped = (f'{name}="{_escape_label(value)}"' for name, value in values.items())
+            return '{' + ','.join(escaped) + '}'
+
+        duration = f"{METRIC_PREFIX}_stage_duration_seconds"
+        lines = [f"# HELP {duration} Time spent in each stage of scraping and conversion.",
+                 f"# TYPE {duration} histogram"]
+        for (stage, host), histogram in histograms:
+            cumulative = 0
+            # The last count is the +Inf bucket, which has no bound of its own.
+            for bound, count in zip(self.buckets, histogram.counts[:-1], strict=True):
+                cumulative += count
+                lines.append(f"{duration}_bucket{labels(stage=stage, host=host, le=repr(bound))} {cumulative}")
+            lines.append(f"{duration}_bucket{labels(stage=stage, host=host, le='+Inf')} {histogram.count}")
+            lines.append(f"{duration}_sum{labels(stage=stage, host=host)} {histogram.sum!r}")
+            lines.append(f"{duration}_count{labels(stage=stage, host=host)} {histogram.count}")
+
+        handled = f"{METRIC_PREFIX}_stage_bytes_total"
+        lines += [f"# HELP {handled} Bytes handled by each stage.", f"# TYPE {handled} counter"]
+        lines += [f"{handled}{labels(stage=stage, host=host)} {histogram.bytes}" for (stage, host), histogram in histograms]
+
+        results = f"{METRIC_PREFIX}_stage_outcomes_total"
+        lines += [f"# HELP {results} Runs of each stage by outcome.", f"# TYPE {results} counter"]
+        lines += [f"{results}{labels(stage=stage, host=host, outcome=outcome)} {n}"
+                  for (stage, host, outcome), n in outcomes]
+        return '\n'.join(lines) + '\n'
+
+    def export(self, name: str) -> Optional[Tuple[str, str]]:
+        """
+        Write ``<name>.json`` and ``<name>.prom`` to the metrics directory.
+
+        Both files are replaced atomically, so the node exporter's textfile
+        collector never reads a half-written file.
+
+        Args:
+            name (str): Base name of the files, e.g. ``scraper``.
+
+        Returns:
+            Optional[Tuple[str, str]]: The paths written, or None while metrics are disabled.
+        """
+        if not self.enabled:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        json_path = os.path.join(self.directory, f"{name}.json")
+        prom_path = os.path.join(self.directory, f"{name}.prom")
+        _write_atomically(json_path, json.dumps(self.summary(), indent=2))
+        _write_atomically(prom_path, self.prometheus_text())
+        return json_path, prom_path
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomically(path: str, content: str) -> None:
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temporary_path, path)
\ No newline at end of file
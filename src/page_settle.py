@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import Set
+from playwright.async_api import Page, Request
+
+# Installed in every page before any of its scripts run; records the time of the last DOM change.
+MUTATION_OBSERVER_SCRIPT = """
+(() => {
+    window.__wcpLastMutation = Date.now();
+    new MutationObserver(() => { window.__wcpLastMutation = Date.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+})();
+"""
+
+# Long-lived requests that never finish while a page is open and must not block settling.
+IGNORED_RESOURCE_TYPES = {'websocket', 'eventsource', 'media'}
+
+
+class PageSettleTracker:
+    """Detects when a page has settled by watching DOM mutations and in-flight requests."""
+
+    def __init__(self, page: Page, quiet_ms: int = 500, poll_ms: int = 100):
+        """
+        Initialize the PageSettleTracker and start listening to the page's requests.
+
+        The page must have ``MUTATION_OBSERVER_SCRIPT`` installed as an init script.
+
+        Args:
+            page (Page): The page to watch.
+            quiet_ms (int): How long the page must stay free of DOM changes and network activity.
+            poll_ms (int): How often the page is checked while waiting.
+        """
+        self.page = page
+        self.quiet_ms = quiet_ms
+        self.poll_ms = poll_ms
+        self._in_flight: Set[Request] = set()
+        self._last_activity = time.monotonic()
+
+        page.on('request', self._on_request)
+        page.on('requestfinished', self._on_request_done)
+        page.on('requestfailed', self._on_request_done)
+
+    def _on_request(self, request: Request) -> None:
+        if request.resource_type not in IGNORED_RESOURCE_TYPES:
+            self._in_flight.add(request)
+            self._last_activity = time.monotonic()
+
+    def _on_request_done(self, request: Request) -> None:
+        if request in self._in_flight:
+            self._in_flight.discard(request)
+            self._last_activity = time.monotonic()
+
+    def reset(self) -> None:
+        """Forget requests left over from a previous navigation."""
+        self._in_flight.clear()
+        self._last_activity = time.monotonic()
+
+    async def _ms_since_mutation(self) -> float:
+        """Return the time since the last DOM mutation in milliseconds."""
+        return await self.page.evaluate('Date.now() - (window.__wcpLastMutation || 0)')
+
+    async def wait_until_settled(self, timeout_ms: int) -> bool:
+        """
+        Wait until no requests are in flight and neither the DOM nor the network changed for ``quiet_ms``.
+
+        The quiet period also has to elapse after the call itself, so that work
+        triggered just before it (a scroll, a click) has a chance to start.
+
+        Args:
+            timeout_ms (int): Maximum time to wait in milliseconds.
+
+        Returns:
+            bool: True if the page settled, False if the timeout was reached first.
+        """
+        start = time.monotonic()
+        deadline = start + timeout_ms / 1000
+        quiet = self.quiet_ms / 1000
+
+        while time.monotonic() < deadline:
+            now = time.monotonic()
+            if not self._in_flight and now - max(start, self._last_activity) >= quiet:
+                try:
+                    if await self._ms_since_mutation() >= self.quiet_ms:
+                        return True
+                except Exception:
+                    # The page navigated while being evaluated; keep waiting.
+                    pass
+            await asyncio.sleep(self.poll_ms / 1000)
+        return False
\ No newline at end of file
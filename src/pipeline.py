@@ -0,0 +1,363 @@
+import asyncio
+import os
+import logging
+from collections import Counter
+from concurrent.futures import Executor, ThreadPoolExecutor
+from urllib.parse import urlparse
+import aiofiles
+import httpx
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from src.config_manager import ConfigManager
+from src.fetch_cache import CacheEntry
+from src.frontier import CrawlFrontier
+from src.link_extractor import LinkExtractor, links_in_html
+from src.postprocessor import Postprocessor, conversion_process_pool, markdown_in_worker
+from src.scheduler import HostScheduler
+from src.scraper import Scraper
+from src.shard_store import MARKDOWN_SHARD_DIR, ShardStore
+from src.url_utils import canonicalize_url
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class PipelineScraper(Scraper):
+    """
+    Scraper that hands the cleaned text of each page to the pipeline instead of saving a .txt file.
+
+    While the pipeline crawls, the HTML of the pages whose links it wants is
+    passed on as well, so that no page is loaded twice.
+    """
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize the PipelineScraper.
+
+        Args:
+            config (ConfigManager): Configuration manager instance.
+        """
+        super().__init__(config)
+        self.documents: Optional[asyncio.Queue] = None
+        # URLs whose links the crawl still has to read, and the queue their (url, HTML) goes to.
+        self.link_pages: Dict[str, int] = {}
+        self.pages: Optional[asyncio.Queue] = None
+
+    def output_path(self, url: str) -> str:
+        """Return the path of the markdown file a URL is converted to."""
+        return os.path.splitext(super().output_path(url))[0] + ".md"
+
+    def output_shard_dir(self) -> str:
+        """Return the markdown store in ``shard_dir``, kept apart from the scraped text like the reprocessor's."""
+        return os.path.join(super().output_shard_dir(), MARKDOWN_SHARD_DIR)
+
+    async def save_text(self, url: str, text: str) -> None:
+        """Queue the extracted text for conversion, waiting while the queue is full."""
+        await self.documents.put((url, text))
+
+    async def fetch_http(self, url: str, cached: Optional[CacheEntry]) -> Optional[httpx.Response]:
+        """Fetch a URL over plain HTTP, without validators when its links are wanted, as a 304 has no links."""
+        return await super().fetch_http(url, None if url in self.link_pages else cached)
+
+    async def store_html(self, url: str, html_content: str, fetched_via: str) -> None:
+        """Keep the raw HTML of a page and pass it on to the crawl if its links are wanted."""
+        await super().store_html(url, html_content, fetched_via)
+        if url in self.link_pages:
+            # Never blocks: the crawl may itself be waiting for room in the scheduler.
+            self.pages.put_nowait((url, html_content))
+
+
+class Pipeline:
+    """
+    Runs link extraction, scraping and markdown conversion as a single streaming pass.
+
+    The crawl feeds a streaming HostScheduler, whose ``max_pending`` bound
+    holds up the crawl while the scraping pages are busy. Its links are read
+    from the HTML the scraper fetched, so each page is loaded once, and with
+    ``link_discovery`` set to ``sitemap`` or ``auto`` the sitemaps are read
+    first, as by the link extractor. The scraped text
+    goes through a bounded queue to the markdown converters. HTML cleaning and
+    markdown conversion run on an executor while fetching continues, and each
+    document is written to disk once, as markdown. With shard output the
+    markdown goes to the store in the ``markdown`` subdirectory of
+    ``shard_dir``, recording the hash of the text it was made from, and the
+    scraped text store is left alone.
+    """
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize the Pipeline.
+
+        Args:
+            config (ConfigManager): Configuration manager instance.
+        """
+        self.config = config
+        self.scraper = PipelineScraper(config)
+        self.link_extractor = LinkExtractor(config)
+        self.postprocessor = Postprocessor(config)
+        # Scraping and conversion stages are recorded together.
+        self.metrics = self.scraper.metrics
+        self.counts: Counter = Counter()
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Set up logging for the pipeline."""
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                            filename='logs/pipeline.log')
+        self.logger = logging.getLogger(__name__)
+
+    def create_executor(self) -> Tuple[Executor, int, Callable[[str], str]]:
+        """
+        Create the executor for the CPU-bound stages, following ``conversion_executor``.
+
+        Returns:
+            Tuple[Executor, int, Callable[[str], str]]: The executor, its number
+            of workers and the function converting text to markdown on it.
+        """
+        if self.config.get('conversion_executor', 'thread') == 'process':
+            workers = int(self.config.get('conversion_processes') or os.cpu_count() or 1)
+            return conversion_process_pool(self.config, workers), workers, markdown_in_worker
+
+        workers = max(1, int(self.config.get('max_workers', 4)))
+        convert = lambda text: self.postprocessor.document_to_markdown(text, lambda current, total: None)
+        return ThreadPoolExecutor(max_workers=workers), workers, convert
+
+    async def write_markdown(self, url: str, markdown: str, source_hash: str) -> None:
+        """Write a converted document in a single write, or append it to the markdown shard store if one is open."""
+        if self.scraper.shard_store is not None:
+            self.scraper.shard_store.add(url, markdown, self.scraper.output_key(url), source_hash=source_hash)
+            return
+        file_path = self.scraper.output_path(url)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
+            await f.write(markdown)
+
+    async def crawl(self, start_url: str, links_file: str, max_depth: int, max_pages: Optional[int],
+                    scheduler: HostScheduler, results: Dict[int, bool], done: asyncio.Queue) -> int:
+        """
+        Schedule the pages of a site breadth-first, reading their links from the scraper's fetches.
+
+        Follows the limits of ``LinkExtractor.crawl``: pages up to ``max_depth``
+        link hops away have their links read, up to ``max_pages`` pages, and
+        every distinct link is written to ``links_file`` and scheduled, up to
+        ``max_links`` links.
+
+        Args:
+            start_url (str): The page to start from.
+            links_file (str): Path of the file the links are written to, one per line.
+            max_depth (int): Number of link hops to follow; 0 only reads the start page.
+            max_pages (Optional[int]): Maximum number of pages whose links are read.
+            scheduler (HostScheduler): The streaming scheduler the pages are scraped from.
+            results (Dict[int, bool]): The scraping results, by scheduler index.
+            done (asyncio.Queue): Receives an item whenever the scraper finished a URL.
+
+        Returns:
+            int: The number of pages whose links were read.
+        """
+        start_url = canonicalize_url(start_url) or start_url
+        parsed_url = urlparse(start_url)
+        frontier = CrawlFrontier(
+            f"{parsed_url.scheme}://{parsed_url.netloc}",
+            expected_urls=int(self.config.get('crawl_expected_urls', 1_000_000)),
+            error_rate=float(self.config.get('crawl_false_positive_rate', 0.001)),
+        )
+        max_pages = max_pages or int(self.config.get('crawl_max_pages', 1000))
+        max_links = self.config.get('max_links')
+        link_pages = self.scraper.link_pages
+        pages = self.scraper.pages
+        # Scheduler indexes of the pages whose links are wanted and that are not scraped yet.
+        waiting: Dict[int, str] = {}
+        wanted = pages_read = links_written = duplicates = 0
+
+        async def schedule(url: str, depth: int) -> bool:
+            nonlocal wanted
+            wants_links = depth <= max_depth and wanted < max_pages
+            if wants_links:
+                link_pages[url] = depth
+                wanted += 1
+            index = await scheduler.add(url)
+            if index is None:
+                return False
+            if wants_links:
+                waiting[index] = url
+            return True
+
+        frontier.add(start_url, 0, enqueue=False)
+        with open(links_file, 'w', encoding='utf-8') as output:
+            if not await schedule(start_url, 0):
+                return 0
+            while waiting or not pages.empty():
+                if pages.empty():
+                    await done.get()
+                else:
+                    url, html_content = pages.get_nowait()
+                    depth = link_pages.pop(url, None)
+                    if depth is None:
+                        continue
+                    pages_read += 1
+                    for link in links_in_html(html_content, url):
+                        if max_links and links_written >= max_links:
+                            break
+                        if not frontier.add(link, depth + 1, enqueue=False):
+                            duplicates += 1
+                            continue
+                        output.write(link + '\n')
+                        links_written += 1
+                        if not await schedule(link, depth + 1):
+                            break
+                    output.flush()
+                # A scraped page has already handed over its HTML, if it had any.
+                for index in [index for index in waiting if index in results]:
+                    del waiting[index]
+        link_pages.clear()
+        self.logger.info(f"Crawled {pages_read} pages of {start_url} and saved {links_written} links to {links_file}, "
+                         f"skipping {duplicates} duplicates")
+        return pages_read
+
+    async def run(self, start_url: Optional[str] = None, urls: Optional[List[str]] = None, max_depth: int = 0,
+                  max_pages: Optional[int] = None, progress: Optional[Callable] = None) -> None:
+        """
+        Turn the pages of a crawl and/or a list of URLs into markdown files.
+
+        Args:
+            start_url (Optional[str]): Page to scrape and crawl from, if any.
+            urls (Optional[List[str]]): Further URLs to scrape.
+            max_depth (int): Number of link hops to follow from ``start_url``.
+            max_pages (Optional[int]): Maximum number of pages to fetch while crawling.
+            progress (Optional[Callable]): Progress callback receiving a fraction and a description.
+        """
+        queue_size = max(1, int(self.config.get('pipeline_queue_size', 100)))
+        pool_size = max(1, int(self.config.get('max_workers', 4)))
+        documents: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        scheduler = self.scraper.new_scheduler([], pool_size, streaming=True, max_pending=queue_size)
+        results: Dict[int, bool] = {}
+        done: asyncio.Queue = asyncio.Queue()
+        self.counts = Counter()
+        self.scraper.documents = documents
+        self.scraper.pages = asyncio.Queue()
+        self.scraper.link_pages = {}
+        loop = asyncio.get_running_loop()
+
+        def report_progress() -> None:
+            done.put_nowait(None)
+            if progress:
+                finished = len(results)
+                progress(finished / max(scheduler.added_count, 1),
+                         desc=f"Scraped {finished}/{scheduler.added_count} URLs, "
+                              f"wrote {self.counts['converted']} markdown files")
+
+        async def produce() -> None:
+            try:
+                if start_url:
+                    os.makedirs('data/input', exist_ok=True)
+                    links_file = os.path.join('data/input', f"{urlparse(start_url).netloc}_links.txt")
+                    mode = self.config.get('link_discovery', 'crawl')
+                    sitemap_links = 0
+                    if mode != 'crawl':
+                        sitemap_links = await self.link_extractor.read_sitemaps(
+                            start_url, links_file, on_link=scheduler.add)
+                    if sitemap_links or mode == 'sitemap':
+                        await scheduler.add(canonicalize_url(start_url) or start_url)
+                    else:
+                        self.counts['crawled'] = await self.crawl(
+                            start_url, links_file, max_depth, max_pages, scheduler, results, done)
+                for url in urls or []:
+                    await scheduler.add(url)
+            finally:
+                await scheduler.close()
+
+        async def convert_documents() -> None:
+            while True:
+                item = await documents.get()
+                if item is None:
+                    return
+                url, text = item
+                host = urlparse(url).netloc
+                try:
+                    with self.metrics.time('convert_markdown', host, len(text)):
+                        markdown = await loop.run_in_executor(executor, convert, text)
+                    with self.metrics.time('write_markdown', host, len(markdown)):
+                        await self.write_markdown(url, markdown, ShardStore.content_hash(text))
+                    self.counts['converted'] += 1
+                except Exception as e:
+                    self.logger.error(f"Error converting {url}: {str(e)}")
+                    self.counts['conversion_failed'] += 1
+                report_progress()
+
+        executor, workers, convert = self.create_executor()
+        self.scraper.clean_executor = executor
+        # Opened here rather than by the scraper, since the converters keep writing after scraping ends.
+        self.scraper.open_output()
+        producer = asyncio.create_task(produce())
+        converters = [asyncio.create_task(convert_documents()) for _ in range(workers)]
+        try:
+            try:
+                await self.scraper.scrape_scheduled(scheduler, results, report_progress, pool_size)
+            except BaseException:
+                producer.cancel()
+                raise
+            finally:
+                await scheduler.close()
+                for _ in converters:
+                    await documents.put(None)
+                await asyncio.gather(*converters)
+            await producer
+        finally:
+            self.scraper.clean_executor = None
+            self.scraper.close_output()
+            executor.shutdown()
+
+        self.counts['urls'] = scheduler.added_count
+        self.counts['scraped'] = sum(results.values())
+        self.counts['failed'] = len(results) - self.counts['scraped']
+        self.logger.info(f"Pipeline finished: {self.counts['scraped']} of {self.counts['urls']} URLs scraped, "
+                         f"{self.counts['converted']} markdown files written, "
+                         f"{self.counts['conversion_failed']} conversions failed")
+        self.metrics.log_summary(self.logger)
+        self.metrics.export('pipeline')
+
+    def run_summary(self) -> Dict[str, int]:
+        """Return the figures of the last pipeline run, as shown in the interface and printed by the CLI."""
+        return {
+            "Pages Crawled": self.counts['crawled'],
+            "URLs Scheduled": self.counts['urls'],
+            "Successful": self.counts['scraped'],
+            "Failed": self.counts['failed'],
+            "Markdown Files Written": self.counts['converted'],
+            "Conversion Failures": self.counts['conversion_failed'],
+            "Fetched via HTTP": self.scraper.fetch_counts['http'],
+            "Fetched via Browser": self.scraper.fetch_counts['browser'],
+            "Cache Hits": self.scraper.cache_counts['hits'],
+        }
+
+    def run_pipeline(self, start_url: str, urls_file, max_depth: int = 0, max_pages: Optional[int] = None,
+                     progress: Optional[Callable] = None) -> Tuple["pd.DataFrame", str]:
+        """
+        Run the pipeline from the interface.
+
+        Args:
+            start_url (str): Page to crawl from; may be empty when a URLs file is given.
+            urls_file: Uploaded file with one URL per line, or None.
+            max_depth (int): Number of link hops to follow from ``start_url``.
+            max_pages (Optional[int]): Maximum number of pages to fetch while crawling.
+            progress (Optional[Callable]): Progress callback receiving a fraction and a description.
+
+        Returns:
+            Tuple[pd.DataFrame, str]: A summary of the run and a status message.
+        """
+        import pandas as pd
+
+        start_url = (start_url or '').strip() or None
+        urls = self.scraper.read_urls_from_file(urls_file.name) if urls_file is not None else []
+        if not start_url and not urls:
+            return pd.DataFrame(), "Please enter a start URL or upload a file of URLs."
+
+        if progress:
+            progress(0, desc="Initializing...")
+        try:
+            asyncio.run(self.run(start_url, urls, int(max_depth or 0), int(max_pages) if max_pages else None, progress))
+        except Exception as e:
+            self.logger.exception(f"An error occurred while running the pipeline: {str(e)}")
+            return pd.DataFrame(), f"An error occurred: {str(e)}"
+
+        results_df = pd.DataFrame({name: [value] for name, value in self.run_summary().items()})
+        return results_df, "Pipeline completed successfully!"
\ No newline at end of file
@@ -1,12 +1,32 @@
 import os
 import re
-from typing import List, Iterator, Dict, Optional, Tuple, Callable, Any
+import tempfile
+from typing import List, Iterable, Iterator, Dict, Mapping, Optional, Tuple, Callable
 from pathlib import Path
 import logging
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import gradio as gr
+from itertools import islice
+import multiprocessing
+import queue
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 from src.config_manager import ConfigManager
+from src.conversion_manifest import ConversionManifest
+from src.metrics import MetricsRecorder
+from src.shard_store import ShardStore
+
+# Classifies a line in one match: blank, already markdown (headings, bullet points,
+# numbered lists, blockquotes, code fences, inline code, links, bold, italic),
+# a shell-style '$' code line, or plain text when no group matches.
+LINE_CLASSIFIER = re.compile(
+    r"\s*(?:"
+    r"(?P<blank>$)"
+    r"|(?P<markdown>#+\s|[-*+]\s|\d+\.\s|>|```|`[^`]+`|\[.*\]\(.*\)|\*\*[^*]+\*\*|\*[^*]+\*)"
+    r"|(?P<code>\$)"
+    r")?"
+)
+
+# Number of lines converted at a time, which bounds what a streamed conversion holds in memory.
+LINE_BLOCK_SIZE = 4096
 
 class Postprocessor:
     """Handles postprocessing of scraped content."""
@@ -21,6 +41,7 @@ class Postprocessor:
         self.config = config
         self.setup_logging()
         self.reporter = ConversionReporter()
+        self.metrics = MetricsRecorder.from_config(config)
 
     def setup_logging(self):
         """Set up logging for the postprocessor."""
@@ -28,139 +49,401 @@ class Postprocessor:
                             filename='logs/postprocessor.log')
         self.logger = logging.getLogger(__name__)
 
+    def iter_markdown(self, lines: Iterable[str]) -> Iterator[Tuple[str, int]]:
+        """
+        Convert lines of text to markdown one block of lines at a time.
+
+        The code block state is carried from one block to the next, so any line
+        iterator can be converted without holding the whole document in memory.
+        Every line is classified by a single match of ``LINE_CLASSIFIER``.
+
+        Args:
+            lines (Iterable[str]): Lines of text without their line endings.
+
+        Yields:
+            Tuple[str, int]: The markdown of a block and the number of lines it was made from.
+        """
+        classify = LINE_CLASSIFIER.match
+        inside_code_block = False
+        lines = iter(lines)
+
+        while True:
+            block = list(islice(lines, LINE_BLOCK_SIZE))
+            if not block:
+                return
+            markdown_content = []
+            append = markdown_content.append
+            for line in block:
+                kind = classify(line).lastgroup
+                if kind == 'blank':
+                    append("\n")
+                elif kind == 'markdown':
+                    append(line + "\n")
+                elif kind == 'code':
+                    if not inside_code_block:
+                        append("```\n")
+                        inside_code_block = True
+                    append(line.strip() + "\n")
+                elif inside_code_block:
+                    append("```\n\n")
+                    inside_code_block = False
+                else:
+                    append(line.strip() + "\n\n")
+            yield ''.join(markdown_content), len(block)
+
     def document_to_markdown(self, input_text: str, progress_callback: Callable[[int, int], None]) -> str:
-        """Convert a text document to markdown format."""
-        markdown_content = []
-        bullet_point_pattern = re.compile(r"^\s*[-*+]\s+.*")
-        numbered_list_pattern = re.compile(r"^\s*\d+\.\s+.*")
-        code_block_pattern = re.compile(r"^\s*\$.*")
+        """
+        Convert a text document to markdown format.
 
+        Progress is reported once at least ``progress_update_frequency`` lines
+        were converted since the last report, checked after every block of
+        lines, and once more at the end.
+        """
         lines = input_text.splitlines()
         total_lines = len(lines)
-        inside_code_block = False
-        current_indentation_level = 0
-
-        for idx, line in enumerate(lines):
-            if not line.strip():
-                markdown_content.append("\n")
-                continue
-
-            if self.detect_existing_markdown(line):
-                markdown_content.append(self.preserve_markdown(line))
-                continue
-
-            if code_block_pattern.match(line):
-                if not inside_code_block:
-                    markdown_content.append("```\n")
-                    inside_code_block = True
-                markdown_content.append(f"{line.strip()}\n")
-            elif inside_code_block:
-                markdown_content.append("```\n\n")
-                inside_code_block = False
-            elif bullet_point_pattern.match(line):
-                current_indentation_level = len(line) - len(line.lstrip())
-                markdown_content.append(self.format_bullet_point(line, current_indentation_level // 2))
-            elif numbered_list_pattern.match(line):
-                current_indentation_level = len(line) - len(line.lstrip())
-                markdown_content.append(self.format_bullet_point(line, current_indentation_level // 2, is_numbered=True))
-            else:
-                markdown_content.append(f"{line.strip()}\n\n")
+        update_frequency = int(self.config.get('progress_update_frequency', 10))
+        converted_lines = reported_lines = 0
+        markdown_content = []
 
-            if idx % self.config.get('PROGRESS_UPDATE_FREQUENCY', 10) == 0:
-                progress_callback(idx + 1, total_lines)
+        for markdown, line_count in self.iter_markdown(lines):
+            markdown_content.append(markdown)
+            converted_lines += line_count
+            if converted_lines - reported_lines >= update_frequency or converted_lines == total_lines:
+                progress_callback(converted_lines, total_lines)
+                reported_lines = converted_lines
 
         return ''.join(markdown_content)
 
     @staticmethod
     def detect_existing_markdown(line: str) -> bool:
         """Detect if a line is already a valid markdown element."""
-        markdown_patterns = [
-            r"^\s*#+\s+.*",  # Headings
-            r"^\s*[-*+]\s+.*",  # Bullet points
-            r"^\s*\d+\.\s+.*",  # Numbered lists
-            r"^\s*>.*",  # Blockquotes
-            r"^\s*```",  # Code block start/end
-            r"^\s*`[^`]+`",  # Inline code
-            r"^\s*\[.*\]\(.*\)",  # Links
-            r"^\s*\*\*[^*]+\*\*",  # Bold
-            r"^\s*\*[^*]+\*",  # Italic
-        ]
-        return any(re.match(pattern, line) for pattern in markdown_patterns)
-
-    @staticmethod
-    def preserve_markdown(line: str) -> str:
-        """Preserve existing markdown formatting."""
-        return line + "\n"
-
-    @staticmethod
-    def format_bullet_point(line: str, indent_level: int, is_numbered: bool = False) -> str:
-        """Format a bullet point or numbered list item with proper indentation."""
-        indent = "  " * indent_level
-        if is_numbered:
-            return f"{indent}{line.strip()}\n"
-        return f"{indent}- {line.strip()[1:]}\n"
-
-    def process_file(self, text_file: Path, output_directory: Path, progress_callback: Callable[[int, int], None]) -> Tuple[Path, Optional[str]]:
-        """Process a single text file and convert it to markdown."""
-        try:
-            if text_file.stat().st_size > self.config.get('MAX_FILE_SIZE', 10 * 1024 * 1024):
-                self.logger.warning(f"Skipping {text_file} due to file size.")
-                return text_file, f"File too large (>{self.config.get('MAX_FILE_SIZE')} bytes)"
+        return LINE_CLASSIFIER.match(line).lastgroup == 'markdown'
 
-            self.logger.info(f"Processing file: {text_file}")
-            with open(text_file, "r", encoding="utf-8") as file:
-                input_text = file.read()
+    def process_file(self, text_file: Path, output_file: Path, progress_callback: Callable[[int, int], None]) -> Tuple[Path, Optional[str]]:
+        """
+        Process a single text file and convert it to markdown in ``output_file``.
 
-            markdown_output = self.document_to_markdown(input_text, progress_callback)
+        With ``streaming_conversion`` enabled the file is converted line by
+        line and written out as it goes, so files of any size are converted in
+        constant memory. Otherwise the whole file is read at once and files
+        larger than ``max_file_size`` are skipped. Each file is recorded as
+        the ``convert_file`` stage of ``metrics``.
+        """
+        with self.metrics.time('convert_file') as timer:
+            try:
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+                timer.nbytes = text_file.stat().st_size
+                if self.config.get('streaming_conversion', True):
+                    self.logger.info(f"Streaming file: {text_file}")
+                    self.stream_file_to_markdown(text_file, output_file, progress_callback)
+                    self.logger.info(f"Markdown file '{output_file}' created successfully.")
+                    return text_file, None
+
+                if timer.nbytes > self.config.get('max_file_size', 10 * 1024 * 1024):
+                    timer.outcome = 'too_large'
+                    self.logger.warning(f"Skipping {text_file} due to file size.")
+                    return text_file, f"File too large (>{self.config.get('max_file_size')} bytes)"
+
+                self.logger.info(f"Processing file: {text_file}")
+                with open(text_file, "r", encoding="utf-8") as file:
+                    input_text = file.read()
+
+                markdown_output = self.document_to_markdown(input_text, progress_callback)
+
+                with open(output_file, "w", encoding="utf-8") as markdown_file:
+                    markdown_file.write(markdown_output)
+
+                self.logger.info(f"Markdown file '{output_file}' created successfully.")
+                return text_file, None
+            except Exception as e:
+                timer.outcome = 'error'
+                self.logger.error(f"Error processing file {text_file}: {str(e)}")
+                return text_file, str(e)
 
-            output_file = output_directory / text_file.with_suffix('.md').name
-            with open(output_file, "w", encoding="utf-8") as markdown_file:
-                markdown_file.write(markdown_output)
+    @staticmethod
+    def output_file_for(text_file: str, input_root: str, output_root: str) -> str:
+        """Return the markdown file a text file is converted to, at the same relative path under the output directory."""
+        relative = os.path.relpath(os.path.splitext(text_file)[0], input_root)
+        return os.path.join(output_root, relative + '.md')
 
-            self.logger.info(f"Markdown file '{output_file}' created successfully.")
-            return text_file, None
-        except Exception as e:
-            self.logger.error(f"Error processing file {text_file}: {str(e)}")
-            return text_file, str(e)
+    def stream_file_to_markdown(self, text_file: Path, output_file: Path, progress_callback: Callable[[int, int], None]) -> None:
+        """
+        Convert a text file to markdown while reading it, writing each converted block straight away.
 
-    def convert_files(self, input_directory: str, output_directory: str, progress=gr.Progress()) -> str:
-        """Convert multiple files from text to markdown."""
+        Only one block of lines is held in memory at a time. The markdown is
+        written to a temporary file of its own that replaces ``output_file`` once
+        the whole input was converted, so a failure never leaves a truncated
+        output behind and concurrent conversions never share a partial file.
+        Progress is reported in characters read against the file size.
+        """
+        total_size = max(text_file.stat().st_size, 1)
+        characters_read = 0
+
+        def read_lines(file) -> Iterator[str]:
+            nonlocal characters_read
+            for raw_line in file:
+                characters_read += len(raw_line)
+                # splitlines() also breaks on the separators that a text file
+                # iterator keeps inside a line, like document_to_markdown does.
+                yield from raw_line.splitlines()
+
+        markdown_file = tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', dir=output_file.parent, prefix=output_file.name + '.', suffix='.part', delete=False)
+        partial_file = Path(markdown_file.name)
+        try:
+            with open(text_file, "r", encoding="utf-8") as source, markdown_file:
+                for markdown, _ in self.iter_markdown(read_lines(source)):
+                    markdown_file.write(markdown)
+                    progress_callback(min(characters_read, total_size), total_size)
+            os.replace(partial_file, output_file)
+        finally:
+            if partial_file.exists():
+                partial_file.unlink()
+        progress_callback(total_size, total_size)
+
+    def convert_files(self, input_directory: str, output_directory: str, progress: Optional[Callable] = None) -> str:
+        """
+        Convert multiple files from text to markdown.
+
+        A manifest in the output directory records the size, modification time
+        and content hash of every converted file. Each file is converted to the
+        same relative path under the output directory, with an ``.md`` suffix;
+        of two inputs that would share an output, such as ``page.txt`` and
+        ``page.html``, only the first is converted. Files recorded there as
+        outputs, the report and files that would be converted onto themselves
+        are never taken as inputs. With ``incremental_conversion`` enabled only
+        new or changed files are converted. An input directory holding a shard
+        store is converted with ``convert_shards``.
+
+        ``progress``, if given, receives a fraction and a description.
+        """
+        if progress is None:
+            progress = lambda fraction, desc=None: None
         input_path = Path(input_directory)
         output_path = Path(output_directory)
         
         if not input_path.is_dir():
             return "Error: Input directory does not exist."
+
+        if ShardStore.is_store(input_directory):
+            return self.convert_shards(input_directory, output_directory, progress)
         
         output_path.mkdir(parents=True, exist_ok=True)
         
-        supported_files = [f for f in input_path.rglob('*') if f.suffix in self.config.get('SUPPORTED_FILE_TYPES', ['.txt'])]
+        output_root = str(output_path.resolve())
+        manifest = ConversionManifest(output_root)
+        report_path = output_path / "conversion_report.md"
+        own_files = manifest.outputs() | {os.path.join(output_root, report_path.name)}
+        supported_types = tuple(self.config.get('supported_file_types', ['.txt']))
+        input_root = str(input_path.resolve())
+        candidates = {}
+        sources_by_output = {}
+        for directory, _, file_names in os.walk(input_root):
+            for file_name in sorted(file_names):
+                if not file_name.endswith(supported_types):
+                    continue
+                source = os.path.join(directory, file_name)
+                output = self.output_file_for(source, input_root, output_root)
+                # A markdown file in the output directory would be converted onto itself.
+                if source in own_files or source == output:
+                    continue
+                if output in sources_by_output:
+                    self.logger.warning(f"Skipping {source}: {sources_by_output[output]} is already converted to {output}")
+                    self.reporter.log_failure(Path(source), f"Output {output} is also the output of {sources_by_output[output]}")
+                    continue
+                sources_by_output[output] = source
+                candidates[source] = output
         
-        if not supported_files:
+        if not candidates:
             return "No supported files found in the input directory."
         
-        total_files = len(supported_files)
-        progress(0, desc="Initializing...")
-        
-        with ThreadPoolExecutor(max_workers=self.config.get('MAX_WORKERS', 4)) as executor:
-            futures = [executor.submit(self.process_file, text_file, output_path, 
-                                       lambda current, total, file=text_file: progress((current / total) / total_files + (supported_files.index(file) / total_files), 
-                                                                                      desc=f"Processing {file.name}")) 
-                       for text_file in supported_files]
-            
-            for future in as_completed(futures):
-                result = future.result()
-                if result[1] is None:
-                    self.reporter.log_success(result[0])
+        executor_type = self.config.get('conversion_executor', 'thread')
+        if executor_type not in ('thread', 'process'):
+            return f"Error: Unknown conversion executor '{executor_type}', expected 'thread' or 'process'."
+
+        self.metrics.reset()
+        progress(0, desc="Checking for changes...")
+        incremental = self.config.get('incremental_conversion', True)
+        pending_entries = {}
+        for source, output in candidates.items():
+            entry = manifest.check(source, output) if incremental else manifest.describe(source, output)
+            if entry is None:
+                self.reporter.log_skipped(Path(source))
+                self.metrics.count('convert_file', 'up_to_date')
+            else:
+                pending_entries[Path(source)] = entry
+        supported_files = list(pending_entries)
+        outputs = {text_file: Path(candidates[str(text_file)]) for text_file in supported_files}
+        self.logger.info(f"{len(supported_files)} of {len(candidates)} files need converting")
+
+        if supported_files:
+            progress(0, desc="Initializing...")
+            if executor_type == 'process':
+                results = self._convert_in_processes(supported_files, outputs, progress)
+            else:
+                results = self._convert_in_threads(supported_files, outputs, progress)
+
+            for text_file, error in results:
+                if error is None:
+                    self.reporter.log_success(text_file)
+                    manifest.record(str(text_file), pending_entries[text_file])
                 else:
-                    self.reporter.log_failure(result[0], result[1])
-        
+                    self.reporter.log_failure(text_file, error)
+        manifest.save()
+        self.metrics.log_summary(self.logger)
+        self.metrics.export('postprocessor')
+
         report = self.reporter.generate_report(self.config.get('report_format', 'markdown'))
-        report_path = output_path / "conversion_report.md"
         with open(report_path, "w", encoding="utf-8") as report_file:
             report_file.write(report)
         
         return f"Conversion completed. Report saved to {report_path}"
 
+    def convert_shards(self, input_directory: str, output_directory: str, progress: Optional[Callable] = None) -> str:
+        """
+        Convert the documents of a shard store to markdown, appended to a shard store in the output directory.
+
+        Documents are read in storage order and converted in windows on the
+        ``conversion_executor``, so memory use does not grow with the size of
+        the store. With ``incremental_conversion`` enabled, documents whose
+        markdown was made from the same text, by its content hash, are skipped.
+        A document whose text was rewritten, for instance by the reprocessor
+        or the deduplicator, is converted again.
+
+        ``progress``, if given, receives a fraction and a description.
+        """
+        if progress is None:
+            progress = lambda fraction, desc=None: None
+        if os.path.abspath(input_directory) == os.path.abspath(output_directory):
+            return "Error: Shards cannot be converted into their own directory, please choose another output directory."
+        executor_type = self.config.get('conversion_executor', 'thread')
+        if executor_type not in ('thread', 'process'):
+            return f"Error: Unknown conversion executor '{executor_type}', expected 'thread' or 'process'."
+
+        if executor_type == 'process':
+            workers = int(self.config.get('conversion_processes') or os.cpu_count() or 1)
+            executor, convert = conversion_process_pool(self.config, workers), markdown_in_worker
+        else:
+            workers = self.config.get('max_workers', 4)
+            executor = ThreadPoolExecutor(max_workers=workers)
+            convert = lambda text: self.document_to_markdown(text, lambda current, total: None)
+        window_size = workers * max(int(self.config.get('conversion_batch_size', 8)), 1) * 4
+
+        source = ShardStore(input_directory)
+        target = ShardStore(output_directory, max_shard_bytes=int(float(self.config.get('shard_max_mb', 256)) * 1024 * 1024))
+        incremental = self.config.get('incremental_conversion', True)
+        total = max(len(source), 1)
+        self.metrics.reset()
+        finished = 0
+
+        def convert_window(window) -> None:
+            nonlocal finished
+            futures = [(record, source_hash, executor.submit(convert, record.text)) for record, source_hash in window]
+            for record, source_hash, future in futures:
+                try:
+                    target.add(record.url, future.result(), record.key, record.fetched_at, source_hash)
+                    self.reporter.log_success(record.url)
+                    self.metrics.count('convert_document', 'ok')
+                except Exception as e:
+                    self.logger.error(f"Error converting {record.url}: {str(e)}")
+                    self.reporter.log_failure(record.url, str(e))
+                    self.metrics.count('convert_document', 'error')
+                finished += 1
+                progress(finished / total, desc=f"Converting {record.url}")
+
+        self.logger.info(f"Converting {len(source)} documents from the shards in {input_directory}")
+        progress(0, desc="Initializing...")
+        try:
+            window = []
+            for record in source.documents():
+                source_hash = ShardStore.content_hash(record.text)
+                converted = target.entry(record.url) if incremental else None
+                if converted is not None and converted.source_hash == source_hash:
+                    self.reporter.log_skipped(record.url)
+                    self.metrics.count('convert_document', 'up_to_date')
+                    finished += 1
+                    continue
+                window.append((record, source_hash))
+                if len(window) >= window_size:
+                    convert_window(window)
+                    window = []
+            convert_window(window)
+        finally:
+            executor.shutdown()
+            source.close()
+            target.close()
+        self.metrics.log_summary(self.logger)
+        self.metrics.export('postprocessor')
+
+        report_path = os.path.join(output_directory, "conversion_report.md")
+        report = self.reporter.generate_report(self.config.get('report_format', 'markdown'))
+        with open(report_path, "w", encoding="utf-8") as report_file:
+            report_file.write(report)
+        return f"Conversion completed. Report saved to {report_path}"
+
+    def _convert_in_threads(self, supported_files: List[Path], outputs: Mapping[Path, Path], progress) -> List[Tuple[Path, Optional[str]]]:
+        """Convert files on a thread pool of ``max_workers`` threads and return ``(path, error)`` for each of them."""
+        total_files = len(supported_files)
+        file_indexes = {text_file: index for index, text_file in enumerate(supported_files)}
+        results = []
+        with ThreadPoolExecutor(max_workers=self.config.get('max_workers', 4)) as executor:
+            futures = [executor.submit(self.process_file, text_file, outputs[text_file], 
+                                       lambda current, total, file=text_file: progress((current / total) / total_files + (file_indexes[file] / total_files), 
+                                                                                      desc=f"Processing {file.name}")) 
+                       for text_file in supported_files]
+            
+            for future in as_completed(futures):
+                results.append(future.result())
+        return results
+
+    def _convert_in_processes(self, supported_files: List[Path], outputs: Mapping[Path, Path], progress) -> List[Tuple[Path, Optional[str]]]:
+        """
+        Convert files on a pool of worker processes, which sidesteps the GIL for the CPU-bound conversion.
+
+        Files are sent in batches of ``conversion_batch_size`` paths. Workers
+        read and write the files themselves, so only paths, ``(path, error)``
+        tuples and the metrics of each batch cross process boundaries, and
+        their progress events are forwarded to ``progress`` through a queue.
+
+        Returns:
+            List[Tuple[Path, Optional[str]]]: ``(path, error)`` for each file.
+        """
+        total_files = len(supported_files)
+        file_indexes = {str(text_file): index for index, text_file in enumerate(supported_files)}
+        batch_size = max(int(self.config.get('conversion_batch_size', 8)), 1)
+        batches = [[(str(text_file), str(outputs[text_file])) for text_file in supported_files[start:start + batch_size]]
+                   for start in range(0, total_files, batch_size)]
+        max_workers = min(int(self.config.get('conversion_processes') or os.cpu_count() or 1), len(batches))
+        progress_queue = multiprocessing.get_context('spawn').Queue()
+        results = []
+
+        def forward_progress() -> None:
+            while True:
+                try:
+                    file, current, total = progress_queue.get_nowait()
+                except queue.Empty:
+                    return
+                progress((current / total) / total_files + file_indexes[file] / total_files,
+                         desc=f"Processing {Path(file).name}")
+
+        self.logger.info(f"Converting {total_files} files in {len(batches)} batches on {max_workers} processes")
+        with conversion_process_pool(self.config, max_workers, progress_queue) as executor:
+            pending = {executor.submit(_convert_batch, batch): batch for batch in batches}
+            while pending:
+                done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                forward_progress()
+                for future in done:
+                    batch = pending.pop(future)
+                    try:
+                        batch_results, batch_metrics = future.result()
+                        self.metrics.merge(batch_metrics)
+                    except Exception as e:
+                        self.logger.error(f"Conversion worker failed: {str(e)}")
+                        batch_results = [(text_file, f"Worker process failed: {str(e)}") for text_file, _ in batch]
+                    results.extend((Path(text_file), error) for text_file, error in batch_results)
+        forward_progress()
+        return results
+
 class ConversionReporter:
     """Handles reporting for the conversion process."""
 
@@ -168,6 +451,7 @@ class ConversionReporter:
         """Initialize the ConversionReporter."""
         self.processed_files: List[str] = []
         self.failed_files: Dict[str, str] = {}
+        self.skipped_files: List[str] = []
         self.start_time: datetime = datetime.now()
         self.end_time: Optional[datetime] = None
 
@@ -179,6 +463,10 @@ class ConversionReporter:
         """Log a file that failed to process."""
         self.failed_files[str(file_path)] = error
 
+    def log_skipped(self, file_path: Path) -> None:
+        """Log a file skipped because its output is up to date."""
+        self.skipped_files.append(str(file_path))
+
     def generate_report(self, format: str = 'markdown') -> str:
         """Generate a conversion report in the specified format."""
         self.end_time = datetime.now()
@@ -198,19 +486,21 @@ class ConversionReporter:
             "total_files": str(total_files),
             "successful_conversions": str(len(self.processed_files)),
             "failed_conversions": str(len(self.failed_files)),
+            "skipped_files": str(len(self.skipped_files)),
         }
 
     def _generate_markdown_report(self, total_files: int, duration: datetime) -> str:
         """Generate a markdown report."""
         common_data = self._generate_report_common(total_files, duration)
         report = [
-            f"# Conversion Report\n",
+            "# Conversion Report\n",
             f"**Start Time:** {common_data['start_time']}\n",
             f"**End Time:** {common_data['end_time']}\n",
             f"**Duration:** {common_data['duration']}\n",
             f"**Total Files Processed:** {common_data['total_files']}\n",
             f"**Successful Conversions:** {common_data['successful_conversions']}\n",
             f"**Failed Conversions:** {common_data['failed_conversions']}\n",
+            f"**Skipped (Up to Date):** {common_data['skipped_files']}\n",
         ]
 
         if self.processed_files:
@@ -229,13 +519,14 @@ class ConversionReporter:
         """Generate an HTML report."""
         common_data = self._generate_report_common(total_files, duration)
         report = [
-            f"<h1>Conversion Report</h1>",
+            "<h1>Conversion Report</h1>",
             f"<p><strong>Start Time:</strong> {common_data['start_time']}</p>",
             f"<p><strong>End Time:</strong> {common_data['end_time']}</p>",
             f"<p><strong>Duration:</strong> {common_data['duration']}</p>",
             f"<p><strong>Total Files Processed:</strong> {common_data['total_files']}</p>",
             f"<p><strong>Successful Conversions:</strong> {common_data['successful_conversions']}</p>",
             f"<p><strong>Failed Conversions:</strong> {common_data['failed_conversions']}</p>",
+            f"<p><strong>Skipped (Up to Date):</strong> {common_data['skipped_files']}</p>",
         ]
 
         if self.processed_files:
@@ -250,4 +541,43 @@ class ConversionReporter:
                 report.append(f"<li>{file}: {error}</li>")
             report.append("</ul>")
 
-        return ''.join(report)
\ No newline at end of file
+        return ''.join(report)
+
+
+def conversion_process_pool(config: ConfigManager, max_workers: int, progress_queue=None) -> ProcessPoolExecutor:
+    """
+    Create a pool of conversion worker processes, each with its own Postprocessor.
+
+    Workers are spawned rather than forked: the parent runs threads (the
+    Gradio server, executor and event loop helpers), and a forked child can
+    inherit a lock one of them held and hang.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=init_conversion_worker, initargs=(config, progress_queue))
+
+
+# Postprocessor of the current worker process, created once by the pool initializer.
+_worker_postprocessor: Optional[Postprocessor] = None
+_worker_progress_queue = None
+
+
+def init_conversion_worker(config: ConfigManager, progress_queue=None) -> None:
+    """Set up a conversion worker process with its own Postprocessor."""
+    global _worker_postprocessor, _worker_progress_queue
+    _worker_postprocessor = Postprocessor(config)
+    _worker_progress_queue = progress_queue
+
+
+def _convert_batch(files: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, Optional[str]]], dict]:
+    """Convert a batch of ``(text file, markdown file)`` pairs in a worker process and return ``(path, error)`` for each of them and the batch's metrics."""
+    results = []
+    for text_file, output_file in files:
+        report_progress = lambda current, total, file=text_file: _worker_progress_queue.put((file, current, total))
+        _, error = _worker_postprocessor.process_file(Path(text_file), Path(output_file), report_progress)
+        results.append((text_file, error))
+    return results, _worker_postprocessor.metrics.drain()
+
+
+def markdown_in_worker(input_text: str) -> str:
+    """Convert a text document to markdown in a worker process set up by ``init_conversion_worker``."""
+    return _worker_postprocessor.document_to_markdown(input_text, lambda current, total: None)
\ No newline at end of file
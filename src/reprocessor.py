@@ -0,0 +1,193 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from src.config_manager import ConfigManager
+from src.html_cleaner import get_html_backend
+from src.html_store import HtmlEntry, HtmlStore
+from src.http_fetcher import JS_CHECK_MARKER
+from src.metrics import MetricsRecorder
+from src.postprocessor import Postprocessor
+from src.scraper import Scraper
+from src.shard_store import MARKDOWN_SHARD_DIR, ShardStore
+
+
+class Reprocessor:
+    """
+    Re-runs HTML cleaning, and optionally markdown conversion, over the raw HTML cache without network access.
+
+    Used after changing the extraction rules: every URL in the HTML store
+    gets its output rewritten from the stored HTML, to the same files or
+    shards the scraper writes to. Markdown goes to ``.md`` files next to the
+    text files, or to a store of its own in the ``markdown`` subdirectory of
+    ``shard_dir``, so the scraped text is never overwritten. Content shared
+    by several URLs is cleaned once.
+    """
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize the Reprocessor.
+
+        Args:
+            config (ConfigManager): Configuration manager instance.
+        """
+        self.config = config
+        # Used for its output paths and output backend only; nothing is fetched.
+        self.scraper = Scraper(config)
+        self.metrics = MetricsRecorder.from_config(config)
+        self.markdown_store: Optional[ShardStore] = None
+        self.counts: Dict[str, int] = {}
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Set up logging for the reprocessor."""
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                            filename='logs/reprocessor.log')
+        self.logger = logging.getLogger(__name__)
+
+    def create_executor(self, to_markdown: bool) -> Tuple[Executor, int, Callable[[str], Tuple[str, Optional[str]]]]:
+        """
+        Create the executor the pages are cleaned on, following ``conversion_executor``.
+
+        Returns:
+            Tuple[Executor, int, Callable[[str], Tuple[str, Optional[str]]]]: The
+            executor, its number of workers and the function turning a blob path
+            into cleaned text and markdown on it.
+        """
+        if self.config.get('conversion_executor', 'thread') == 'process':
+            workers = int(self.config.get('conversion_processes') or os.cpu_count() or 1)
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                           initializer=init_reprocess_worker, initargs=(self.config, to_markdown))
+            return executor, workers, reprocess_in_worker
+
+        workers = max(1, int(self.config.get('max_workers', 4)))
+        clean = get_html_backend(self.config.get('html_backend', 'stream'))
+        postprocessor = Postprocessor(self.config) if to_markdown else None
+        return ThreadPoolExecutor(max_workers=workers), workers, lambda path: extract_text(clean, postprocessor, path)
+
+    def write_output(self, entry: HtmlEntry, text: str, markdown: Optional[str]) -> None:
+        """Write the text of a URL where the scraper would or, when converted, its markdown to the markdown output."""
+        if self.scraper.shard_store is not None:
+            if markdown is None:
+                self.scraper.shard_store.add(entry.url, text, entry.key, entry.fetched_at)
+            else:
+                self.markdown_store.add(entry.url, markdown, entry.key, entry.fetched_at, ShardStore.content_hash(text))
+            return
+        file_path = self.scraper.output_path(entry.url)
+        if markdown is not None:
+            file_path = os.path.splitext(file_path)[0] + ".md"
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(text if markdown is None else markdown)
+
+    def run(self, to_markdown: bool = False, progress: Optional[Callable] = None) -> Dict[str, int]:
+        """
+        Rewrite the output of every URL in the HTML store.
+
+        Args:
+            to_markdown (bool): Also convert the cleaned text to markdown.
+            progress (Optional[Callable]): Progress callback receiving a fraction and a description.
+
+        Returns:
+            Dict[str, int]: The figures of the run.
+        """
+        store = HtmlStore(self.config.get('raw_html_dir', os.path.join('data', 'cache', 'html')))
+        total = len(store)
+        self.counts = {'urls': total, 'pages': store.blob_count(), 'written': 0, 'failed': 0}
+        self.metrics.reset()
+        self.logger.info(f"Reprocessing {total} URLs with {self.counts['pages']} distinct pages from {store.directory}")
+        executor, workers, extract = self.create_executor(to_markdown)
+        window_size = workers * max(int(self.config.get('conversion_batch_size', 8)), 1) * 4
+        finished = 0
+
+        def process_window(groups: List[Tuple[str, List[HtmlEntry]]]) -> None:
+            nonlocal finished
+            futures = [(entries, executor.submit(extract, store.blob_path(content_hash)))
+                       for content_hash, entries in groups]
+            for entries, future in futures:
+                try:
+                    text, markdown = future.result()
+                    error = "JavaScript check page" if JS_CHECK_MARKER in text else None
+                except Exception as e:
+                    text, markdown, error = None, None, str(e)
+                for entry in entries:
+                    if error is None:
+                        try:
+                            self.write_output(entry, text, markdown)
+                        except OSError as e:
+                            error = str(e)
+                    if error is None:
+                        self.counts['written'] += 1
+                        self.metrics.count('reprocess', 'ok')
+                    else:
+                        self.counts['failed'] += 1
+                        self.metrics.count('reprocess', 'error')
+                        self.logger.error(f"Error reprocessing {entry.url}: {error}")
+                    finished += 1
+                if progress:
+                    progress(finished / max(total, 1), desc=f"Reprocessed {finished}/{total} URLs")
+
+        self.scraper.open_output()
+        if to_markdown and self.scraper.shard_store is not None:
+            self.markdown_store = ShardStore(
+                os.path.join(self.scraper.shard_store.directory, MARKDOWN_SHARD_DIR),
+                max_shard_bytes=self.scraper.shard_store.max_shard_bytes)
+        try:
+            groups: List[Tuple[str, List[HtmlEntry]]] = []
+            for entry in store.entries():
+                if groups and groups[-1][0] == entry.content_hash:
+                    groups[-1][1].append(entry)
+                    continue
+                if len(groups) >= window_size:
+                    process_window(groups)
+                    groups = []
+                groups.append((entry.content_hash, [entry]))
+            process_window(groups)
+        finally:
+            executor.shutdown()
+            self.scraper.close_output()
+            if self.markdown_store is not None:
+                self.markdown_store.close()
+                self.markdown_store = None
+            store.close()
+
+        self.logger.info(f"Reprocessed {total} URLs: {self.counts['written']} written, {self.counts['failed']} failed")
+        self.metrics.log_summary(self.logger)
+        self.metrics.export('reprocess')
+        return self.counts
+
+    def run_summary(self) -> Dict[str, int]:
+        """Return the figures of the last run, as printed by the CLI."""
+        return {
+            "URLs": self.counts.get('urls', 0),
+            "Distinct Pages": self.counts.get('pages', 0),
+            "Written": self.counts.get('written', 0),
+            "Failed": self.counts.get('failed', 0),
+        }
+
+
+def extract_text(clean: Callable[[str], str], postprocessor: Optional[Postprocessor],
+                 blob_path: str) -> Tuple[str, Optional[str]]:
+    """Clean a stored page and, given a Postprocessor, convert its text to markdown; returns both."""
+    text = clean(HtmlStore.read_blob(blob_path))
+    if postprocessor is None or JS_CHECK_MARKER in text:
+        return text, None
+    return text, postprocessor.document_to_markdown(text, lambda current, total: None)
+
+
+# Cleaning backend and Postprocessor of the current worker process, set up by the pool initializer.
+_worker_clean: Optional[Callable[[str], str]] = None
+_worker_postprocessor: Optional[Postprocessor] = None
+
+
+def init_reprocess_worker(config: ConfigManager, to_markdown: bool) -> None:
+    """Set up a reprocessing worker process."""
+    global _worker_clean, _worker_postprocessor
+    _worker_clean = get_html_backend(config.get('html_backend', 'stream'))
+    _worker_postprocessor = Postprocessor(config) if to_markdown else None
+
+
+def reprocess_in_worker(blob_path: str) -> Tuple[str, Optional[str]]:
+    """Clean a stored page in a worker process set up by ``init_reprocess_worker``."""
+    return extract_text(_worker_clean, _worker_postprocessor, blob_path)
\ No newline at end of file
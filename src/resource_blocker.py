@@ -0,0 +1,140 @@
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext, Route
+
+# Resource types aborted by each interception profile.
+BLOCKING_PROFILES: Dict[str, FrozenSet[str]] = {
+    'full': frozenset(),
+    'text-only': frozenset({'image', 'media', 'font', 'stylesheet', 'texttrack', 'manifest'}),
+    'links-only': frozenset({'image', 'media', 'font', 'stylesheet', 'texttrack', 'manifest',
+                             'websocket', 'eventsource'}),
+}
+
+# Profiles that also abort requests to known ad and analytics hosts.
+TRACKER_BLOCKING_PROFILES = frozenset({'text-only', 'links-only'})
+
+# Profiles that also abort documents loaded into iframes, whose content is never read.
+SUBFRAME_BLOCKING_PROFILES = frozenset({'links-only'})
+
+TRACKER_HOSTS = frozenset({
+    'google-analytics.com', 'googletagmanager.com', 'googletagservices.com', 'doubleclick.net',
+    'googlesyndication.com', 'googleadservices.com', 'adservice.google.com', 'connect.facebook.net',
+    'facebook.net', 'hotjar.com', 'segment.io', 'segment.com', 'mixpanel.com', 'scorecardresearch.com',
+    'quantserve.com', 'adnxs.com', 'criteo.com', 'criteo.net', 'taboola.com', 'outbrain.com',
+    'amazon-adsystem.com', 'nr-data.net', 'optimizely.com', 'clarity.ms', 'bat.bing.com',
+    'ads-twitter.com', 'analytics.tiktok.com', 'hs-analytics.net', 'chartbeat.com', 'moatads.com',
+})
+
+# Typical transfer sizes used to estimate the bandwidth saved by an aborted request.
+ESTIMATED_BYTES = {
+    'image': 60_000,
+    'media': 500_000,
+    'font': 40_000,
+    'stylesheet': 30_000,
+    'script': 50_000,
+    'document': 100_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+
+class ResourceBlocker:
+    """Aborts requests a browser context does not need and counts what was saved."""
+
+    def __init__(self, profile: str = 'full', extra_hosts: Optional[Iterable[str]] = None,
+                 other_profiles: Iterable[str] = ()):
+        """
+        Initialize the ResourceBlocker.
+
+        Args:
+            profile (str): One of the keys of ``BLOCKING_PROFILES``.
+            extra_hosts (Optional[Iterable[str]]): Additional hosts to block on top of ``TRACKER_HOSTS``.
+            other_profiles (Iterable[str]): Profiles that ``set_profile`` may switch single contexts to.
+
+        Raises:
+            ValueError: If a profile is unknown.
+        """
+        for name in (profile, *other_profiles):
+            if name not in BLOCKING_PROFILES:
+                raise ValueError(f"Unknown blocking profile '{name}', expected one of {sorted(BLOCKING_PROFILES)}")
+        self.profile = profile
+        self.extra_hosts = frozenset(host.lower() for host in extra_hosts or ())
+        self.blocked_types, self.blocked_hosts, self.block_subframes = self.rules(profile)
+        self.other_profiles = frozenset(other_profiles) - {profile}
+        self._context_profiles: Dict[BrowserContext, str] = {}
+        self.reset()
+
+    def rules(self, profile: str) -> Tuple[FrozenSet[str], FrozenSet[str], bool]:
+        """Return the blocked resource types, the blocked hosts and whether subframes are blocked under a profile."""
+        blocked_hosts = self.extra_hosts | TRACKER_HOSTS if profile in TRACKER_BLOCKING_PROFILES else self.extra_hosts
+        return BLOCKING_PROFILES[profile], blocked_hosts, profile in SUBFRAME_BLOCKING_PROFILES
+
+    def set_profile(self, context: BrowserContext, profile: str) -> None:
+        """Switch a context attached with ``attach`` to another of the profiles given at creation, or back."""
+        if profile == self.profile:
+            self._context_profiles.pop(context, None)
+        elif profile in self.other_profiles:
+            self._context_profiles[context] = profile
+
+    def detach(self, context: BrowserContext) -> None:
+        """Forget the profile of a context that is being closed."""
+        self._context_profiles.pop(context, None)
+
+    def reset(self) -> None:
+        """Reset the per-run counters."""
+        self.allowed_requests = 0
+        self.blocked_by_type: Counter = Counter()
+        self.estimated_bytes_saved = 0
+
+    @property
+    def blocked_requests(self) -> int:
+        """Total number of aborted requests."""
+        return sum(self.blocked_by_type.values())
+
+    async def attach(self, context: BrowserContext) -> None:
+        """
+        Install the interception handler on a browser context.
+
+        Args:
+            context (BrowserContext): The context whose requests should be filtered.
+        """
+        if self.blocked_types or self.blocked_hosts or self.block_subframes or self.other_profiles:
+            await context.route('**/*', lambda route: self.handle_route(route, context))
+
+    def is_tracker_host(self, host: str, blocked_hosts: Optional[FrozenSet[str]] = None) -> bool:
+        """Check whether a host or any of its parent domains is blocked."""
+        blocked_hosts = self.blocked_hosts if blocked_hosts is None else blocked_hosts
+        host = host.lower().split(':', 1)[0]
+        while host:
+            if host in blocked_hosts:
+                return True
+            host = host.partition('.')[2]
+        return False
+
+    async def handle_route(self, route: Route, context: Optional[BrowserContext] = None) -> None:
+        """Abort or continue a single intercepted request, following the profile of its context."""
+        request = route.request
+        resource_type = request.resource_type
+        profile = self._context_profiles.get(context)
+        blocked_types, blocked_hosts, block_subframes = (
+            (self.blocked_types, self.blocked_hosts, self.block_subframes) if profile is None else self.rules(profile))
+        blocked = resource_type in blocked_types
+        if not blocked and blocked_hosts:
+            blocked = self.is_tracker_host(urlparse(request.url).netloc, blocked_hosts)
+        if not blocked and block_subframes and resource_type == 'document':
+            blocked = request.frame.parent_frame is not None
+
+        if blocked:
+            self.blocked_by_type[resource_type] += 1
+            self.estimated_bytes_saved += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+            await route.abort('blockedbyclient')
+        else:
+            self.allowed_requests += 1
+            await route.continue_()
+
+    def summary(self) -> str:
+        """Return a one-line description of the counters."""
+        by_type = ', '.join(f"{kind}: {count}" for kind, count in self.blocked_by_type.most_common())
+        return (f"Blocking profile '{self.profile}': blocked {self.blocked_requests} requests"
+                f"{f' ({by_type})' if by_type else ''}, allowed {self.allowed_requests}, "
+                f"~{self.estimated_bytes_saved / 1_000_000:.1f} MB saved")
\ No newline at end of file
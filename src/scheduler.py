@@ -0,0 +1,176 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class HostScheduler:
+    """Hands out URLs so that every host sees polite traffic while different hosts are fetched in parallel."""
+
+    def __init__(self, urls: List[str], delay_min: float = 1.0, delay_max: float = 3.0,
+                 max_per_host: int = 1, max_concurrency: int = 4, streaming: bool = False,
+                 max_pending: Optional[int] = None,
+                 host_limits: Optional[Callable[[str], Tuple[int, float, float]]] = None):
+        """
+        Initialize the HostScheduler.
+
+        Args:
+            urls (List[str]): The URLs to schedule, in their original order.
+            delay_min (float): Lower bound of the pause between two requests to the same host, in seconds.
+            delay_max (float): Upper bound of the pause between two requests to the same host, in seconds.
+            max_per_host (int): Maximum number of simultaneous requests to a single host.
+            max_concurrency (int): Maximum number of simultaneous requests overall.
+            streaming (bool): Whether more URLs are passed to ``add`` until ``close`` is called.
+            max_pending (Optional[int]): Number of waiting URLs at which ``add`` blocks until one is handed out.
+            host_limits (Optional[Callable[[str], Tuple[int, float, float]]]): Returns the
+                ``max_per_host``, ``delay_min`` and ``delay_max`` of a host, overriding the defaults above.
+        """
+        self.delay_min = delay_min
+        self.delay_max = max(delay_min, delay_max)
+        self.max_per_host = max(1, max_per_host)
+        self.max_concurrency = max(1, max_concurrency)
+        self._host_limits = host_limits
+        self._limits: Dict[str, Tuple[int, float, float]] = {}
+
+        self._pending: Dict[str, Deque[Tuple[int, str]]] = {}
+        for index, url in enumerate(urls):
+            self._pending.setdefault(self.host_key(url), deque()).append((index, url))
+        self._hosts: Deque[str] = deque(self._pending)
+        self._active: Dict[str, int] = {host: 0 for host in self._pending}
+        self._next_allowed: Dict[str, float] = {}
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._added = len(urls)
+        self._pending_count = len(urls)
+        self._max_pending = max_pending
+        self._closed = not streaming
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Return the key that politeness limits are applied to."""
+        return urlparse(url).netloc.lower()
+
+    def limits(self, host: str) -> Tuple[int, float, float]:
+        """Return the maximum simultaneous requests and the pause bounds of a host."""
+        if self._host_limits is None:
+            return self.max_per_host, self.delay_min, self.delay_max
+        if host not in self._limits:
+            max_per_host, delay_min, delay_max = self._host_limits(host)
+            self._limits[host] = (max(1, max_per_host), delay_min, max(delay_min, delay_max))
+        return self._limits[host]
+
+    @property
+    def host_count(self) -> int:
+        """Number of distinct hosts that were scheduled."""
+        return len(self._active)
+
+    @property
+    def added_count(self) -> int:
+        """Number of URLs scheduled so far."""
+        return self._added
+
+    async def acquire(self) -> Optional[Tuple[int, str]]:
+        """
+        Wait for the next URL whose host may be contacted.
+
+        Hosts are visited round-robin, so URLs from different hosts are
+        interleaved regardless of their order in the input list.
+
+        Returns:
+            Optional[Tuple[int, str]]: The URL and its index in the input list,
+            or None once every URL has been handed out and no more can be added.
+        """
+        async with self._condition:
+            while True:
+                if not self._hosts and self._closed:
+                    return None
+
+                timeout = None
+                if self._in_flight < self.max_concurrency:
+                    now = time.monotonic()
+                    for _ in range(len(self._hosts)):
+                        host = self._hosts[0]
+                        self._hosts.rotate(-1)
+                        if self._active[host] >= self.limits(host)[0]:
+                            continue
+                        ready_at = self._next_allowed.get(host, 0.0)
+                        if ready_at > now:
+                            timeout = ready_at - now if timeout is None else min(timeout, ready_at - now)
+                            continue
+
+                        item = self._pending[host].popleft()
+                        if not self._pending[host]:
+                            # The host was just rotated to the back of the deque.
+                            self._hosts.pop()
+                            del self._pending[host]
+                        self._active[host] += 1
+                        self._in_flight += 1
+                        self._pending_count -= 1
+                        # Wake up producers waiting in add() for room.
+                        self._condition.notify_all()
+                        return item
+
+                try:
+                    await asyncio.wait_for(self._condition.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self, url: str, delay: bool = True) -> None:
+        """
+        Mark a URL handed out by ``acquire`` as finished.
+
+        The host is then held back for a random pause between its
+        ``delay_min`` and ``delay_max`` before its next URL is handed out.
+
+        Args:
+            url (str): The finished URL.
+            delay (bool): Whether the host was contacted; without a request there is no pause.
+        """
+        host = self.host_key(url)
+        async with self._condition:
+            self._active[host] -= 1
+            self._in_flight -= 1
+            if delay:
+                _, delay_min, delay_max = self.limits(host)
+                self._next_allowed[host] = time.monotonic() + random.uniform(delay_min, delay_max)
+            self._condition.notify_all()
+
+    async def add(self, url: str) -> Optional[int]:
+        """
+        Schedule one more URL on a streaming scheduler.
+
+        Blocks while ``max_pending`` URLs are waiting, which passes backpressure
+        on to whatever produces the URLs.
+
+        Args:
+            url (str): The URL to schedule.
+
+        Returns:
+            Optional[int]: The index ``acquire`` will report for the URL, or
+            None if the scheduler was closed and the URL was dropped.
+        """
+        async with self._condition:
+            while not self._closed and self._max_pending and self._pending_count >= self._max_pending:
+                await self._condition.wait()
+            if self._closed:
+                return None
+
+            host = self.host_key(url)
+            if host not in self._pending:
+                self._pending[host] = deque()
+                self._hosts.append(host)
+                self._active.setdefault(host, 0)
+            index = self._added
+            self._pending[host].append((index, url))
+            self._added += 1
+            self._pending_count += 1
+            self._condition.notify_all()
+            return index
+
+    async def close(self) -> None:
+        """Signal that no more URLs will be added, so that ``acquire`` ends once the queue is drained."""
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
\ No newline at end of file
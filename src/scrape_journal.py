@@ -0,0 +1,118 @@
+import hashlib
+import os
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, TextIO
+
+
+class JournalState(NamedTuple):
+    """What the journal says about a URL."""
+    succeeded: bool
+    failures: int
+
+
+class ScrapeJournal:
+    """
+    Append-only record of the outcome of every URL of a scraping run, used to resume it after a crash.
+
+    Each finished URL adds an ``ok`` or ``failed`` line, and a URL passed
+    over because its host's circuit was open adds a ``skipped`` line, which
+    does not count as an attempt. Lines are flushed
+    and fsynced in batches of ``fsync_every`` records or every
+    ``fsync_interval`` seconds, whichever comes first, so a crash loses at
+    most one batch of outcomes, whose URLs are scraped again. A partly
+    written last line is ignored when the journal is read.
+    """
+
+    def __init__(self, path: str, fsync_every: int = 50, fsync_interval: float = 1.0):
+        """
+        Initialize the ScrapeJournal; nothing is read or written until ``load`` or ``open``.
+
+        Args:
+            path (str): Path of the journal file.
+            fsync_every (int): Number of records written between fsyncs.
+            fsync_interval (float): Maximum time between fsyncs, in seconds.
+        """
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file: Optional[TextIO] = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @staticmethod
+    def path_for(directory: str, urls: Iterable[str]) -> str:
+        """Return the journal path of a URL list, which is the same every time the same list is scraped."""
+        digest = hashlib.sha1('\n'.join(urls).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(directory, f"{digest}.journal")
+
+    def load(self) -> Dict[str, JournalState]:
+        """
+        Read the outcomes recorded so far.
+
+        Returns:
+            Dict[str, JournalState]: For every URL in the journal, whether it
+            succeeded and how many times it failed.
+        """
+        states: Dict[str, JournalState] = {}
+        if not os.path.exists(self.path):
+            return states
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                status, _, url = line.rstrip('\n').partition('\t')
+                succeeded, failures = states.get(url, (False, 0))
+                if status == 'ok':
+                    states[url] = JournalState(True, failures)
+                elif status == 'failed':
+                    states[url] = JournalState(succeeded, failures + 1)
+        return states
+
+    def open(self, resume: bool = True) -> None:
+        """Open the journal for appending; without ``resume`` the outcomes of earlier runs are discarded."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        self._last_sync = time.monotonic()
+
+    def record(self, url: str, succeeded: bool) -> None:
+        """Append the outcome of a URL, syncing the journal to disk when a batch is complete."""
+        self._file.write(f"{'ok' if succeeded else 'failed'}\t{url}\n")
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def skip(self, url: str, retry_after: float = 0.0) -> None:
+        """
+        Record that a URL was passed over without being fetched; it is scraped again when the run is resumed.
+
+        Args:
+            url (str): The URL.
+            retry_after (float): Seconds before the URL is worth trying again; a
+                resumed run retries it regardless, so this is not stored.
+        """
+        self._file.write(f"skipped\t{url}\n")
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self, remove: bool = False) -> None:
+        """
+        Sync and close the journal.
+
+        Args:
+            remove (bool): Delete the journal, once the run it belongs to has finished.
+        """
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
\ No newline at end of file
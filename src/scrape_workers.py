@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+from src.config_manager import ConfigManager
+from src.scraper import Scraper
+from src.work_queue import LeaseRecorder, WorkQueue
+
+
+class ScrapeWorkerPool:
+    """
+    Scrapes a URL list with ``scrape_processes`` worker processes, each with its own browser and event loop.
+
+    The URLs go into a WorkQueue in ``queue_dir``, named after the URL list,
+    which the spawned workers claim leases from. This process only watches
+    the queue, reports merged progress, and merges the workers' figures when
+    they are done. The queue survives an interrupted run, so scraping the
+    same list again resumes it; it is removed once every URL has succeeded.
+    """
+
+    def __init__(self, config: ConfigManager):
+        """
+        Initialize the ScrapeWorkerPool.
+
+        Args:
+            config (ConfigManager): Configuration manager instance.
+        """
+        self.config = config
+        self.processes = max(1, int(self.config.get('scrape_processes', 1)))
+        self.stats: Counter = Counter()
+        self.setup_logging()
+
+    def setup_logging(self):
+        """Set up logging for the worker pool."""
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                            filename='logs/scraper.log')
+        self.logger = logging.getLogger(__name__)
+
+    def queue_path(self, urls: List[str]) -> str:
+        digest = hashlib.sha1('\n'.join(urls).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.config.get('queue_dir', os.path.join('data', 'queue')), f"{digest}.sqlite3")
+
+    def open_queue(self, path: str) -> WorkQueue:
+        return WorkQueue(path, lease_seconds=float(self.config.get('queue_lease_seconds', 300)),
+                         max_attempts=int(self.config.get('resume_max_attempts', 3)))
+
+    def run(self, urls: List[str], progress: Optional[Callable] = None, resume: bool = True) -> Tuple[int, int]:
+        """
+        Scrape URLs across the worker processes and wait for them to finish.
+
+        Args:
+            urls (List[str]): The URLs to scrape.
+            progress (Optional[Callable]): Progress callback receiving a fraction and a description.
+            resume (bool): Continue the queue of an earlier run of the same list instead of starting over.
+
+        Returns:
+            Tuple[int, int]: The number of successful and failed URLs.
+        """
+        path = self.queue_path(urls)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not resume:
+            remove_queue(path)
+        queue = self.open_queue(path)
+        try:
+            queue.add(urls, self.processes)
+            queue.reset_workers(range(self.processes))
+            self.logger.info(f"Scraping {len(urls)} URLs with {self.processes} worker processes, queue {path}")
+
+            context = multiprocessing.get_context('spawn')
+            workers = [context.Process(target=run_queue_worker, args=(self.config, path, worker_id),
+                                       name=f"scrape-worker-{worker_id}")
+                       for worker_id in range(self.processes)]
+            for worker in workers:
+                worker.start()
+            try:
+                while any(worker.is_alive() for worker in workers):
+                    for worker in workers:
+                        worker.join(timeout=0.5 / len(workers))
+                    self.report_progress(queue, len(urls), progress)
+            finally:
+                for worker in workers:
+                    if worker.is_alive():
+                        worker.terminate()
+                    worker.join()
+            failed_workers = [worker.name for worker in workers if worker.exitcode]
+            if failed_workers:
+                self.logger.warning(f"Worker processes exited abnormally: {', '.join(failed_workers)}")
+
+            counts = queue.counts()
+            self.stats = Counter()
+            for stats in queue.worker_stats():
+                self.stats.update(stats)
+        finally:
+            queue.close()
+
+        self.logger.info(f"Worker pool finished: {counts['done']} scraped, {counts['failed']} failed, "
+                         f"{counts['pending'] + counts['leased']} left over")
+        if counts['done'] == len(urls):
+            remove_queue(path)
+        return counts['done'], len(urls) - counts['done']
+
+    @staticmethod
+    def report_progress(queue: WorkQueue, total: int, progress: Optional[Callable]) -> None:
+        if progress:
+            counts = queue.counts()
+            finished = counts['done'] + counts['failed']
+            progress(finished / max(total, 1),
+                     desc=f"Scraped {finished}/{total} URLs, {counts['leased']} in progress, {counts['failed']} failed")
+
+
+def remove_queue(path: str) -> None:
+    """Delete a queue database together with its WAL files."""
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+async def drain_queue(scraper: Scraper, queue: WorkQueue, worker_id: int) -> None:
+    """
+    Scrape URLs leased from a queue until no URL is pending or leased anywhere.
+
+    Leased URLs are fed into a streaming HostScheduler, which holds at most
+    two URLs per page so that leases do not expire while URLs wait.
+    """
+    pool_size = max(1, int(scraper.config.get('max_workers', 4)))
+    claim_size = max(1, int(scraper.config.get('queue_claim_size', pool_size)))
+    poll_interval = float(scraper.config.get('queue_poll_interval', 1.0))
+    scheduler = scraper.new_scheduler([], pool_size, streaming=True, max_pending=pool_size * 2)
+    recorder = LeaseRecorder(queue)
+    results: Dict[int, bool] = {}
+
+    async def feed() -> None:
+        try:
+            while True:
+                leased = queue.claim(worker_id, claim_size)
+                if not leased:
+                    if not queue.unfinished():
+                        return
+                    # Other workers are still busy; their leases may expire or their shards be orphaned.
+                    await asyncio.sleep(poll_interval)
+                    continue
+                for url_id, url in leased:
+                    recorder.lease(url_id, url)
+                    if await scheduler.add(url) is None:
+                        return
+        finally:
+            await scheduler.close()
+
+    async def keep_alive() -> None:
+        while True:
+            await asyncio.sleep(max(queue.lease_seconds / 3, 1))
+            queue.heartbeat(worker_id)
+
+    feeder = asyncio.create_task(feed())
+    heartbeat = asyncio.create_task(keep_alive())
+    scraper.journal = recorder
+    try:
+        await scraper.scrape_scheduled(scheduler, results, lambda: None, pool_size)
+        await feeder
+    finally:
+        scraper.journal = None
+        feeder.cancel()
+        heartbeat.cancel()
+
+
+def run_queue_worker(config: ConfigManager, queue_path: str, worker_id: int) -> None:
+    """Entry point of a worker process: scrape from the queue with a Scraper of its own and store its figures."""
+    os.makedirs('logs', exist_ok=True)
+    scraper = Scraper(config)
+    scraper.worker_process = worker_id
+    queue = WorkQueue(queue_path, lease_seconds=float(config.get('queue_lease_seconds', 300)),
+                      max_attempts=int(config.get('resume_max_attempts', 3)))
+    try:
+        asyncio.run(drain_queue(scraper, queue, worker_id))
+        scraper.metrics.export(f"scraper-worker-{worker_id}")
+        queue.save_stats(worker_id, scraper.worker_stats())
+    finally:
+        queue.close()
\ No newline at end of file
@@ -1,17 +1,34 @@
 import asyncio
 import aiofiles
 import os
-import random
 import hashlib
 import logging
 import re
+import time
+from collections import Counter
+from concurrent.futures import Executor
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Page
-import pandas as pd
-import gradio as gr
-from typing import List, Tuple
+import httpx
+from playwright.async_api import async_playwright, Browser, Page
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, MutableMapping, Optional, Tuple
 from src.config_manager import ConfigManager
+from src.fetch_cache import CacheEntry, FetchCache
+from src.fetch_policy import MISSING_PAGE_STATUSES, FetchError, FetchPolicy, classify_error, status_error_kind
+from src.html_cleaner import get_html_backend
+from src.html_store import HtmlStore
+from src.http_fetcher import HttpFetcher, JS_CHECK_MARKER
+from src.metrics import MetricsRecorder
+from src.resource_blocker import ResourceBlocker
+from src.page_settle import MUTATION_OBSERVER_SCRIPT, PageSettleTracker
+from src.scheduler import HostScheduler
+from src.scrape_journal import ScrapeJournal
+from src.settings import DEFAULT_USER_AGENT
+from src.shard_store import ShardStore
+from src.url_utils import UrlDedupIndex
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class Scraper:
     """Handles web scraping operations."""
@@ -24,6 +41,30 @@ class Scraper:
             config (ConfigManager): Configuration manager instance.
         """
         self.config = config
+        self._settle_trackers: Dict[Page, PageSettleTracker] = {}
+        self._navigation_headers: Dict[Page, Dict[str, str]] = {}
+        self.fetch_cache: Optional[FetchCache] = None
+        self.shard_store: Optional[ShardStore] = None
+        self.html_store: Optional[HtmlStore] = None
+        self.journal: Optional[ScrapeJournal] = None
+        # Number of the ScrapeWorkerPool process this scraper runs in, if any. Such a scraper
+        # shares its stores with the other workers: it appends to shards of its own and
+        # commits every write.
+        self.worker_process: Optional[int] = None
+        self.cache_counts: Counter = Counter()
+        self.duplicate_urls = 0
+        self.http_fetcher: Optional[HttpFetcher] = None
+        self.host_fetch_modes: Dict[str, str] = {}
+        self.fetch_counts: Counter = Counter()
+        self.fetch_policy = FetchPolicy(config)
+        self.resource_blocker = ResourceBlocker(
+            self.config.get('blocking_profile', 'text-only'), self.config.get('blocked_hosts'),
+            [profile.blocking_profile for profile in self.config.get('domain_profiles', {}).values()
+             if profile.blocking_profile])
+        self._clean_html = get_html_backend(self.config.get('html_backend', 'stream'))
+        # When set, HTML is cleaned on this executor so that fetching continues meanwhile.
+        self.clean_executor: Optional[Executor] = None
+        self.metrics = MetricsRecorder.from_config(config)
         self.setup_logging()
 
     def setup_logging(self):
@@ -38,62 +79,149 @@ class Scraper:
         )
         self.logger = logging.getLogger(__name__)
 
-    async def setup_page(self, playwright):
-        """Set up a new browser page for scraping."""
-        browser = await playwright.chromium.launch(headless=True)
+    async def launch_browser(self, playwright) -> Browser:
+        """Launch the headless browser shared by all scraping pages."""
+        return await playwright.chromium.launch(headless=True)
+
+    async def new_page(self, browser: Browser) -> Page:
+        """Open a fresh browser context and page configured for scraping."""
         context = await browser.new_context(
-            user_agent=self.config.get('user_agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'),
+            user_agent=self.config.get('user_agent', DEFAULT_USER_AGENT),
             viewport={'width': 1920, 'height': 1080},
         )
+        await self.resource_blocker.attach(context)
         page = await context.new_page()
         await page.add_init_script("""
         Object.defineProperty(navigator, 'webdriver', {
             get: () => undefined
         });
         """)
+        if self.uses_wait_strategy('settle'):
+            await page.add_init_script(MUTATION_OBSERVER_SCRIPT)
+            self._settle_trackers[page] = PageSettleTracker(page, quiet_ms=int(self.config.get('settle_quiet_ms', 500)))
+        return page
+
+    def uses_wait_strategy(self, strategy: str) -> bool:
+        """Check whether the global wait strategy or any domain profile uses a strategy."""
+        return (self.config.get('wait_strategy', 'settle') == strategy
+                or any(profile.wait_strategy == strategy for profile in self.config.get('domain_profiles', {}).values()))
+
+    async def close_page(self, page: Page) -> None:
+        """Close a page together with its browser context, ignoring errors from crashed pages."""
+        self._settle_trackers.pop(page, None)
+        self.resource_blocker.detach(page.context)
+        self._navigation_headers.pop(page, None)
+        try:
+            await page.context.close()
+        except Exception as e:
+            self.logger.debug(f"Ignoring error while closing page: {str(e)}")
+
+    async def setup_page(self, playwright):
+        """Set up a new browser page for scraping."""
+        browser = await self.launch_browser(playwright)
+        page = await self.new_page(browser)
         return page, browser
 
     async def scroll_and_extract(self, page: Page, url: str) -> str:
-        """Scroll the page and extract its content."""
-        await page.goto(url, wait_until='networkidle')
-        
-        try:
-            await page.click("text='Accept'", timeout=5000)
-        except:
-            pass
+        """
+        Scroll the page and extract its content.
 
-        last_height = await page.evaluate('document.body.scrollHeight')
-        
-        for _ in range(self.config.get('MAX_SCROLLS', 5)):
-            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-            await page.wait_for_timeout(self.config.get('SCROLL_PAUSE_TIME', 2.0) * 1000)
-            new_height = await page.evaluate('document.body.scrollHeight')
-            if new_height == last_height:
-                break
-            last_height = new_height
+        With the default ``settle`` wait strategy the page is considered ready
+        as soon as its DOM and network go quiet, and scrolling stops once the
+        page height stops growing. The ``fixed`` strategy keeps the original
+        fixed pauses and is meant as a fallback for pages that never go quiet.
+        """
+        host = urlparse(url).netloc
+        self.resource_blocker.set_profile(page.context, self.config.get('blocking_profile', 'text-only', host=host))
+        tracker = self._settle_trackers.get(page)
+        if tracker is None or self.config.get('wait_strategy', 'settle', host=host) == 'fixed':
+            return await self._scroll_and_extract_fixed(page, url)
+
+        timeout_ms = float(self.config.get('settle_timeout', 10, host=host)) * 1000
+        tracker.reset()
+        with self.metrics.time('navigate', host):
+            response = await page.goto(url, wait_until='domcontentloaded',
+                                       timeout=self.fetch_policy.timeout('navigate', host) * 1000)
+        self._navigation_headers[page] = response.headers if response else {}
+        if response is not None:
+            self.fetch_policy.check_response(response.status, response.headers)
+
+        with self.metrics.time('settle', host):
+            await tracker.wait_until_settled(timeout_ms)
+            try:
+                accept_button = page.locator("text='Accept'")
+                if await accept_button.count():
+                    await accept_button.first.click(timeout=1000)
+                    await tracker.wait_until_settled(timeout_ms)
+            except Exception:
+                pass
+
+        async def scroll() -> None:
+            last_height = await page.evaluate('document.body.scrollHeight')
+
+            for _ in range(self.config.get('max_scrolls', 5, host=host)):
+                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+                await tracker.wait_until_settled(timeout_ms)
+                new_height = await page.evaluate('document.body.scrollHeight')
+                if new_height == last_height:
+                    break
+                last_height = new_height
+
+        with self.metrics.time('scroll', host):
+            await self.fetch_policy.stage('scroll', scroll(), host)
+
+        with self.metrics.time('content', host) as timer:
+            html_content = await self.fetch_policy.stage('content', page.content(), host)
+            timer.nbytes = len(html_content)
+        return html_content
+
+    async def _scroll_and_extract_fixed(self, page: Page, url: str) -> str:
+        """Scroll the page with fixed pauses and extract its content."""
+        host = urlparse(url).netloc
+        with self.metrics.time('navigate', host):
+            response = await page.goto(url, wait_until='networkidle',
+                                       timeout=self.fetch_policy.timeout('navigate', host) * 1000)
+        self._navigation_headers[page] = response.headers if response else {}
+        if response is not None:
+            self.fetch_policy.check_response(response.status, response.headers)
         
-        await page.wait_for_timeout(5000)
+        with self.metrics.time('settle', host):
+            try:
+                await page.click("text='Accept'", timeout=5000)
+            except:
+                pass
+
+        async def scroll() -> None:
+            last_height = await page.evaluate('document.body.scrollHeight')
+            
+            for _ in range(self.config.get('max_scrolls', 5, host=host)):
+                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+                await page.wait_for_timeout(self.config.get('scroll_pause_time', 2.0, host=host) * 1000)
+                new_height = await page.evaluate('document.body.scrollHeight')
+                if new_height == last_height:
+                    break
+                last_height = new_height
+            
+            await page.wait_for_timeout(5000)
+
+        with self.metrics.time('scroll', host):
+            await self.fetch_policy.stage('scroll', scroll(), host)
         
-        return await page.content()
+        with self.metrics.time('content', host) as timer:
+            html_content = await self.fetch_policy.stage('content', page.content(), host)
+            timer.nbytes = len(html_content)
+        return html_content
 
     def clean_html(self, html_content: str) -> str:
-        """Clean HTML content and extract main text."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        for element in soup(['nav', 'header', 'footer', 'aside', 'script', 'style']):
-            element.decompose()
-        
-        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
-        
-        if main_content:
-            text = main_content.get_text(separator='\n', strip=True)
-        else:
-            text = soup.body.get_text(separator='\n', strip=True) if soup.body else soup.get_text(separator='\n', strip=True)
-        
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        text = '\n'.join(lines)
-        
-        return text
+        """Clean HTML content and extract main text with the configured ``html_backend``."""
+        return self._clean_html(html_content)
+
+    async def clean_html_async(self, html_content: str, host: str = '') -> str:
+        """Clean HTML content on ``clean_executor`` if one is set, otherwise in the event loop."""
+        with self.metrics.time('clean_html', host, len(html_content)):
+            if self.clean_executor is None:
+                return self.clean_html(html_content)
+            return await asyncio.get_running_loop().run_in_executor(self.clean_executor, self._clean_html, html_content)
 
     def generate_filename(self, url: str) -> str:
         """Generate a filename from the given URL."""
@@ -103,13 +231,51 @@ class Scraper:
             filename += "_" + hashlib.md5(parsed_url.query.encode()).hexdigest()
         return filename
 
+    def output_key(self, url: str) -> str:
+        """Return the path of a URL's output file relative to the output directory, without extension."""
+        folder_name = urlparse(url).netloc.replace("www.", "")
+        return f"{folder_name}/{self.generate_filename(url)}"
+
+    def output_path(self, url: str) -> str:
+        """Return the path of the file a URL's text is saved to."""
+        return os.path.join("data", "output", *self.output_key(url).split("/")) + ".txt"
+
+    @property
+    def store_commit_every(self) -> int:
+        """Number of writes grouped into one transaction of the stores; 1 in worker processes sharing them."""
+        return 100 if self.worker_process is None else 1
+
+    def output_shard_dir(self) -> str:
+        """Return the directory of the shard store the output is appended to."""
+        return self.config.get('shard_dir', os.path.join('data', 'output', 'shards'))
+
+    def open_output(self) -> None:
+        """Open the shard store the text is appended to when ``output_format`` is ``shards``."""
+        if self.config.get('output_format', 'files') == 'shards':
+            prefix = 'shard' if self.worker_process is None else f"shard-w{self.worker_process}"
+            self.shard_store = ShardStore(self.output_shard_dir(),
+                                          max_shard_bytes=int(float(self.config.get('shard_max_mb', 256)) * 1024 * 1024),
+                                          prefix=prefix, commit_every=self.store_commit_every)
+
+    def close_output(self) -> None:
+        if self.shard_store is not None:
+            self.shard_store.close()
+            self.shard_store = None
+
+    def has_output(self, url: str) -> bool:
+        """Check whether the text of a URL was saved by an earlier run."""
+        if self.shard_store is not None:
+            return url in self.shard_store
+        return os.path.exists(self.output_path(url))
+
     async def save_text(self, url: str, text: str) -> None:
-        """Save the extracted text to a file."""
-        parsed_url = urlparse(url)
-        folder_name = parsed_url.netloc.replace("www.", "")
-        os.makedirs(os.path.join("data", "output", folder_name), exist_ok=True)
-        filename = self.generate_filename(url) + ".txt"
-        file_path = os.path.join("data", "output", folder_name, filename)
+        """Save the extracted text to a file, or append it to the shard store if one is open."""
+        if self.shard_store is not None:
+            entry = self.shard_store.add(url, text, self.output_key(url))
+            self.logger.info(f"Saved content for {url} to {entry.shard}")
+            return
+        file_path = self.output_path(url)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
         try:
             async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
                 await f.write(text)
@@ -117,58 +283,524 @@ class Scraper:
         except IOError as e:
             self.logger.error(f"Failed to save content for {url}: {str(e)}")
 
-    async def scrape_url(self, page: Page, url: str) -> bool:
-        """Scrape a single URL."""
+    async def save_text_timed(self, url: str, text: str) -> None:
+        """Save extracted text with ``save_text``, recording the time it took as the ``save_text`` stage."""
+        with self.metrics.time('save_text', urlparse(url).netloc, len(text)):
+            await self.save_text(url, text)
+
+    async def store_text(self, url: str, text: str, headers: Mapping[str, str], cached: Optional[CacheEntry]) -> None:
+        """
+        Save extracted text unless it is identical to what the last run saved, and update the fetch cache.
+
+        Args:
+            url (str): The scraped URL.
+            text (str): The cleaned text.
+            headers (Mapping[str, str]): Response headers carrying the page's validators.
+            cached (Optional[CacheEntry]): The fetch cache entry from the previous run, if any.
+        """
+        if self.fetch_cache is None:
+            await self.save_text_timed(url, text)
+            return
+
+        content_hash = FetchCache.content_hash(text)
+        if cached is not None and cached.content_hash == content_hash and self.has_output(url):
+            self.cache_counts['revalidated'] += 1
+            self.logger.info(f"Content of {url} is unchanged, keeping the existing file")
+        else:
+            self.cache_counts['misses'] += 1
+            await self.save_text_timed(url, text)
+        self.fetch_cache.put(url, headers.get('etag'), headers.get('last-modified'), content_hash)
+
+    async def store_html(self, url: str, html_content: str, fetched_via: str) -> None:
+        """
+        Keep the raw HTML of a page in the HTML store, if ``raw_html_cache`` is enabled.
+
+        The blob is compressed and written on a worker thread; pages with
+        identical content share one blob.
+        """
+        if self.html_store is None:
+            return
         try:
-            html_content = await self.scroll_and_extract(page, url)
-            if html_content:
-                cleaned_text = self.clean_html(html_content)
-                if "Please turn JavaScript on and reload the page." in cleaned_text:
-                    self.logger.warning(f"JavaScript check detected for {url}")
-                    return False
-                await self.save_text(url, cleaned_text)
-                self.logger.info(f"Successfully scraped and saved content for {url}")
-                random_delay = random.uniform(self.config.get('DELAY_MIN', 1), self.config.get('DELAY_MAX', 3))
-                self.logger.debug(f"Applying random delay of {random_delay:.2f} seconds for {url}")
-                await asyncio.sleep(random_delay)
-                return True
-            else:
-                self.logger.warning(f"No content retrieved for {url}")
-                return False
-        except Exception as e:
-            self.logger.error(f"Error scraping {url}: {str(e)}")
+            content_hash = await asyncio.get_running_loop().run_in_executor(None, self.html_store.write_blob, html_content)
+            self.html_store.put(url, self.output_key(url), content_hash, fetched_via)
+        except OSError as e:
+            self.logger.error(f"Failed to store the HTML of {url}: {str(e)}")
+
+    async def fetch_http(self, url: str, cached: Optional[CacheEntry]) -> Optional[httpx.Response]:
+        """
+        Fetch a URL with the pooled HTTP client when it can be useful.
+
+        The request is made when the page's host may be served over plain HTTP,
+        or when the fetch cache holds validators that let the server answer
+        304 Not Modified.
+
+        Args:
+            url (str): The URL to fetch.
+            cached (Optional[CacheEntry]): The fetch cache entry from the previous run, if any.
+
+        Returns:
+            Optional[httpx.Response]: The response, or None if no request was made or it failed.
+        """
+        if self.http_fetcher is None:
+            return None
+        # A 304 is only useful while the text saved by the previous run still exists.
+        has_validators = (cached is not None and (cached.etag or cached.last_modified)
+                          and self.has_output(url))
+        if not has_validators and not self._http_content_allowed(url):
+            return None
+        with self.metrics.time('http_fetch', urlparse(url).netloc) as timer:
+            try:
+                if has_validators:
+                    response = await self.http_fetcher.fetch(url, cached.etag, cached.last_modified)
+                else:
+                    response = await self.http_fetcher.fetch(url)
+            except httpx.HTTPError as e:
+                timer.outcome = type(e).__name__
+                self.logger.debug(f"HTTP fetch failed for {url}: {str(e)}")
+                return None
+            timer.outcome = f"{response.status_code // 100}xx"
+            timer.nbytes = len(response.content)
+            return response
+
+    def _http_content_allowed(self, url: str) -> bool:
+        """Check whether a page fetched over plain HTTP may be used instead of rendering it."""
+        host = urlparse(url).netloc
+        return (self.config.get('fetch_mode', 'auto', host=host) == 'auto'
+                and self.host_fetch_modes.get(host) != 'browser')
+
+    async def clean_http_response(self, url: str, response: Optional[httpx.Response]) -> Optional[str]:
+        """
+        Extract the text of a page fetched over plain HTTP, unless it needs the browser.
+
+        Hosts whose pages turned out to need JavaScript are remembered and not
+        probed again for the rest of the scraper's lifetime.
+
+        Args:
+            url (str): The fetched URL.
+            response (Optional[httpx.Response]): The HTTP response, if a request was made.
+
+        Returns:
+            Optional[str]: The cleaned text, or None if the page has to go through the browser.
+        """
+        if response is None or not self._http_content_allowed(url):
+            return None
+        html_content = self.http_fetcher.html_of(response)
+        if not html_content:
+            return None
+
+        host = urlparse(url).netloc
+        cleaned_text = await self.clean_html_async(html_content, host)
+        if self.http_fetcher.needs_javascript(html_content, cleaned_text):
+            if self.host_fetch_modes.get(host) != 'http':
+                self.host_fetch_modes[host] = 'browser'
+                self.logger.info(f"{host} needs JavaScript, using the browser for its remaining URLs")
+            return None
+
+        self.host_fetch_modes[host] = 'http'
+        await self.store_html(url, html_content, 'http')
+        return cleaned_text
+
+    async def scrape_url(self, page: Page, url: str) -> bool:
+        """
+        Scrape a single URL, over plain HTTP when possible and in the browser otherwise.
+
+        Failures are classified by the fetch policy; transient ones are
+        retried after a backoff, and failures that concern the host count
+        towards its circuit breaker. The whole URL, retries included, is
+        recorded as the ``url`` stage, with its outcome and the length of the
+        saved text.
+        """
+        host = urlparse(url).netloc
+        with self.metrics.time('url', host) as timer:
+            attempt = 0
+            while True:
+                try:
+                    succeeded = await self._scrape_url_once(page, url, timer)
+                    if succeeded:
+                        self.fetch_policy.record_success(host)
+                    return succeeded
+                except Exception as e:
+                    kind = classify_error(e)
+                    timer.outcome = kind
+                    self.fetch_policy.record_failure(host, kind)
+                    if not self.fetch_policy.should_retry(host, kind, attempt):
+                        self.logger.error(f"Error scraping {url} ({kind}): {str(e)}")
+                        return False
+                    delay = self.fetch_policy.backoff(attempt)
+                    self.fetch_policy.counts['retries'] += 1
+                    self.logger.warning(f"Error scraping {url} ({kind}): {str(e)}; retrying in {delay:.1f} s")
+                    await asyncio.sleep(delay)
+                    attempt += 1
+
+    async def _scrape_url_once(self, page: Page, url: str, timer) -> bool:
+        """Make one attempt at scraping a URL; raises on failures the fetch policy should see."""
+        host = urlparse(url).netloc
+        cached = self.fetch_cache.get(url) if self.fetch_cache is not None else None
+        response = await self.fetch_http(url, cached)
+        if response is not None and response.status_code == 304:
+            self.cache_counts['hits'] += 1
+            timer.outcome = 'not_modified'
+            self.logger.info(f"{url} is not modified since the last run")
+            return True
+        if response is not None and response.status_code in MISSING_PAGE_STATUSES:
+            # Rendering the page in the browser would not bring it back.
+            raise FetchError(status_error_kind(response.status_code), f"HTTP {response.status_code}")
+
+        cleaned_text = await self.clean_http_response(url, response)
+        if cleaned_text is not None:
+            await self.store_text(url, cleaned_text, response.headers, cached)
+            self.fetch_counts['http'] += 1
+            timer.outcome, timer.nbytes = 'http', len(cleaned_text)
+            self.logger.info(f"Successfully fetched over HTTP and saved content for {url}")
+            return True
+
+        html_content = await self.scroll_and_extract(page, url)
+        if not html_content:
+            timer.outcome = 'empty'
+            self.logger.warning(f"No content retrieved for {url}")
             return False
+        cleaned_text = await self.clean_html_async(html_content, host)
+        if JS_CHECK_MARKER in cleaned_text:
+            raise FetchError('bot_check', "JavaScript check page")
+        await self.store_html(url, html_content, 'browser')
+        await self.store_text(url, cleaned_text, self._navigation_headers.get(page, {}), cached)
+        self.fetch_counts['browser'] += 1
+        timer.outcome, timer.nbytes = 'browser', len(cleaned_text)
+        self.logger.info(f"Successfully scraped and saved content for {url}")
+        return True
+
+    async def scrape_urls(self, urls: List[str], progress: Optional[Callable] = None,
+                          resume: Optional[bool] = None) -> Tuple[int, int]:
+        """
+        Scrape multiple URLs concurrently.
+
+        A bounded pool of ``max_workers`` pages, each in its own browser context,
+        pulls URLs from a shared HostScheduler that interleaves hosts and keeps
+        a random ``delay_min``..``delay_max`` pause between requests to the same
+        host. A page that crashes is replaced and the URL it was working on is
+        retried once on the fresh page.
+
+        With ``scrape_journal`` enabled the outcome of every URL is appended to
+        a journal in ``journal_dir``, named after the URL list. When the same
+        list is scraped again with resume on, URLs that succeeded are skipped
+        and failed ones are retried until they have failed
+        ``resume_max_attempts`` times. The journal is removed once every URL
+        has succeeded.
+
+        Args:
+            urls (List[str]): The URLs to scrape.
+            progress (Optional[Callable]): Progress callback receiving a fraction and a description.
+            resume (Optional[bool]): Continue from the journal of an earlier run; defaults to ``resume_scrapes``.
+
+        Returns:
+            Tuple[int, int]: The number of successful and failed URLs.
+        """
+        journal = None
+        finished: Dict[str, bool] = {}
+        if self.config.get('scrape_journal', True):
+            journal = ScrapeJournal(ScrapeJournal.path_for(
+                self.config.get('journal_dir', os.path.join('data', 'journal')), urls))
+            resume = self.config.get('resume_scrapes', True) if resume is None else resume
+            if resume:
+                max_attempts = int(self.config.get('resume_max_attempts', 3))
+                for url, state in journal.load().items():
+                    if state.succeeded or state.failures >= max_attempts:
+                        finished[url] = state.succeeded
+                if finished:
+                    self.logger.info(f"Resuming from {journal.path}: {sum(finished.values())} URLs already scraped, "
+                                     f"{len(finished) - sum(finished.values())} given up after {max_attempts} attempts")
+            journal.open(resume)
+
+        pending = [url for url in urls if url not in finished]
+        results = [False] * len(pending)
+        completed = len(urls) - len(pending)
 
-    async def scrape_urls(self, urls: List[str], progress=gr.Progress()) -> Tuple[int, int]:
-        """Scrape multiple URLs."""
-        async with async_playwright() as playwright:
-            page, browser = await self.setup_page(playwright)
+        def on_done() -> None:
+            nonlocal completed
+            completed += 1
+            if progress:
+                progress(completed / len(urls), desc=f"Scraping URL {completed}/{len(urls)}")
+
+        if pending:
+            pool_size = max(1, min(int(self.config.get('max_workers', 4)), len(pending)))
+            scheduler = self.new_scheduler(pending, pool_size)
+            self.journal = journal
             try:
-                results = []
-                for i, url in enumerate(urls):
-                    result = await self.scrape_url(page, url)
-                    results.append(result)
-                    progress((i + 1) / len(urls), desc=f"Scraping URL {i + 1}/{len(urls)}")
+                await self.scrape_scheduled(scheduler, results, on_done, pool_size)
             finally:
-                await browser.close()
-        
-        successes = sum(results)
+                self.journal = None
+                if journal is not None:
+                    journal.close()
+        successes = sum(results) + sum(finished.values())
+        if journal is not None:
+            journal.close(remove=successes == len(urls))
+        self.metrics.log_summary(self.logger)
+        self.metrics.export('scraper')
+        if self.config.get('dedup_after_scrape', False):
+            await asyncio.get_running_loop().run_in_executor(None, self.dedup_output)
+
         failures = len(urls) - successes
         return successes, failures
 
+    def scrape(self, urls: List[str], progress: Optional[Callable] = None,
+               resume: Optional[bool] = None) -> Tuple[int, int]:
+        """
+        Scrape multiple URLs, in this process or across ``scrape_processes`` worker processes.
+
+        With more than one process the URLs are shared out through a
+        ScrapeWorkerPool, and the figures of its workers are merged into this
+        scraper so that ``run_summary`` covers the whole run.
+
+        Args:
+            urls (List[str]): The URLs to scrape.
+            progress (Optional[Callable]): Progress callback receiving a fraction and a description.
+            resume (Optional[bool]): Continue an interrupted run of the same list; defaults to ``resume_scrapes``.
+
+        Returns:
+            Tuple[int, int]: The number of successful and failed URLs.
+        """
+        if int(self.config.get('scrape_processes', 1)) <= 1:
+            return asyncio.run(self.scrape_urls(urls, progress, resume))
+
+        from src.scrape_workers import ScrapeWorkerPool
+        pool = ScrapeWorkerPool(self.config)
+        resume = self.config.get('resume_scrapes', True) if resume is None else resume
+        successes, failures = pool.run(urls, progress, resume)
+        self.load_worker_stats(pool.stats)
+        self.logger.info(self.resource_blocker.summary())
+        self.logger.info(self.fetch_policy.summary())
+        if self.config.get('dedup_after_scrape', False):
+            self.dedup_output()
+        return successes, failures
+
+    def worker_stats(self) -> Dict[str, int]:
+        """Return the figures of the last run as flat counts, for merging the runs of several worker processes."""
+        stats = {f"fetch_{kind}": count for kind, count in self.fetch_counts.items()}
+        stats.update({f"cache_{kind}": count for kind, count in self.cache_counts.items()})
+        stats.update({f"blocked_{kind}": count for kind, count in self.resource_blocker.blocked_by_type.items()})
+        stats.update({f"errors_{kind}": count for kind, count in self.fetch_policy.errors.items()})
+        stats.update({f"policy_{name}": count for name, count in self.fetch_policy.counts.items()})
+        stats['bytes_saved'] = self.resource_blocker.estimated_bytes_saved
+        return stats
+
+    def load_worker_stats(self, stats: Mapping[str, int]) -> None:
+        """Take over counts produced by ``worker_stats``, typically summed over several workers."""
+        self.fetch_counts = Counter()
+        self.cache_counts = Counter()
+        self.resource_blocker.reset()
+        self.fetch_policy.reset()
+        for name, count in stats.items():
+            group, _, kind = name.partition('_')
+            if group == 'fetch':
+                self.fetch_counts[kind] += count
+            elif group == 'cache':
+                self.cache_counts[kind] += count
+            elif group == 'blocked':
+                self.resource_blocker.blocked_by_type[kind] += count
+            elif group == 'errors':
+                self.fetch_policy.errors[kind] += count
+            elif group == 'policy':
+                self.fetch_policy.counts[kind] += count
+        self.resource_blocker.estimated_bytes_saved = stats.get('bytes_saved', 0)
+
+    def dedup_output(self) -> None:
+        """Strip boilerplate and find near duplicates in the scraped output."""
+        from src.dedup import Deduplicator
+        directory = (self.config.get('shard_dir', os.path.join('data', 'output', 'shards'))
+                     if self.config.get('output_format', 'files') == 'shards' else os.path.join('data', 'output'))
+        Deduplicator(self.config).run(directory)
+
+    def new_scheduler(self, urls: List[str], pool_size: int, streaming: bool = False,
+                      max_pending: Optional[int] = None) -> HostScheduler:
+        """Create a HostScheduler with the configured politeness limits."""
+        return HostScheduler(
+            urls,
+            delay_min=float(self.config.get('delay_min', 1)),
+            delay_max=float(self.config.get('delay_max', 3)),
+            max_per_host=int(self.config.get('max_per_host', 1)),
+            max_concurrency=int(self.config.get('max_concurrency', pool_size)),
+            streaming=streaming,
+            max_pending=max_pending,
+            host_limits=self.host_limits if self.config.get('domain_profiles') else None,
+        )
+
+    def host_limits(self, host: str) -> Tuple[int, float, float]:
+        """Return the politeness limits of a host: its maximum simultaneous requests and its pause bounds."""
+        return (int(self.config.get('max_per_host', 1, host=host)),
+                float(self.config.get('delay_min', 1, host=host)),
+                float(self.config.get('delay_max', 3, host=host)))
+
+    async def scrape_scheduled(self, scheduler: HostScheduler, results: MutableMapping[int, bool],
+                               on_done: Callable[[], None], pool_size: int) -> None:
+        """
+        Scrape every URL handed out by a scheduler with a pool of ``pool_size`` pages.
+
+        Opens the fetch cache, the HTTP client, the browser and, unless the
+        caller already opened it, the output for the run and closes them
+        afterwards. The outcome of each URL is stored in
+        ``results`` under the index the scheduler gave it.
+
+        Args:
+            scheduler (HostScheduler): The scheduler to drain; a streaming one is drained until it is closed.
+            results (MutableMapping[int, bool]): Receives whether each URL was scraped successfully.
+            on_done (Callable[[], None]): Called after each URL.
+            pool_size (int): Number of browser pages working in parallel.
+        """
+        self.resource_blocker.reset()
+        self.fetch_policy.reset()
+        self.fetch_counts = Counter()
+        self.cache_counts = Counter()
+        self.metrics.reset()
+        owns_output = self.shard_store is None
+        if owns_output:
+            self.open_output()
+        if self.config.get('raw_html_cache', False):
+            self.html_store = HtmlStore(self.config.get('raw_html_dir', os.path.join('data', 'cache', 'html')),
+                                        commit_every=self.store_commit_every)
+        if self.config.get('fetch_cache', True):
+            self.fetch_cache = FetchCache(self.config.get('fetch_cache_path', os.path.join('data', 'cache', 'fetch_cache.sqlite3')),
+                                          commit_every=self.store_commit_every)
+        if (self.fetch_cache is not None or self.config.get('fetch_mode', 'auto') == 'auto'
+                or any(profile.fetch_mode == 'auto' for profile in self.config.get('domain_profiles', {}).values())):
+            self.http_fetcher = HttpFetcher(
+                self.config.get('user_agent', DEFAULT_USER_AGENT),
+                max_connections=int(self.config.get('http_max_connections', 20)),
+                timeout=float(self.config.get('http_timeout', 15)),
+                min_text_length=int(self.config.get('http_min_text_length', 200)),
+            )
+            await self.http_fetcher.open()
+
+        try:
+            async with async_playwright() as playwright:
+                browser = await self.launch_browser(playwright)
+                try:
+                    self.logger.info(f"Scraping {scheduler.added_count} URLs from {scheduler.host_count} hosts with a pool of {pool_size} pages")
+                    await asyncio.gather(*(
+                        self._scrape_worker(worker_id, browser, scheduler, results, on_done)
+                        for worker_id in range(pool_size)
+                    ))
+                finally:
+                    await browser.close()
+        finally:
+            if self.http_fetcher is not None:
+                await self.http_fetcher.close()
+                self.http_fetcher = None
+            if self.fetch_cache is not None:
+                self.fetch_cache.close()
+                self.fetch_cache = None
+            if self.html_store is not None:
+                self.html_store.close()
+                self.html_store = None
+            if owns_output:
+                self.close_output()
+        self.logger.info(self.resource_blocker.summary())
+        self.logger.info(f"Fetched {self.fetch_counts['http']} pages over HTTP and {self.fetch_counts['browser']} in the browser")
+        self.logger.info(f"Fetch cache: {self.cache_counts['hits']} not modified, "
+                         f"{self.cache_counts['revalidated']} unchanged, {self.cache_counts['misses']} new or changed")
+        self.logger.info(self.fetch_policy.summary())
+
+    async def _scrape_worker(self, worker_id: int, browser: Browser, scheduler: HostScheduler,
+                             results: MutableMapping[int, bool], on_done: Callable[[], None]) -> None:
+        """Drain the shared scheduler with one page, replacing the page if it crashes."""
+        crashed = False
+
+        def mark_crashed(_page) -> None:
+            nonlocal crashed
+            crashed = True
+
+        async def open_page() -> Page:
+            nonlocal crashed
+            crashed = False
+            page = await self.new_page(browser)
+            page.on("crash", mark_crashed)
+            return page
+
+        page = await open_page()
+        try:
+            while True:
+                # The wait for a URL includes the politeness delay between requests to a host.
+                waited = time.perf_counter()
+                item = await scheduler.acquire()
+                if item is None:
+                    break
+                index, url = item
+                host = urlparse(url).netloc
+                self.metrics.observe('scheduler_wait', time.perf_counter() - waited, host, outcome=None)
+
+                skipped = not self.fetch_policy.allow(host)
+                if skipped:
+                    # The host's circuit is open: fail fast, without holding the host back.
+                    results[index] = False
+                    self.metrics.count('url', 'circuit_open', host)
+                    self.logger.warning(f"Skipping {url}: the circuit for {host} is open after repeated failures")
+                    await scheduler.release(url, delay=False)
+                else:
+                    try:
+                        for _ in range(2):
+                            if crashed or page.is_closed():
+                                self.logger.warning(f"Worker {worker_id}: page crashed, opening a new one")
+                                await self.close_page(page)
+                                page = await open_page()
+                            results[index] = await self.scrape_url(page, url)
+                            if results[index] or not (crashed or page.is_closed()):
+                                break
+                            self.logger.warning(f"Worker {worker_id}: page crashed while scraping {url}, retrying")
+                    finally:
+                        await scheduler.release(url)
+
+                if self.journal is not None and skipped:
+                    # Never fetched, so not an attempt: the URL is tried again later.
+                    self.journal.skip(url, self.fetch_policy.retry_after(host))
+                elif self.journal is not None:
+                    self.journal.record(url, results[index])
+                on_done()
+        finally:
+            await self.close_page(page)
+
     def read_urls_from_file(self, file_path: str) -> List[str]:
-        """Read URLs from a file."""
+        """
+        Read URLs from a file, canonicalized and without duplicates.
+
+        Lines that are not http(s) URLs are skipped. The number of duplicates
+        dropped is kept in ``duplicate_urls`` for the run summary.
+        """
+        index = UrlDedupIndex()
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                urls = [line.strip() for line in file if line.strip() and urlparse(line.strip()).scheme]
-            self.logger.info(f"Loaded {len(urls)} valid URLs from {file_path}")
+                urls = [url for url in (index.add(line) for line in file if line.strip()) if url]
+            self.duplicate_urls = index.duplicates
+            self.logger.info(f"Loaded {len(urls)} valid URLs from {file_path}, skipped {index.duplicates} duplicates "
+                             f"and {index.invalid} invalid lines")
             return urls
         except IOError as e:
             self.logger.error(f"Error reading URLs from file: {str(e)}")
             return []
 
-    def run_scraper(self, file_path, progress=gr.Progress()):
+    def run_summary(self, total_urls: int, successes: int, failures: int) -> Dict[str, float]:
+        """Return the figures of the last scraping run, as shown in the interface and printed by the CLI."""
+        return {
+            "Total URLs": total_urls,
+            "Duplicates Skipped": self.duplicate_urls,
+            "Successful": successes,
+            "Failed": failures,
+            "Fetched via HTTP": self.fetch_counts['http'],
+            "Fetched via Browser": self.fetch_counts['browser'],
+            "Cache Hits": self.cache_counts['hits'],
+            "Cache Revalidations": self.cache_counts['revalidated'],
+            "Cache Misses": self.cache_counts['misses'],
+            "Blocked Requests": self.resource_blocker.blocked_requests,
+            "Est. MB Saved": round(self.resource_blocker.estimated_bytes_saved / 1_000_000, 1),
+            "Fetch Errors": sum(self.fetch_policy.errors.values()),
+            "Errors by Type": ', '.join(f"{kind}: {count}" for kind, count in self.fetch_policy.errors.most_common()),
+            "Retries": self.fetch_policy.counts['retries'],
+            "Circuits Opened": self.fetch_policy.counts['circuits_opened'],
+            "Skipped (Circuit Open)": self.fetch_policy.counts['circuit_open'],
+        }
+
+    def run_scraper(self, file_path, progress: Optional[Callable] = None) -> Tuple["pd.DataFrame", str]:
         """Run the scraper on URLs from a file."""
+        import pandas as pd
+
         if file_path is None:
             # If no file is uploaded, look for the most recent file in data/input
             input_dir = os.path.join('data', 'input')
@@ -185,18 +817,15 @@ class Scraper:
             return pd.DataFrame(), "No valid URLs found. Please check your input file."
 
         self.logger.info(f"Starting the scraping process for {len(urls)} URLs")
-        progress(0, desc="Initializing...")
+        if progress:
+            progress(0, desc="Initializing...")
 
         try:
-            successes, failures = asyncio.run(self.scrape_urls(urls, progress))
+            successes, failures = self.scrape(urls, progress)
         except Exception as e:
             self.logger.exception(f"An error occurred during scraping: {str(e)}")
             return pd.DataFrame(), f"An error occurred: {str(e)}"
 
-        results_df = pd.DataFrame({
-            "Total URLs": [len(urls)],
-            "Successful": [successes],
-            "Failed": [failures]
-        })
+        results_df = pd.DataFrame({name: [value] for name, value in self.run_summary(len(urls), successes, failures).items()})
 
         return results_df, "Scraping completed successfully!"
\ No newline at end of file
@@ -0,0 +1,234 @@
+import dataclasses
+import difflib
+import typing
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional
+import yaml
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+BLOCKING_PROFILE_NAMES = ('full', 'text-only', 'links-only')
+
+
+def setting(default: Any = None, choices: Optional[tuple] = None, minimum: Optional[float] = None,
+            maximum: Optional[float] = None, above: Optional[float] = None, below: Optional[float] = None,
+            **kwargs) -> Any:
+    """Declare a setting with its default, allowed values, inclusive bounds and exclusive bounds."""
+    metadata = {'choices': choices, 'minimum': minimum, 'maximum': maximum, 'above': above, 'below': below}
+    if isinstance(default, list):
+        return field(default_factory=lambda: list(default), metadata=metadata, **kwargs)
+    return field(default=default, metadata=metadata, **kwargs)
+
+
+@dataclass
+class DomainProfile:
+    """Settings overridden for the pages of one domain and its subdomains; None keeps the global value."""
+    max_scrolls: Optional[int] = setting(minimum=0)
+    scroll_pause_time: Optional[float] = setting(minimum=0)
+    wait_strategy: Optional[str] = setting(choices=('settle', 'fixed'))
+    settle_timeout: Optional[float] = setting(minimum=0)
+    navigate_timeout: Optional[float] = setting(minimum=0)
+    scroll_timeout: Optional[float] = setting(minimum=0)
+    content_timeout: Optional[float] = setting(minimum=0)
+    blocking_profile: Optional[str] = setting(choices=BLOCKING_PROFILE_NAMES)
+    fetch_mode: Optional[str] = setting(choices=('auto', 'browser'))
+    max_per_host: Optional[int] = setting(minimum=1)
+    delay_min: Optional[float] = setting(minimum=0)
+    delay_max: Optional[float] = setting(minimum=0)
+
+
+@dataclass
+class Settings:
+    """Every configuration setting with its type and default, as resolved by ConfigManager."""
+    # General settings
+    max_workers: int = setting(4, minimum=1)
+    progress_update_frequency: int = setting(10, minimum=1)
+    report_format: str = setting('markdown')
+    metrics_enabled: bool = setting(True)
+    metrics_dir: str = setting('data/metrics')
+    metrics_per_host: bool = setting(False)
+
+    # Scraper settings
+    user_agent: str = setting(DEFAULT_USER_AGENT)
+    max_scrolls: int = setting(5, minimum=0)
+    scroll_pause_time: float = setting(2.0, minimum=0)
+    wait_strategy: str = setting('settle', choices=('settle', 'fixed'))
+    settle_quiet_ms: int = setting(500, minimum=0)
+    settle_timeout: float = setting(10.0, minimum=0)
+    navigate_timeout: float = setting(30.0, minimum=0)
+    scroll_timeout: float = setting(60.0, minimum=0)
+    content_timeout: float = setting(15.0, minimum=0)
+    fetch_retries: int = setting(2, minimum=0)
+    retry_backoff_base: float = setting(1.0, minimum=0)
+    retry_backoff_max: float = setting(30.0, minimum=0)
+    breaker_threshold: int = setting(5, minimum=1)
+    breaker_cooldown: float = setting(300.0, minimum=0)
+    blocking_profile: str = setting('text-only', choices=BLOCKING_PROFILE_NAMES)
+    blocked_hosts: List[str] = setting([])
+    delay_min: float = setting(1.0, minimum=0)
+    delay_max: float = setting(3.0, minimum=0)
+    html_backend: str = setting('stream', choices=('stream', 'bs4', 'lxml'))
+    fetch_mode: str = setting('auto', choices=('auto', 'browser'))
+    http_max_connections: int = setting(20, minimum=1)
+    http_timeout: float = setting(15.0, minimum=0)
+    http_min_text_length: int = setting(200, minimum=0)
+    fetch_cache: bool = setting(True)
+    fetch_cache_path: str = setting('data/cache/fetch_cache.sqlite3')
+    output_format: str = setting('files', choices=('files', 'shards'))
+    shard_dir: str = setting('data/output/shards')
+    shard_max_mb: float = setting(256.0, above=0)
+    raw_html_cache: bool = setting(False)
+    raw_html_dir: str = setting('data/cache/html')
+    scrape_journal: bool = setting(True)
+    journal_dir: str = setting('data/journal')
+    resume_scrapes: bool = setting(True)
+    resume_max_attempts: int = setting(3, minimum=1)
+    scrape_processes: int = setting(1, minimum=1)
+    queue_dir: str = setting('data/queue')
+    queue_lease_seconds: float = setting(300.0, minimum=0)
+    queue_claim_size: Optional[int] = setting(minimum=1)
+    queue_poll_interval: float = setting(1.0, minimum=0)
+    dedup_after_scrape: bool = setting(False)
+    dedup_boilerplate_ratio: float = setting(0.5, minimum=0, maximum=1)
+    dedup_min_pages: int = setting(5, minimum=1)
+    # Near duplicates are found by 8 SimHash bands, so at most 7 bits may differ.
+    dedup_max_distance: int = setting(6, minimum=0, maximum=7)
+    dedup_shingle_size: int = setting(4, minimum=1)
+    dedup_action: str = setting('flag', choices=('flag', 'skip'))
+    max_per_host: int = setting(1, minimum=1)
+    max_concurrency: Optional[int] = setting(minimum=1)
+    pipeline_queue_size: int = setting(100, minimum=1)
+    domain_profiles: Dict[str, DomainProfile] = field(default_factory=dict)
+
+    # Postprocessor settings
+    supported_file_types: List[str] = setting(['.txt'])
+    streaming_conversion: bool = setting(True)
+    max_file_size: int = setting(10 * 1024 * 1024, minimum=0)
+    incremental_conversion: bool = setting(True)
+    conversion_executor: str = setting('thread', choices=('thread', 'process'))
+    conversion_processes: Optional[int] = setting(minimum=1)
+    conversion_batch_size: int = setting(8, minimum=1)
+
+    # LinkExtractor settings
+    max_links: Optional[int] = setting(minimum=0)
+    crawl_max_pages: int = setting(1000, minimum=1)
+    crawl_expected_urls: int = setting(1_000_000, minimum=1)
+    crawl_false_positive_rate: float = setting(0.001, above=0, below=1)
+    link_blocking_profile: str = setting('links-only', choices=BLOCKING_PROFILE_NAMES)
+    link_discovery: str = setting('crawl', choices=('crawl', 'sitemap', 'auto'))
+    sitemap_max_files: int = setting(1000, minimum=1)
+
+    # Gradio interface settings
+    theme: str = setting('default')
+
+
+class ConfigError(ValueError):
+    """Raised when the configuration holds unknown keys or values of the wrong type."""
+
+
+def _coerce(name: str, kind: Any, value: Any) -> Any:
+    """Check a value against a setting's type, converting ints to floats where a float is expected."""
+    if typing.get_origin(kind) is typing.Union:
+        if value is None:
+            return None
+        kind = next(arg for arg in typing.get_args(kind) if arg is not type(None))
+    if typing.get_origin(kind) is list:
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise ConfigError(f"{name}: expected a list of strings, got {value!r}")
+        return value
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if kind is int and isinstance(value, float) and value.is_integer():
+        return int(value)
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ConfigError(f"{name}: expected {kind.__name__}, got {value!r}")
+    return value
+
+
+def _check_bounds(metadata: Mapping[str, Any], value: Any) -> Optional[str]:
+    """Describe how a value breaks a setting's allowed values or bounds, or return None if it does not."""
+    if value is None:
+        return None
+    choices = metadata.get('choices')
+    if choices and value not in choices:
+        return f"expected one of {', '.join(choices)}"
+    bounds = (('minimum', 'must be at least', value.__lt__), ('maximum', 'must be at most', value.__gt__),
+              ('above', 'must be greater than', value.__le__), ('below', 'must be less than', value.__ge__))
+    for key, description, breaks in bounds:
+        bound = metadata.get(key)
+        if bound is not None and breaks(bound):
+            return f"{description} {bound}"
+    return None
+
+
+def _build(cls: type, values: Mapping[str, Any], context: str, errors: List[str]) -> Any:
+    """Create a settings dataclass from raw values, collecting every problem in ``errors``."""
+    fields = {f.name: f for f in dataclasses.fields(cls)}
+    hints = typing.get_type_hints(cls)
+    kwargs: Dict[str, Any] = {}
+    for key, value in values.items():
+        name = str(key).lower()
+        if name not in fields:
+            close = difflib.get_close_matches(name, fields, n=1)
+            errors.append(f"unknown setting '{context}{key}'" + (f" (did you mean '{close[0]}'?)" if close else ""))
+            continue
+        if name == 'domain_profiles':
+            value = _build_profiles(value, errors)
+        else:
+            try:
+                value = _coerce(f"{context}{name}", hints[name], value)
+            except ConfigError as e:
+                errors.append(str(e))
+                continue
+            problem = _check_bounds(fields[name].metadata, value)
+            if problem:
+                errors.append(f"{context}{name}: {problem}, got {value!r}")
+                continue
+        kwargs[name] = value
+    return cls(**kwargs)
+
+
+def _build_profiles(values: Any, errors: List[str]) -> Dict[str, DomainProfile]:
+    if values is None:
+        return {}
+    if not isinstance(values, Mapping):
+        errors.append(f"domain_profiles: expected a mapping of domains to settings, got {values!r}")
+        return {}
+    profiles = {}
+    for domain, overrides in values.items():
+        if not isinstance(overrides, Mapping):
+            errors.append(f"domain_profiles.{domain}: expected a mapping of settings, got {overrides!r}")
+            continue
+        profiles[str(domain).lower()] = _build(DomainProfile, overrides, f"domain_profiles.{domain}.", errors)
+    return profiles
+
+
+def build_settings(values: Mapping[str, Any]) -> Settings:
+    """
+    Validate flat configuration values and turn them into Settings.
+
+    Args:
+        values (Mapping[str, Any]): Setting names, in any case, to raw values.
+
+    Returns:
+        Settings: The typed settings, with defaults for everything not given.
+
+    Raises:
+        ConfigError: Listing every unknown key and invalid value.
+    """
+    errors: List[str] = []
+    settings = _build(Settings, values, '', errors)
+    if errors:
+        raise ConfigError("Invalid configuration:\n  " + "\n  ".join(errors))
+    return settings
+
+
+def setting_names() -> List[str]:
+    return [f.name for f in dataclasses.fields(Settings)]
+
+def parse_setting(name: str, text: str) -> Any:
+    """Parse a setting given as text, such as an environment variable: strings stay as they are, the rest is YAML."""
+    kind = typing.get_type_hints(Settings).get(name.lower())
+    if kind in (str, Optional[str]):
+        return text
+    return yaml.safe_load(text) if text.strip() else None
\ No newline at end of file
@@ -0,0 +1,225 @@
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import BinaryIO, Dict, Iterator, NamedTuple, Optional
+
+INDEX_NAME = 'index.sqlite3'
+SHARD_SUFFIX = '.jsonl.gz'
+
+# Subdirectory of ``shard_dir`` holding the markdown made from its text by the reprocessor and the pipeline.
+MARKDOWN_SHARD_DIR = 'markdown'
+
+
+class ShardRecord(NamedTuple):
+    """A document stored in a shard."""
+    url: str
+    key: str
+    fetched_at: float
+    text: str
+
+
+class IndexEntry(NamedTuple):
+    """Where the latest record of a URL is stored."""
+    url: str
+    key: str
+    shard: str
+    offset: int
+    length: int
+    fetched_at: float
+    source_hash: Optional[str] = None
+
+
+class ShardStore:
+    """
+    Documents appended to large gzip-compressed JSONL shards, with an SQLite index by URL.
+
+    Every record is compressed as its own gzip member, so a shard is a plain
+    ``.jsonl.gz`` file that ``zcat`` and ``gzip.open`` read in full, while
+    the index stores each record's offset and length for random access.
+    Shards are rotated once they reach ``max_shard_bytes``. A URL stored
+    again gets a new record and the index points at the newest one. A
+    document derived from another one, such as markdown converted from
+    scraped text, can record the ``content_hash`` of its source, which tells
+    whether it is still up to date.
+
+    Records are flushed to the shard before the index is committed, so the
+    index never refers to data that is not on disk; records written after the
+    last commit of a crashed run are simply not indexed.
+
+    Processes writing to the same directory at once must each use their own
+    ``prefix``, since a shard has a single writer, and should commit every
+    record; the index runs in WAL mode so that they only wait for each
+    other's commits.
+    """
+
+    def __init__(self, directory: str, max_shard_bytes: int = 256 * 1024 * 1024, prefix: str = 'shard',
+                 commit_every: int = 100, timeout: float = 30):
+        """
+        Initialize the ShardStore, creating the directory and index if needed.
+
+        Args:
+            directory (str): Directory holding the shards and the index.
+            max_shard_bytes (int): Size at which a new shard is started.
+            prefix (str): Name prefix of the shards this store appends to.
+            commit_every (int): Number of records grouped into a single index transaction.
+            timeout (float): Seconds to wait for another process's write lock.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_shard_bytes = max_shard_bytes
+        self.prefix = prefix
+        self.commit_every = commit_every
+        self.connection = sqlite3.connect(os.path.join(directory, INDEX_NAME), timeout=timeout)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                url TEXT PRIMARY KEY,
+                key TEXT NOT NULL,
+                shard TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                source_hash TEXT
+            ) WITHOUT ROWID
+        """)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(documents)")}
+        if 'source_hash' not in columns:
+            # Indexes written before source hashes were recorded.
+            self.connection.execute("ALTER TABLE documents ADD COLUMN source_hash TEXT")
+        self.connection.commit()
+        self._uncommitted = 0
+        self._shard_name: Optional[str] = None
+        self._shard_file: Optional[BinaryIO] = None
+        self._readers: Dict[str, BinaryIO] = {}
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Return the hash recorded as the ``source_hash`` of documents derived from a text."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_store(directory: str) -> bool:
+        """Check whether a directory holds a shard store."""
+        return os.path.isfile(os.path.join(directory, INDEX_NAME))
+
+    def _open_shard(self) -> BinaryIO:
+        """Return the shard to append to, continuing the last one until it is full."""
+        if self._shard_file is not None and self._shard_file.tell() < self.max_shard_bytes:
+            return self._shard_file
+        if self._shard_file is not None:
+            self._shard_file.close()
+
+        numbers = [int(match.group(1)) for match in
+                   (re.fullmatch(re.escape(self.prefix) + r'-(\d+)' + re.escape(SHARD_SUFFIX), os.path.basename(path))
+                    for path in glob.glob(os.path.join(self.directory, f"{self.prefix}-*{SHARD_SUFFIX}")))
+                   if match]
+        number = max(numbers, default=0)
+        name = f"{self.prefix}-{number:05d}{SHARD_SUFFIX}"
+        if os.path.exists(os.path.join(self.directory, name)) and \
+                os.path.getsize(os.path.join(self.directory, name)) >= self.max_shard_bytes:
+            name = f"{self.prefix}-{number + 1:05d}{SHARD_SUFFIX}"
+        self._shard_name = name
+        self._shard_file = open(os.path.join(self.directory, name), 'ab')
+        return self._shard_file
+
+    def add(self, url: str, text: str, key: str = '', fetched_at: Optional[float] = None,
+            source_hash: Optional[str] = None) -> IndexEntry:
+        """
+        Append a document and index it under its URL.
+
+        Args:
+            url (str): URL of the document.
+            text (str): The document's text.
+            key (str): The document's output key, used to name files when it is exported.
+            fetched_at (Optional[float]): When the document was fetched; defaults to now.
+            source_hash (Optional[str]): ``content_hash`` of the text the document was derived from, if any.
+
+        Returns:
+            IndexEntry: Where the record was written.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        line = json.dumps({'url': url, 'key': key, 'fetched_at': fetched_at, 'text': text}, ensure_ascii=False)
+        member = gzip.compress(line.encode('utf-8') + b'\n', mtime=0)
+        shard = self._open_shard()
+        offset = shard.tell()
+        shard.write(member)
+        entry = IndexEntry(url, key, self._shard_name, offset, len(member), fetched_at, source_hash)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO documents (url, key, shard, offset, length, fetched_at, source_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            entry)
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.commit()
+        return entry
+
+    def remove(self, url: str) -> None:
+        """Drop a URL from the index; its records stay in the shards but are no longer returned."""
+        self.connection.execute("DELETE FROM documents WHERE url = ?", (url,))
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.commit()
+
+    def entry(self, url: str) -> Optional[IndexEntry]:
+        """Return where the latest record of a URL is stored, or None if it was never stored."""
+        row = self.connection.execute(
+            "SELECT url, key, shard, offset, length, fetched_at, source_hash FROM documents WHERE url = ?",
+            (url,)).fetchone()
+        return IndexEntry(*row) if row else None
+
+    def __contains__(self, url: str) -> bool:
+        return self.connection.execute("SELECT 1 FROM documents WHERE url = ?", (url,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def read(self, entry: IndexEntry) -> ShardRecord:
+        """Read the record an index entry points at."""
+        if entry.shard == self._shard_name and self._shard_file is not None:
+            self._shard_file.flush()
+        reader = self._readers.get(entry.shard)
+        if reader is None:
+            reader = self._readers[entry.shard] = open(os.path.join(self.directory, entry.shard), 'rb')
+        reader.seek(entry.offset)
+        record = json.loads(gzip.decompress(reader.read(entry.length)))
+        return ShardRecord(record['url'], record.get('key', ''), record['fetched_at'], record['text'])
+
+    def get(self, url: str) -> Optional[ShardRecord]:
+        """Return the latest record of a URL, or None if it was never stored."""
+        entry = self.entry(url)
+        return self.read(entry) if entry else None
+
+    def entries(self) -> Iterator[IndexEntry]:
+        """Yield the index entry of every URL, in storage order so that shards are read sequentially."""
+        cursor = self.connection.execute(
+            "SELECT url, key, shard, offset, length, fetched_at, source_hash FROM documents ORDER BY shard, offset")
+        for row in cursor:
+            yield IndexEntry(*row)
+
+    def documents(self) -> Iterator[ShardRecord]:
+        """Yield the latest record of every URL; the store must not be written to meanwhile."""
+        for entry in self.entries():
+            yield self.read(entry)
+
+    def commit(self) -> None:
+        """Flush the current shard and commit the index."""
+        if self._shard_file is not None:
+            self._shard_file.flush()
+            os.fsync(self._shard_file.fileno())
+        self.connection.commit()
+        self._uncommitted = 0
+
+    def close(self) -> None:
+        self.commit()
+        if self._shard_file is not None:
+            self._shard_file.close()
+            self._shard_file = None
+        for reader in self._readers.values():
+            reader.close()
+        self._readers = {}
+        self.connection.close()
\ No newline at end of file
@@ -0,0 +1,179 @@
+import logging
+import xml.etree.ElementTree as ET
+import zlib
+from collections import deque
+from typing import AsyncIterator, Deque, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+import httpx
+
+# Start of a gzip stream; sitemaps are often served as raw .xml.gz files.
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Upper bound of the decompressed size of one sitemap; the protocol allows 50 MB.
+MAX_SITEMAP_BYTES = 64 * 1024 * 1024
+
+
+def robots_sitemaps(robots_txt: str, base_url: str) -> List[str]:
+    """Return the sitemap URLs declared by ``Sitemap:`` lines of a robots.txt file."""
+    sitemaps = []
+    for line in robots_txt.splitlines():
+        name, _, value = line.partition(':')
+        value = value.split('#', 1)[0].strip()
+        if name.strip().lower() == 'sitemap' and value:
+            sitemaps.append(urljoin(base_url, value))
+    return sitemaps
+
+
+class SitemapParser:
+    """
+    Incremental parser of sitemaps and sitemap indexes, fed with the response body chunk by chunk.
+
+    Each ``<loc>`` is reported as soon as its element is complete, and every
+    finished ``<url>`` or ``<sitemap>`` entry is dropped from the tree, so
+    memory stays constant however long the sitemap is. Gzipped sitemaps are
+    recognised by their first bytes and decompressed on the fly.
+    """
+
+    def __init__(self):
+        """Initialize the SitemapParser."""
+        self._parser = ET.XMLPullParser(events=('start', 'end'))
+        self._decompressor: Optional[zlib._Decompress] = None
+        self._started = False
+        self._root: Optional[ET.Element] = None
+        self._kind = ''
+        self._depth = 0
+        self.size = 0
+
+    @staticmethod
+    def local_name(tag: str) -> str:
+        return tag.rpartition('}')[2]
+
+    def feed(self, data: bytes) -> Iterator[Tuple[str, str]]:
+        """
+        Parse the next chunk of a sitemap.
+
+        Args:
+            data (bytes): The next bytes of the document, possibly gzipped.
+
+        Yields:
+            Tuple[str, str]: ``('url', location)`` for a page of a sitemap, or
+            ``('sitemap', location)`` for a child sitemap of a sitemap index.
+
+        Raises:
+            ET.ParseError: If the document is not well-formed XML.
+            ValueError: If the document exceeds ``MAX_SITEMAP_BYTES``.
+        """
+        if not self._started:
+            self._started = True
+            if data.startswith(GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        if self._decompressor is not None:
+            data = self._decompressor.decompress(data, MAX_SITEMAP_BYTES - self.size + 1)
+        self.size += len(data)
+        if self.size > MAX_SITEMAP_BYTES:
+            raise ValueError(f"sitemap larger than {MAX_SITEMAP_BYTES} bytes")
+        self._parser.feed(data)
+        yield from self._read_events()
+
+    def close(self) -> Iterator[Tuple[str, str]]:
+        """Finish parsing, yielding the entries of the last chunk."""
+        self._parser.close()
+        yield from self._read_events()
+
+    def _read_events(self) -> Iterator[Tuple[str, str]]:
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                self._depth += 1
+                if self._depth == 1:
+                    self._root = element
+                    self._kind = 'sitemap' if self.local_name(element.tag) == 'sitemapindex' else 'url'
+                continue
+            if self._depth == 3 and self.local_name(element.tag) == 'loc' and element.text:
+                yield self._kind, element.text.strip()
+            elif self._depth == 2:
+                self._root.clear()
+            self._depth -= 1
+
+
+class SitemapReader:
+    """
+    Enumerates the URLs of a site from its sitemaps, without rendering any page.
+
+    The sitemaps declared in ``robots.txt`` and ``/sitemap.xml`` are read,
+    following sitemap indexes breadth-first, each one streamed through a
+    SitemapParser as it downloads.
+    """
+
+    def __init__(self, user_agent: str, timeout: float = 15.0, max_sitemaps: int = 1000):
+        """
+        Initialize the SitemapReader.
+
+        Args:
+            user_agent (str): User agent sent with every request.
+            timeout (float): Timeout of a single request in seconds.
+            max_sitemaps (int): Maximum number of sitemap files to read.
+        """
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.max_sitemaps = max_sitemaps
+        self.sitemaps_read = 0
+        self.sitemap_errors = 0
+        self.logger = logging.getLogger(__name__)
+
+    async def declared_sitemaps(self, client: httpx.AsyncClient, origin: str) -> List[str]:
+        """Return the sitemaps declared in a site's robots.txt, followed by its ``/sitemap.xml``."""
+        sitemaps = []
+        try:
+            response = await client.get(urljoin(origin, '/robots.txt'))
+            if response.status_code == 200:
+                sitemaps = robots_sitemaps(response.text, str(response.url))
+        except httpx.HTTPError as e:
+            self.logger.warning(f"Could not read robots.txt of {origin}: {str(e)}")
+        default = urljoin(origin, '/sitemap.xml')
+        return sitemaps if default in sitemaps else sitemaps + [default]
+
+    async def urls(self, site_url: str) -> AsyncIterator[str]:
+        """
+        Yield the page URLs listed in a site's sitemaps, as written there.
+
+        Sitemaps that are missing, fail or are not valid XML are skipped
+        after logging, keeping the URLs read from them so far.
+
+        Args:
+            site_url (str): Any URL of the site.
+        """
+        parts = urlsplit(site_url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        self.sitemaps_read = 0
+        self.sitemap_errors = 0
+        async with httpx.AsyncClient(headers={'User-Agent': self.user_agent}, timeout=self.timeout,
+                                     follow_redirects=True) as client:
+            queue: Deque[str] = deque(await self.declared_sitemaps(client, origin))
+            seen: Set[str] = set(queue)
+            while queue and self.sitemaps_read < self.max_sitemaps:
+                sitemap = queue.popleft()
+                try:
+                    async with client.stream('GET', sitemap) as response:
+                        if response.status_code != 200:
+                            self.logger.info(f"No sitemap at {sitemap} (HTTP {response.status_code})")
+                            continue
+                        self.sitemaps_read += 1
+                        parser = SitemapParser()
+                        async for chunk in response.aiter_raw():
+                            for kind, location in parser.feed(chunk):
+                                if kind == 'url':
+                                    yield location
+                                elif location not in seen:
+                                    seen.add(location)
+                                    queue.append(location)
+                        for kind, location in parser.close():
+                            if kind == 'url':
+                                yield location
+                            elif location not in seen:
+                                seen.add(location)
+                                queue.append(location)
+                except (httpx.HTTPError, ET.ParseError, ValueError, zlib.error) as e:
+                    self.sitemap_errors += 1
+                    self.logger.warning(f"Error reading sitemap {sitemap}: {str(e)}")
+            if queue:
+                self.logger.warning(f"Stopped after {self.max_sitemaps} sitemaps, {len(queue)} left unread")
\ No newline at end of file
@@ -0,0 +1,93 @@
+import hashlib
+from typing import Optional, Set
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Query parameters that only identify campaigns or clicks and never change the page.
+TRACKING_PARAMS = frozenset({
+    'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'twclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', '_hsenc', '_hsmi', 'mkt_tok', 'oly_anon_id', 'oly_enc_id', 'vero_id', 'wickedid',
+    'spm', 'ref_src', 'ref_url',
+})
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+
+def is_tracking_param(name: str) -> bool:
+    """Check whether a query parameter name is a known tracking parameter."""
+    name = unquote_plus(name).lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """
+    Normalize a URL so that trivially different spellings of the same page compare equal.
+
+    The scheme and host are lowercased, default ports and the fragment are
+    dropped, an empty path becomes ``/``, tracking parameters are removed and
+    the remaining query parameters are sorted. Query values are kept exactly
+    as written.
+
+    Args:
+        url (str): An absolute URL.
+
+    Returns:
+        Optional[str]: The canonical URL, or None if it is not a valid http(s) URL.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        if scheme not in DEFAULT_PORTS or not parts.hostname:
+            return None
+        port = parts.port
+    except ValueError:
+        return None
+
+    host = parts.hostname.lower()
+    if ':' in host:
+        host = f"[{host}]"
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    query = ''
+    if parts.query:
+        params = [param for param in parts.query.split('&')
+                  if param and not is_tracking_param(param.split('=', 1)[0])]
+        query = '&'.join(sorted(params))
+
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+class UrlDedupIndex:
+    """Set of canonical URLs, stored as short hashes, that counts the duplicates it rejects."""
+
+    def __init__(self):
+        """Initialize an empty UrlDedupIndex."""
+        self._digests: Set[bytes] = set()
+        self.duplicates = 0
+        self.invalid = 0
+
+    def add(self, url: str) -> Optional[str]:
+        """
+        Add a URL to the index.
+
+        Args:
+            url (str): The URL to add.
+
+        Returns:
+            Optional[str]: The canonical URL if it was new, or None if it is a
+            duplicate or not a valid http(s) URL.
+        """
+        canonical = canonicalize_url(url)
+        if canonical is None:
+            self.invalid += 1
+            return None
+        digest = hashlib.blake2b(canonical.encode('utf-8'), digest_size=8).digest()
+        if digest in self._digests:
+            self.duplicates += 1
+            return None
+        self._digests.add(digest)
+        return canonical
+
+    def __len__(self) -> int:
+        return len(self._digests)
\ No newline at end of file
@@ -0,0 +1,201 @@
+import json
+import sqlite3
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import urlparse
+
+
+class WorkQueue:
+    """
+    URL queue in a local SQLite database, shared by scraping worker processes through leases.
+
+    Every host is assigned to one shard, balancing the number of URLs per
+    shard, and each worker claims URLs from its own shard, so a host is only
+    ever fetched by one process and the per-host politeness limits still
+    hold. Claims take the hosts of a shard in turn rather than one host
+    after the other, so that a worker's hosts are fetched side by side. A claimed URL is
+    leased for ``lease_seconds``; if its worker dies, the lease expires and
+    the URL is handed out again. A shard whose worker has not sent a
+    heartbeat for ``lease_seconds`` is adopted by the remaining workers.
+    A URL passed over because its host's circuit is open is postponed
+    rather than completed, so that it does not use up one of its attempts.
+
+    The database runs in WAL mode and claims take a write lock for a single
+    short transaction, so workers never block each other for long.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 300, max_attempts: int = 3, timeout: float = 30):
+        """
+        Initialize the WorkQueue, creating the database if needed.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            lease_seconds (float): How long a claimed URL, or a worker's shard, stays reserved without news.
+            max_attempts (int): Number of claims after which a failing URL is given up.
+            timeout (float): Seconds to wait for another process's write lock.
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE NOT NULL,
+                host TEXT NOT NULL,
+                shard INTEGER NOT NULL,
+                rank INTEGER NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                owner INTEGER,
+                lease_expires REAL
+            );
+            CREATE INDEX IF NOT EXISTS urls_by_shard ON urls (shard, state, rank);
+            CREATE TABLE IF NOT EXISTS workers (
+                worker_id INTEGER PRIMARY KEY,
+                heartbeat REAL NOT NULL,
+                stats TEXT
+            );
+        """)
+
+    def add(self, urls: Iterable[str], shards: int) -> None:
+        """
+        Queue URLs spread over ``shards`` shards; URLs already in the queue keep their state.
+
+        Hosts new to the queue go, largest first, to the shard with the fewest
+        URLs, and hosts already in it stay on their shard if it still exists.
+        """
+        by_host: Dict[str, List[str]] = defaultdict(list)
+        for url in urls:
+            by_host[urlparse(url).netloc.lower()].append(url)
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            known = dict(self.connection.execute("SELECT host, MIN(shard) FROM urls GROUP BY host"))
+            load = Counter(dict.fromkeys(range(shards), 0))
+            load.update(dict(self.connection.execute(
+                "SELECT shard, COUNT(*) FROM urls WHERE shard < ? GROUP BY shard", (shards,))))
+            rows = []
+            for host, host_urls in sorted(by_host.items(), key=lambda item: -len(item[1])):
+                shard = known.get(host)
+                if shard is None or shard >= shards:
+                    shard = min(load, key=lambda number: (load[number], number))
+                    # A run with fewer workers than before moves the hosts of the missing shards.
+                    self.connection.execute("UPDATE urls SET shard = ? WHERE host = ?", (shard, host))
+                load[shard] += len(host_urls)
+                rows.extend((url, host, shard, rank) for rank, url in enumerate(host_urls))
+            self.connection.executemany("INSERT OR IGNORE INTO urls (url, host, shard, rank) VALUES (?, ?, ?, ?)", rows)
+
+    def reset_workers(self, worker_ids: Iterable[int]) -> None:
+        """
+        Prepare the queue for a new set of workers.
+
+        Leases held by the workers of an earlier, interrupted run are
+        released, and every new worker starts with a fresh heartbeat.
+        """
+        now = time.time()
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute("UPDATE urls SET state = 'pending', owner = NULL, lease_expires = NULL "
+                                    "WHERE state = 'leased'")
+            self.connection.execute("DELETE FROM workers")
+            self.connection.executemany("INSERT INTO workers (worker_id, heartbeat) VALUES (?, ?)",
+                                        ((worker_id, now) for worker_id in worker_ids))
+
+    def heartbeat(self, worker_id: int) -> None:
+        with self.connection:
+            self.connection.execute("UPDATE workers SET heartbeat = ? WHERE worker_id = ?", (time.time(), worker_id))
+
+    def claim(self, worker_id: int, limit: int) -> List[Tuple[int, str]]:
+        """
+        Lease up to ``limit`` URLs for a worker, from its own shard first and then from orphaned shards.
+
+        Args:
+            worker_id (int): The claiming worker, which is also the number of its shard.
+            limit (int): Maximum number of URLs to lease.
+
+        Returns:
+            List[Tuple[int, str]]: The id and URL of every leased URL.
+        """
+        now = time.time()
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute("UPDATE workers SET heartbeat = ? WHERE worker_id = ?", (now, worker_id))
+            # URLs whose last lease expired after their final attempt are given up.
+            self.connection.execute("UPDATE urls SET state = 'failed', owner = NULL, lease_expires = NULL "
+                                    "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                                    (now, self.max_attempts))
+            rows = self.connection.execute("""
+                SELECT id, url FROM urls
+                WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?))
+                  AND (shard = ? OR shard NOT IN (SELECT worker_id FROM workers WHERE heartbeat >= ?))
+                ORDER BY shard != ?, rank, id
+                LIMIT ?
+            """, (now, worker_id, now - self.lease_seconds, worker_id, limit)).fetchall()
+            self.connection.executemany(
+                "UPDATE urls SET state = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                ((worker_id, now + self.lease_seconds, url_id) for url_id, _ in rows))
+        return rows
+
+    def complete(self, url_id: int, succeeded: bool) -> None:
+        """Record the outcome of a leased URL; a failed URL is queued again until it runs out of attempts."""
+        with self.connection:
+            self.connection.execute("""
+                UPDATE urls
+                SET state = CASE WHEN ? THEN 'done' WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    owner = NULL, lease_expires = NULL
+                WHERE id = ?
+            """, (succeeded, self.max_attempts, url_id))
+
+    def postpone(self, url_id: int, delay: float) -> None:
+        """Hand a leased URL back without counting the attempt, to be claimed again after ``delay`` seconds."""
+        with self.connection:
+            # An expired lease is claimed like a pending URL, which counts the attempt again.
+            self.connection.execute("""
+                UPDATE urls
+                SET state = 'leased', owner = NULL, lease_expires = ?, attempts = MAX(attempts - 1, 0)
+                WHERE id = ?
+            """, (time.time() + delay, url_id))
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of URLs in each state: ``pending``, ``leased``, ``done`` and ``failed``."""
+        counts = dict.fromkeys(('pending', 'leased', 'done', 'failed'), 0)
+        counts.update(self.connection.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+        return counts
+
+    def unfinished(self) -> int:
+        """Return the number of URLs still pending or leased."""
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM urls WHERE state IN ('pending', 'leased')").fetchone()[0]
+
+    def save_stats(self, worker_id: int, stats: dict) -> None:
+        """Store the figures of a worker's run for the merged summary."""
+        with self.connection:
+            self.connection.execute("UPDATE workers SET stats = ? WHERE worker_id = ?", (json.dumps(stats), worker_id))
+
+    def worker_stats(self) -> List[dict]:
+        return [json.loads(stats) for (stats,) in
+                self.connection.execute("SELECT stats FROM workers WHERE stats IS NOT NULL")]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class LeaseRecorder:
+    """Completes the leases of a worker's URLs as the scraper finishes them; takes the place of a ScrapeJournal."""
+
+    def __init__(self, queue: WorkQueue):
+        self.queue = queue
+        self.ids: Dict[str, int] = {}
+
+    def lease(self, url_id: int, url: str) -> None:
+        self.ids[url] = url_id
+
+    def record(self, url: str, succeeded: bool) -> None:
+        self.queue.complete(self.ids.pop(url), succeeded)
+
+    def skip(self, url: str, retry_after: float = 0.0) -> None:
+        """Hand back a URL that was not fetched, so that it is claimed again once ``retry_after`` seconds passed."""
+        self.queue.postpone(self.ids.pop(url), retry_after)
\ No newline at end of file
@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+import unittest
+from src.config_manager import ConfigManager
+from src.settings import ConfigError, Settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestConfigManager(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def load(self, text: str, environ=None) -> ConfigManager:
+        return ConfigManager(self.write('config.yaml', text), environ or {})
+
+    def assertInvalid(self, text: str, *messages: str, environ=None):
+        with self.assertRaises(ConfigError) as context:
+            self.load(text, environ)
+        for message in messages:
+            self.assertIn(message, str(context.exception))
+
+    def test_shipped_configs_are_valid(self):
+        for name in ('config.yaml', 'config.json'):
+            with self.subTest(name=name):
+                config = ConfigManager(os.path.join(ROOT, 'configs', name), {})
+                self.assertEqual(config.get('link_blocking_profile'), 'links-only')
+                self.assertEqual(config.get('domain_profiles'), {})
+
+    def test_defaults_and_case_insensitive_keys(self):
+        config = self.load("MAX_WORKERS: 2\nscroll_pause_time: 1\n")
+        self.assertEqual(config.get('max_workers'), 2)
+        self.assertEqual(config.get('MAX_WORKERS'), 2)
+        self.assertEqual(config.get('scroll_pause_time'), 1.0)
+        self.assertIsInstance(config.get('scroll_pause_time'), float)
+        self.assertEqual(config.get('max_scrolls'), Settings().max_scrolls)
+        self.assertEqual(config.get('max_links', 100), 100)
+
+    def test_json_sections_are_flattened(self):
+        path = self.write('config.json', json.dumps({'general': {'max_workers': 3},
+                                                    'scraper': {'delay_min': 0, 'domain_profiles': {}}}))
+        config = ConfigManager(path, {})
+        self.assertEqual(config.get('max_workers'), 3)
+        self.assertEqual(config.get('delay_min'), 0.0)
+
+    def test_missing_file_fails(self):
+        with self.assertRaises(ConfigError):
+            ConfigManager(os.path.join(self.directory, 'missing.yaml'), {})
+
+    def test_unparsable_file_fails(self):
+        self.assertInvalid("max_workers: [4\n", "Cannot parse")
+        with self.assertRaises(ConfigError):
+            ConfigManager(self.write('config.json', '{"max_workers": 4,}'), {})
+
+    def test_unsupported_format_fails(self):
+        with self.assertRaises(ConfigError):
+            ConfigManager(self.write('config.toml', 'max_workers = 4'), {})
+
+    def test_every_problem_is_reported(self):
+        self.assertInvalid(
+            "max_workrs: 4\nmax_scrolls: many\nwait_strategy: sleep\nmax_workers: 0\n",
+            "unknown setting 'max_workrs' (did you mean 'max_workers'?)",
+            "max_scrolls: expected int, got 'many'",
+            "wait_strategy: expected one of settle, fixed, got 'sleep'",
+            "max_workers: must be at least 1, got 0")
+
+    def test_bounds(self):
+        self.assertInvalid("shard_max_mb: 0\n", "shard_max_mb: must be greater than 0")
+        self.assertInvalid("dedup_max_distance: 8\n", "dedup_max_distance: must be at most 7")
+        self.assertInvalid("crawl_false_positive_rate: 1\n", "crawl_false_positive_rate: must be less than 1")
+        self.assertEqual(self.load("shard_max_mb: 0.5\ndedup_max_distance: 7\n").get('dedup_max_distance'), 7)
+
+    def test_environment_overrides(self):
+        config = self.load("max_workers: 2\nuser_agent: file\n",
+                           {'WCP_MAX_WORKERS': '8', 'wcp_user_agent': '8', 'WCP_BLOCKED_HOSTS': '[a.org, b.org]',
+                            'WCP_MAX_LINKS': '', 'OTHER': '1'})
+        self.assertEqual(config.get('max_workers'), 8)
+        self.assertEqual(config.get('user_agent'), '8')
+        self.assertEqual(config.get('blocked_hosts'), ['a.org', 'b.org'])
+        self.assertIsNone(config.get('max_links'))
+
+    def test_invalid_environment_override_fails(self):
+        self.assertInvalid("max_workers: 2\n", "max_workers: expected int", environ={'WCP_MAX_WORKERS': 'eight'})
+        self.assertInvalid("", "unknown setting 'max_wrkers'", environ={'WCP_MAX_WRKERS': '2'})
+
+    def test_domain_profiles(self):
+        config = self.load(
+            "max_scrolls: 5\n"
+            "domain_profiles:\n"
+            "  Example.com: {max_scrolls: 0, wait_strategy: fixed}\n"
+            "  news.example.com: {max_scrolls: 20}\n")
+        self.assertEqual(config.get('max_scrolls', host='example.com'), 0)
+        self.assertEqual(config.get('max_scrolls', host='www.example.com:8080'), 0)
+        self.assertEqual(config.get('max_scrolls', host='news.example.com'), 20)
+        self.assertEqual(config.get('wait_strategy', host='news.example.com'), 'settle')
+        self.assertEqual(config.get('max_scrolls', host='example.org'), 5)
+        self.assertEqual(config.get('max_scrolls', host='notexample.com'), 5)
+        self.assertEqual(config.get('max_scrolls'), 5)
+
+    def test_invalid_domain_profiles(self):
+        self.assertInvalid("domain_profiles:\n  a.org: {max_scroll: 1, fetch_mode: http}\n",
+                           "unknown setting 'domain_profiles.a.org.max_scroll'",
+                           "domain_profiles.a.org.fetch_mode: expected one of auto, browser")
+        self.assertInvalid("domain_profiles: [a.org]\n", "domain_profiles: expected a mapping")
+
+    def test_update_is_validated(self):
+        config = self.load("max_workers: 2\n")
+        config.update({'MAX_WORKERS': 6})
+        self.assertEqual(config.get('max_workers'), 6)
+        with self.assertRaises(ConfigError):
+            config.update({'max_workers': -1})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from src.fetch_cache import FetchCache
+
+
+class TestFetchCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'cache', 'fetch_cache.sqlite3')
+        self.cache = FetchCache(self.path)
+        self.addCleanup(lambda: self.cache.close())
+
+    def test_urls_with_the_same_output_filename_have_separate_entries(self):
+        self.cache.put('https://a.org/a-b', '"1"', None, 'hash-dash')
+        self.cache.put('https://a.org/a_b', '"2"', None, 'hash-underscore')
+        self.cache.put('http://a.org/a-b', None, 'Mon, 01 Jan 2024 00:00:00 GMT', 'hash-http')
+        self.assertEqual(self.cache.get('https://a.org/a-b').etag, '"1"')
+        self.assertEqual(self.cache.get('https://a.org/a_b').content_hash, 'hash-underscore')
+        self.assertEqual(self.cache.get('http://a.org/a-b').content_hash, 'hash-http')
+        self.assertIsNone(self.cache.get('https://a.org/a.b'))
+
+    def test_spellings_of_the_same_url_share_an_entry(self):
+        self.cache.put('https://A.org:443/p?b=2&a=1&utm_source=x', None, None, 'hash')
+        entry = self.cache.get('https://a.org/p?a=1&b=2#top')
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.url, 'https://A.org:443/p?b=2&a=1&utm_source=x')
+
+    def test_entries_persist(self):
+        self.cache.put('https://a.org/', '"x"', None, FetchCache.content_hash('text'))
+        self.cache.close()
+        self.cache = FetchCache(self.path)
+        self.assertEqual(self.cache.get('https://a.org/').content_hash, FetchCache.content_hash('text'))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import unittest
+from src.frontier import BloomFilter, CrawlFrontier
+from src.url_utils import canonicalize_url
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_add_reports_new_items(self):
+        bloom = BloomFilter(1000)
+        self.assertTrue(bloom.add(b'/a'))
+        self.assertFalse(bloom.add(b'/a'))
+        self.assertIn(b'/a', bloom)
+        self.assertNotIn(b'/b', bloom)
+
+
+class TestCrawlFrontier(unittest.TestCase):
+    def setUp(self):
+        self.frontier = CrawlFrontier('https://example.com', expected_urls=1000)
+
+    def test_accepts_urls_of_the_origin(self):
+        self.assertTrue(self.frontier.add('https://example.com/', 0))
+        self.assertTrue(self.frontier.add('https://example.com/a?b=1', 1))
+        self.assertFalse(self.frontier.add('https://example.com/a?b=1', 1))
+
+    def test_rejects_lookalike_hosts_and_other_ports(self):
+        for url in ('https://example.com.evil.org/x', 'https://example.comx/', 'https://example.com:8443/y',
+                    'http://example.com/', 'https://sub.example.com/'):
+            with self.subTest(url=url):
+                self.assertFalse(self.frontier.is_internal(url))
+                self.assertFalse(self.frontier.add(url, 0))
+        self.assertEqual(self.frontier.queued, 0)
+
+    def test_default_port_is_internal_after_canonicalization(self):
+        self.assertTrue(self.frontier.add(canonicalize_url('https://EXAMPLE.com:443/p'), 0))
+
+    def test_pops_breadth_first(self):
+        self.frontier.add('https://example.com/deep', 2)
+        self.frontier.add('https://example.com/', 0)
+        self.frontier.add('https://example.com/seen', 1, enqueue=False)
+        self.frontier.add('https://example.com/next', 1)
+        self.assertEqual([self.frontier.pop() for _ in range(4)],
+                         [('https://example.com/', 0), ('https://example.com/next', 1),
+                          ('https://example.com/deep', 2), None])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,72 @@
+import glob
+import os
+import unittest
+from src.html_cleaner import clean_html_bs4, clean_html_lxml, clean_html_stream, get_html_backend, lxml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures', 'html')
+
+# Markup the stream backend has to handle the way BeautifulSoup with html.parser does.
+EDGE_CASES = {
+    'removed subtrees': "<body><nav>menu</nav><header>top</header><p>kept</p><script>var x;</script>"
+                        "<style>p {}</style><aside>side</aside><footer>bottom</footer></body>",
+    'main before article': "<body><article>article</article><main>main <b>text</b></main></body>",
+    'article before content div': "<body><div class='x content'>div</div><article>article</article></body>",
+    'content div': "<body><p>outside</p><div class='content wide'>inside</div></body>",
+    'first of several': "<body><main>first</main><main>second</main></body>",
+    'nested candidates': "<body><main><article>inner</article> outer</main></body>",
+    'no body': "plain <b>text</b> only",
+    'empty': "",
+    'void end tags': "<body>line<br></br>break<img src='a'></img>after<hr/>rule</body>",
+    'non-text containers': "<body><template>hidden</template><ruby>kan<rt>kan</rt><rp>(</rp></ruby>ji</body>",
+    'comments and declarations': "<!DOCTYPE html><body>one<!-- note -->two<?pi x?>three</body>",
+    'cdata': "<body>before<![CDATA[inside]]>after</body>",
+    'unclosed tags': "<body><main><p>open<div>still open</main><p>after</body>",
+    'stray end tags': "<body></span>text</em><main>main</b> text</main></body>",
+    'entities': "<body><p>a &amp; b &lt;c&gt; &nbsp;&eacute;</p></body>",
+    'whitespace': "<body>\n   <p>  spaced   out  </p>\n\n<p>\tnext\t</p>  </body>",
+}
+
+
+def load_fixtures():
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+
+class TestBackendEquivalence(unittest.TestCase):
+    def test_stream_matches_bs4_on_edge_cases(self):
+        for name, html in EDGE_CASES.items():
+            with self.subTest(name):
+                self.assertEqual(clean_html_stream(html), clean_html_bs4(html))
+
+    def test_stream_matches_bs4_on_fixture_pages(self):
+        pages = load_fixtures()
+        self.assertTrue(pages, f"no fixture pages in {FIXTURES}")
+        for name, html in pages.items():
+            with self.subTest(name):
+                self.assertEqual(clean_html_stream(html), clean_html_bs4(html))
+
+    @unittest.skipIf(lxml is None, "lxml is not installed")
+    def test_lxml_matches_bs4_on_fixture_pages(self):
+        for name, html in load_fixtures().items():
+            with self.subTest(name):
+                self.assertEqual(clean_html_lxml(html), clean_html_bs4(html))
+
+    def test_main_content_is_selected(self):
+        html = EDGE_CASES['main before article']
+        self.assertEqual(clean_html_stream(html), "main\ntext")
+        self.assertEqual(clean_html_stream(EDGE_CASES['removed subtrees']), "kept")
+
+
+class TestGetHtmlBackend(unittest.TestCase):
+    def test_known_backends(self):
+        self.assertIs(get_html_backend('stream'), clean_html_stream)
+        self.assertIs(get_html_backend('bs4'), clean_html_bs4)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_html_backend('regex')
\ No newline at end of file
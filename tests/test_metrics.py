@@ -0,0 +1,30 @@
+import unittest
+from src.metrics import MetricsRecorder
+
+
+class TestMetricsRecorder(unittest.TestCase):
+    def record(self, recorder: MetricsRecorder) -> MetricsRecorder:
+        for host in ('a.org', 'b.org', 'c.org'):
+            recorder.observe('fetch_http', 0.2, host=host, nbytes=100)
+        recorder.observe('fetch_http', 100.0, host='a.org')
+        return recorder
+
+    def test_hosts_are_merged_by_default(self):
+        recorder = self.record(MetricsRecorder(directory=''))
+        self.assertEqual(list(recorder.histograms), [('fetch_http', '')])
+        text = recorder.prometheus_text()
+        self.assertNotIn('host="a.org"', text)
+        self.assertIn('stage_duration_seconds_bucket{stage="fetch_http",host="",le="0.25"} 3', text)
+        self.assertIn('stage_duration_seconds_bucket{stage="fetch_http",host="",le="+Inf"} 4', text)
+
+    def test_per_host_figures(self):
+        recorder = self.record(MetricsRecorder(directory='', per_host=True))
+        self.assertEqual(len(recorder.histograms), 3)
+        self.assertIn('le="+Inf"} 2', recorder.prometheus_text())
+
+    def test_merged_figures_add_up(self):
+        recorder = MetricsRecorder(directory='')
+        recorder.merge(self.record(MetricsRecorder(directory='')).drain())
+        recorder.merge(self.record(MetricsRecorder(directory='')).drain())
+        total = recorder.summary()['stages']['fetch_http']['total']
+        self.assertEqual((total['count'], total['bytes']), (8, 600))
\ No newline at end of file
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import tempfile
+import threading
+import types
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from benchmarks.fixture_server import FixtureServer, FixtureSite
+from src.config_manager import ConfigManager
+from src.link_extractor import links_in_html
+from src.pipeline import Pipeline
+from src.scraper import Scraper
+from src.shard_store import MARKDOWN_SHARD_DIR, ShardStore
+from tests.test_scrape_workers import launch_browser, new_page
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setUpModule():
+    os.makedirs('logs', exist_ok=True)
+
+
+# Each page has enough text to be taken over plain HTTP.
+FILLER = "<p>" + "Some words of text on the page. " * 20 + "</p>"
+PAGES = {
+    '/': '<a href="/a">A</a> <a href="b">B</a> <a href="https://other.org/">elsewhere</a>',
+    '/a': '<a href="/b">B</a> <a href="/c?utm_source=x">C</a>',
+    '/b': '<a href="/">home</a>',
+    '/c': '<a href="/d">D, too deep to be followed</a>',
+}
+
+
+class LinkedSiteHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get('If-None-Match')))
+        body = PAGES.get(self.path.split('?')[0])
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{self.path}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        data = f"<html><body><main>{body}{FILLER}</main></body></html>".encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def without_browser(scraper: Scraper) -> Scraper:
+    scraper.launch_browser = types.MethodType(launch_browser, scraper)
+    scraper.new_page = types.MethodType(new_page, scraper)
+    return scraper
+
+
+class TestPipelineShards(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.shard_dir = os.path.join(directory.name, 'shards')
+        self.server = FixtureServer(FixtureSite(3)).__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.urls = [self.server.url(path) for path in self.server.site.paths('static')]
+        self.config = ConfigManager(os.path.join(ROOT, 'configs', 'config.yaml'))
+        self.config.update({
+            'output_format': 'shards', 'shard_dir': self.shard_dir, 'delay_min': 0, 'delay_max': 0,
+            'metrics_enabled': False, 'scrape_journal': False,
+            'fetch_cache_path': os.path.join(directory.name, 'fetch_cache.sqlite3'),
+        })
+
+    def read_store(self, directory):
+        store = ShardStore(directory)
+        try:
+            return {entry.url: (store.read(entry).text, entry.source_hash) for entry in store.entries()}
+        finally:
+            store.close()
+
+    def run_pipeline(self) -> Pipeline:
+        pipeline = Pipeline(self.config)
+        without_browser(pipeline.scraper)
+        asyncio.run(pipeline.run(urls=self.urls))
+        return pipeline
+
+    def test_markdown_is_kept_apart_from_scraped_text(self):
+        # Text scraped earlier, whose pages the fetch cache already knows as unchanged.
+        asyncio.run(without_browser(Scraper(self.config)).scrape_urls(self.urls, resume=False))
+        text = self.read_store(self.shard_dir)
+        self.assertEqual(set(text), set(self.urls))
+
+        self.assertEqual(self.run_pipeline().counts['converted'], len(self.urls))
+        markdown = self.read_store(os.path.join(self.shard_dir, MARKDOWN_SHARD_DIR))
+        self.assertEqual(set(markdown), set(self.urls))
+        for url, (document, source_hash) in markdown.items():
+            self.assertEqual(source_hash, ShardStore.content_hash(text[url][0]))
+            self.assertNotEqual(document, text[url][0])
+
+        # A rerun finds the markdown up to date and rewrites neither store.
+        self.assertEqual(self.run_pipeline().counts['converted'], 0)
+        self.assertEqual(self.read_store(self.shard_dir), text)
+        self.assertEqual(self.read_store(os.path.join(self.shard_dir, MARKDOWN_SHARD_DIR)), markdown)
+
+class TestLinksInHtml(unittest.TestCase):
+    def test_internal_links_in_document_order(self):
+        html = ('<base href="/docs/"><a href="page">1</a><a href="HTTP://A.org:443/x#top">2</a>'
+                '<a href="https://b.org/">3</a><a href="mailto:me@a.org">4</a><a href="http://[::1">5</a>'
+                '<a href="/y?utm_source=feed">6</a>')
+        self.assertEqual(links_in_html(html, 'https://a.org/index.html'),
+                         ['https://a.org/docs/page', 'https://a.org/y'])
+
+
+class TestPipelineCrawl(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), LinkedSiteHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.site = f"http://127.0.0.1:{self.server.server_port}"
+        self.links_file = os.path.join('data', 'input', f"127.0.0.1:{self.server.server_port}_links.txt")
+        self.addCleanup(lambda: os.path.exists(self.links_file) and os.remove(self.links_file))
+        LinkedSiteHandler.requests = []
+        self.config = ConfigManager(os.path.join(ROOT, 'configs', 'config.yaml'))
+        self.config.update({
+            'output_format': 'shards', 'shard_dir': os.path.join(directory.name, 'shards'),
+            'delay_min': 0, 'delay_max': 0, 'metrics_enabled': False, 'scrape_journal': False,
+            'fetch_cache_path': os.path.join(directory.name, 'fetch_cache.sqlite3'),
+        })
+
+    def run_pipeline(self) -> Pipeline:
+        pipeline = Pipeline(self.config)
+        without_browser(pipeline.scraper)
+        asyncio.run(pipeline.run(start_url=self.site + '/', max_depth=1))
+        return pipeline
+
+    def test_every_page_is_fetched_once(self):
+        pipeline = self.run_pipeline()
+        self.assertEqual(sorted(path for path, _ in LinkedSiteHandler.requests), ['/', '/a', '/b', '/c'])
+        self.assertEqual(pipeline.counts['crawled'], 3)
+        self.assertEqual(pipeline.counts['converted'], 4)
+        with open(self.links_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read().split(), [self.site + '/a', self.site + '/b', self.site + '/c'])
+
+    def test_rerun_reads_the_links_again(self):
+        self.run_pipeline()
+        LinkedSiteHandler.requests = []
+        pipeline = self.run_pipeline()
+        # Pages whose links are read are fetched in full; the others may be answered with 304.
+        self.assertEqual(sorted(LinkedSiteHandler.requests),
+                         [('/', None), ('/a', None), ('/b', None), ('/c', '"/c"')])
+        self.assertEqual(pipeline.counts['crawled'], 3)
+        self.assertEqual(pipeline.scraper.cache_counts['hits'], 1)
\ No newline at end of file
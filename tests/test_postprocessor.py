@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from src.config_manager import ConfigManager
+from src.postprocessor import LINE_BLOCK_SIZE, Postprocessor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE = (
+    "Title line\n"
+    "\n"
+    "# Already a heading\n"
+    "- a bullet\n"
+    "$ pip install thing\n"
+    "$ run thing\n"
+    "plain text after code\n"
+    "  indented text  \n"
+    "line\x0bwith a vertical tab\r\n"
+    "**bold** and [link](https://a.org)\n"
+)
+
+
+def setUpModule():
+    os.makedirs('logs', exist_ok=True)
+
+
+def make_postprocessor(**overrides) -> Postprocessor:
+    config = ConfigManager(os.path.join(ROOT, 'configs', 'config.yaml'), {})
+    config.update({'metrics_enabled': False, 'supported_file_types': ['.txt', '.html'], **overrides})
+    return Postprocessor(config)
+
+
+class TestMarkdownConversion(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_line_kinds(self):
+        markdown = make_postprocessor().document_to_markdown(SAMPLE, lambda current, total: None)
+        self.assertEqual(markdown.split('\n')[:10], [
+            'Title line', '', '', '# Already a heading', '- a bullet', '```', '$ pip install thing', '$ run thing',
+            '```', ''])
+        self.assertIn('indented text\n\n', markdown)
+
+    def progress_reports(self, postprocessor: Postprocessor, text: str) -> list:
+        reports = []
+        postprocessor.document_to_markdown(text, lambda current, total: reports.append(current))
+        return reports
+
+    def test_progress_frequency_does_not_change_the_blocks(self):
+        lines = ['text'] * (LINE_BLOCK_SIZE * 2 + 1)
+        for frequency in (1, LINE_BLOCK_SIZE * 3):
+            with self.subTest(frequency):
+                postprocessor = make_postprocessor(progress_update_frequency=frequency)
+                self.assertEqual([count for _, count in postprocessor.iter_markdown(lines)],
+                                 [LINE_BLOCK_SIZE, LINE_BLOCK_SIZE, 1])
+                expected = [LINE_BLOCK_SIZE, LINE_BLOCK_SIZE * 2, len(lines)] if frequency == 1 else [len(lines)]
+                self.assertEqual(self.progress_reports(postprocessor, '\n'.join(lines)), expected)
+
+    def test_streaming_matches_in_memory_conversion(self):
+        # Enough lines to span several blocks, with a code block across a block boundary.
+        text = SAMPLE * (LINE_BLOCK_SIZE // 10) + "$ first\n" * 3 + SAMPLE * 5
+        source = self.directory / 'page.txt'
+        source.write_text(text, encoding='utf-8', newline='')
+        outputs = {}
+        for streaming in (True, False):
+            output = self.directory / f"page-{streaming}.md"
+            postprocessor = make_postprocessor(streaming_conversion=streaming)
+            self.assertEqual(postprocessor.process_file(source, output, lambda current, total: None), (source, None))
+            outputs[streaming] = output.read_text(encoding='utf-8')
+        self.assertEqual(outputs[True], outputs[False])
+        with open(source, 'r', encoding='utf-8') as f:
+            self.assertEqual(outputs[True], make_postprocessor().document_to_markdown(f.read(), lambda c, t: None))
+        self.assertEqual([path.name for path in self.directory.iterdir() if path.suffix == '.part'], [])
+
+
+class TestConvertFiles(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.input = Path(directory.name) / 'input'
+        self.output = Path(directory.name) / 'output'
+        for host in ('a.com', 'b.com'):
+            (self.input / host).mkdir(parents=True)
+            (self.input / host / 'index.txt').write_text(f"Home page of {host}\n", encoding='utf-8')
+        (self.input / 'a.com' / 'docs').mkdir()
+        (self.input / 'a.com' / 'docs' / 'index.txt').write_text("Docs of a.com\n", encoding='utf-8')
+
+    def converted(self):
+        return {str(path.relative_to(self.output)): path.read_text(encoding='utf-8')
+                for path in self.output.rglob('*.md') if path.name != 'conversion_report.md'}
+
+    def test_same_file_names_of_different_hosts_are_kept_apart(self):
+        for executor in ('thread', 'process'):
+            for streaming in (True, False):
+                with self.subTest(executor=executor, streaming=streaming):
+                    postprocessor = make_postprocessor(conversion_executor=executor, streaming_conversion=streaming,
+                                                       incremental_conversion=False, conversion_processes=2)
+                    message = postprocessor.convert_files(str(self.input), str(self.output))
+                    self.assertTrue(message.startswith("Conversion completed"), message)
+                    self.assertEqual(self.converted(), {
+                        os.path.join('a.com', 'index.md'): "Home page of a.com\n\n",
+                        os.path.join('b.com', 'index.md'): "Home page of b.com\n\n",
+                        os.path.join('a.com', 'docs', 'index.md'): "Docs of a.com\n\n",
+                    })
+
+    def test_converting_in_place_writes_next_to_the_text(self):
+        message = make_postprocessor().convert_files(str(self.input), str(self.input))
+        self.assertTrue(message.startswith("Conversion completed"), message)
+        self.assertEqual((self.input / 'b.com' / 'index.md').read_text(encoding='utf-8'), "Home page of b.com\n\n")
+        # The markdown written by the first run is not taken as input by the second.
+        postprocessor = make_postprocessor()
+        postprocessor.convert_files(str(self.input), str(self.input))
+        self.assertEqual(len(postprocessor.reporter.skipped_files), 3)
+        self.assertEqual(postprocessor.reporter.processed_files, [])
+
+    def test_outputs_nested_in_the_input_are_not_converted_again(self):
+        output = self.input / 'md'
+        for _ in range(2):
+            postprocessor = make_postprocessor(supported_file_types=['.txt', '.md'])
+            message = postprocessor.convert_files(str(self.input), str(output))
+            self.assertTrue(message.startswith("Conversion completed"), message)
+        self.assertEqual(postprocessor.reporter.processed_files, [])
+        self.assertEqual(len(postprocessor.reporter.skipped_files), 3)
+        self.assertFalse((output / 'md').exists())
+        self.assertEqual((output / 'a.com' / 'docs' / 'index.md').read_text(encoding='utf-8'), "Docs of a.com\n\n")
+
+    def test_inputs_sharing_an_output_are_reported(self):
+        (self.input / 'b.com' / 'index.html').write_text("Other home page\n", encoding='utf-8')
+        postprocessor = make_postprocessor()
+        postprocessor.convert_files(str(self.input), str(self.output))
+        self.assertEqual(list(postprocessor.reporter.failed_files), [str((self.input / 'b.com' / 'index.txt').resolve())])
+        self.assertEqual(self.converted()[os.path.join('b.com', 'index.md')], "Other home page\n\n")
+
+    def test_unchanged_files_are_skipped(self):
+        make_postprocessor().convert_files(str(self.input), str(self.output))
+        (self.input / 'b.com' / 'index.txt').write_text("Changed\n", encoding='utf-8')
+        postprocessor = make_postprocessor()
+        postprocessor.convert_files(str(self.input), str(self.output))
+        self.assertEqual(postprocessor.reporter.processed_files, [str((self.input / 'b.com' / 'index.txt').resolve())])
+        self.assertEqual(self.converted()[os.path.join('b.com', 'index.md')], "Changed\n\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
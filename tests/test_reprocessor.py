@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from src.config_manager import ConfigManager
+from src.html_store import HtmlStore
+from src.postprocessor import Postprocessor
+from src.reprocessor import Reprocessor
+from src.shard_store import MARKDOWN_SHARD_DIR, ShardStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE = "<html><body><h1>{title}</h1><p>{body}</p></body></html>"
+
+
+def setUpModule():
+    os.makedirs('logs', exist_ok=True)
+
+
+class TestReprocessShards(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.html_dir = os.path.join(self.directory, 'html')
+        self.shard_dir = os.path.join(self.directory, 'shards')
+        self.config = ConfigManager(os.path.join(ROOT, 'configs', 'config.yaml'))
+        self.config.update({'raw_html_dir': self.html_dir, 'output_format': 'shards', 'shard_dir': self.shard_dir,
+                            'metrics_enabled': False, 'fetch_cache': False, 'scrape_journal': False})
+
+    def store_pages(self, pages):
+        store = HtmlStore(self.html_dir)
+        try:
+            for url, html in pages.items():
+                store.put(url, url.rsplit('/', 1)[-1], store.write_blob(html), 'http')
+        finally:
+            store.close()
+
+    def read_store(self, directory):
+        store = ShardStore(directory)
+        try:
+            return {record.url: record.text for record in store.documents()}
+        finally:
+            store.close()
+
+    def test_markdown_leaves_the_text_shards_alone(self):
+        self.store_pages({'https://a.org/one': PAGE.format(title="One", body="first page")})
+        Reprocessor(self.config).run()
+        text = self.read_store(self.shard_dir)
+        self.assertIn("first page", text['https://a.org/one'])
+
+        counts = Reprocessor(self.config).run(to_markdown=True)
+        self.assertEqual(counts['written'], 1)
+        self.assertEqual(self.read_store(self.shard_dir), text)
+        markdown = self.read_store(os.path.join(self.shard_dir, MARKDOWN_SHARD_DIR))
+        self.assertIn("first page", markdown['https://a.org/one'])
+
+    def test_markdown_follows_changed_pages(self):
+        url = 'https://a.org/page'
+        self.store_pages({url: PAGE.format(title="Old", body="old wording")})
+        Reprocessor(self.config).run(to_markdown=True)
+        self.store_pages({url: PAGE.format(title="New", body="new wording")})
+        Reprocessor(self.config).run(to_markdown=True)
+        markdown = self.read_store(os.path.join(self.shard_dir, MARKDOWN_SHARD_DIR))[url]
+        self.assertIn("new wording", markdown)
+        self.assertNotIn("old wording", markdown)
+
+
+class TestConvertShards(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.source_dir = os.path.join(directory.name, 'text')
+        self.target_dir = os.path.join(directory.name, 'markdown')
+        config = ConfigManager(os.path.join(ROOT, 'configs', 'config.yaml'))
+        config.update({'metrics_enabled': False, 'incremental_conversion': True})
+        self.postprocessor = Postprocessor(config)
+
+    def write_text(self, documents):
+        store = ShardStore(self.source_dir)
+        try:
+            for url, text in documents.items():
+                # Same fetch time every time, as when the text is rewritten from cached HTML.
+                store.add(url, text, url.rsplit('/', 1)[-1], fetched_at=1000.0)
+        finally:
+            store.close()
+
+    def convert(self):
+        self.postprocessor.convert_shards(self.source_dir, self.target_dir)
+        store = ShardStore(self.target_dir)
+        try:
+            return {record.url: record.text for record in store.documents()}, \
+                {entry.url: entry.source_hash for entry in store.entries()}
+        finally:
+            store.close()
+
+    def test_rewritten_text_is_converted_again(self):
+        self.write_text({'https://a.org/a': "first version", 'https://a.org/b': "unchanged"})
+        _, hashes = self.convert()
+        self.assertEqual(hashes['https://a.org/b'], ShardStore.content_hash("unchanged"))
+
+        self.write_text({'https://a.org/a': "second version", 'https://a.org/b': "unchanged"})
+        markdown, hashes = self.convert()
+        self.assertIn("second version", markdown['https://a.org/a'])
+        self.assertEqual(hashes['https://a.org/a'], ShardStore.content_hash("second version"))
+        self.assertEqual(self.postprocessor.reporter.skipped_files, ['https://a.org/b'])
\ No newline at end of file
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from benchmarks.fixture_server import FixtureServer, FixtureSite
+from src.config_manager import ConfigManager
+from src.fetch_cache import FetchCache
+from src.html_store import HtmlStore
+from src.scrape_workers import ScrapeWorkerPool
+from src.scraper import Scraper
+from src.shard_store import ShardStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setUpModule():
+    os.makedirs('logs', exist_ok=True)
+
+
+class Context:
+    async def close(self):
+        pass
+
+
+class Page:
+    """Stands in for a browser page; the fixture pages are all fetched over HTTP."""
+    context = Context()
+
+    def on(self, event, handler):
+        pass
+
+    def is_closed(self):
+        return False
+
+
+class Browser:
+    async def close(self):
+        pass
+
+
+async def launch_browser(scraper, playwright):
+    return Browser()
+
+
+async def new_page(scraper, browser):
+    return Page()
+
+
+class WorkerConfig(ConfigManager):
+    """Configuration that, once unpickled in a worker process, replaces the browser there with a stand-in."""
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        Scraper.launch_browser = launch_browser
+        Scraper.new_page = new_page
+
+
+class TestScrapeWorkerPool(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.server = FixtureServer(FixtureSite(10), host='0.0.0.0').__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def test_workers_share_the_stores(self):
+        # Four hosts, so that both workers get URLs of their own.
+        urls = [self.server.url(path).replace('0.0.0.0', f"127.0.0.{host}")
+                for host in range(1, 5) for path in self.server.site.paths('static')]
+        config = WorkerConfig(os.path.join(ROOT, 'configs', 'config.yaml'))
+        config.update({
+            'scrape_processes': 2, 'max_workers': 2, 'delay_min': 0, 'delay_max': 0, 'queue_poll_interval': 0.1,
+            # Leases of workers that died expire soon, so that a broken run fails instead of hanging.
+            'queue_lease_seconds': 10,
+            'metrics_enabled': False, 'output_format': 'shards', 'queue_dir': os.path.join(self.directory, 'queue'),
+            'shard_dir': os.path.join(self.directory, 'shards'), 'raw_html_cache': True,
+            'raw_html_dir': os.path.join(self.directory, 'html'),
+            'fetch_cache_path': os.path.join(self.directory, 'fetch_cache.sqlite3'),
+        })
+        self.assertEqual(ScrapeWorkerPool(config).run(urls), (len(urls), 0))
+
+        shards = ShardStore(config.get('shard_dir'))
+        try:
+            records = {record.url: record for record in shards.documents()}
+            self.assertEqual(set(records), set(urls))
+            self.assertTrue(all(record.text for record in records.values()))
+            self.assertEqual({entry.shard.rsplit('-', 1)[0] for entry in shards.entries()},
+                             {'shard-w0', 'shard-w1'})
+        finally:
+            shards.close()
+        html = HtmlStore(config.get('raw_html_dir'))
+        try:
+            self.assertEqual({entry.url for entry in html.entries()}, set(urls))
+        finally:
+            html.close()
+        cache = FetchCache(config.get('fetch_cache_path'))
+        try:
+            self.assertTrue(all(cache.get(url) is not None for url in urls))
+        finally:
+            cache.close()
\ No newline at end of file
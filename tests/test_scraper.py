@@ -0,0 +1,128 @@
+import asyncio
+import os
+import unittest
+import httpx
+from src.config_manager import ConfigManager
+from src.fetch_policy import FetchError, classify_error
+from src.http_fetcher import HttpFetcher
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setUpModule():
+    os.makedirs('logs', exist_ok=True)
+
+
+def make_config(**overrides) -> ConfigManager:
+    config = ConfigManager(os.path.join(ROOT, 'configs', 'config.yaml'))
+    config.update({'fetch_cache': False, 'metrics_enabled': False, 'scrape_journal': False,
+                   'delay_min': 0, 'delay_max': 0, **overrides})
+    return config
+
+
+class BrowserPage:
+    """Stands in for a Playwright page and records the URLs it is asked to load."""
+
+    def __init__(self):
+        self.visited = []
+
+    async def goto(self, url, **kwargs):
+        self.visited.append(url)
+        raise AssertionError(f"{url} should not be rendered")
+
+
+class TestFetchPolicy(unittest.TestCase):
+    def setUp(self):
+        from src.fetch_policy import FetchPolicy
+
+        self.policy = FetchPolicy(make_config(breaker_threshold=2, fetch_retries=1, breaker_cooldown=60))
+
+    def test_classify_error(self):
+        self.assertEqual(classify_error(FetchError('http_429', 'HTTP 429')), 'http_429')
+        self.assertEqual(classify_error(asyncio.TimeoutError()), 'timeout')
+        self.assertEqual(classify_error(Exception('net::ERR_NAME_NOT_RESOLVED at https://a.invalid/')), 'dns')
+        self.assertEqual(classify_error(httpx.ConnectError('refused')), 'connection')
+        self.assertEqual(classify_error(ValueError('boom')), 'other')
+
+    def test_only_transient_errors_are_retried(self):
+        self.assertTrue(self.policy.should_retry('a.org', 'http_5xx', 0))
+        self.assertFalse(self.policy.should_retry('a.org', 'http_5xx', 1))
+        self.assertFalse(self.policy.should_retry('a.org', 'http_4xx', 0))
+
+    def test_circuit_opens_after_consecutive_host_failures(self):
+        self.policy.record_failure('a.org', 'timeout')
+        self.policy.record_failure('a.org', 'http_4xx')
+        self.assertTrue(self.policy.allow('a.org'))
+        self.policy.record_failure('a.org', 'dns')
+        self.assertFalse(self.policy.allow('a.org'))
+        self.assertTrue(self.policy.allow('b.org'))
+        self.assertEqual(self.policy.counts['circuits_opened'], 1)
+
+
+class TestScrapeUrl(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        from src.scraper import Scraper
+
+        self.scraper = Scraper(make_config(breaker_threshold=2, fetch_retries=0))
+        self.requests = []
+
+    async def use_http(self, status: int, body: str = '') -> None:
+        def respond(request: httpx.Request) -> httpx.Response:
+            self.requests.append(str(request.url))
+            return httpx.Response(status, text=body, headers={'content-type': 'text/html'})
+
+        fetcher = HttpFetcher('test')
+        fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        self.scraper.http_fetcher = fetcher
+        self.addAsyncCleanup(fetcher.close)
+
+    async def test_missing_page_is_final(self):
+        for status in (404, 410):
+            with self.subTest(status=status):
+                self.requests = []
+                await self.use_http(status)
+                page = BrowserPage()
+                self.assertFalse(await self.scraper.scrape_url(page, 'https://a.org/missing'))
+                self.assertEqual(self.requests, ['https://a.org/missing'])
+                self.assertEqual(page.visited, [])
+        self.assertEqual(self.scraper.fetch_policy.errors['http_4xx'], 2)
+
+    async def test_other_4xx_goes_to_the_browser(self):
+        rendered = []
+
+        async def render(page, url):
+            rendered.append(url)
+            return ''
+
+        self.scraper.scroll_and_extract = render
+        for status in (401, 403):
+            with self.subTest(status=status):
+                await self.use_http(status)
+                await self.scraper.scrape_url(BrowserPage(), f"https://a.org/{status}")
+        self.assertEqual(rendered, ['https://a.org/401', 'https://a.org/403'])
+
+    async def test_unsuccessful_scrape_does_not_reset_the_circuit(self):
+        async def nothing_scraped(page, url, timer):
+            return False
+
+        policy = self.scraper.fetch_policy
+        self.scraper._scrape_url_once = nothing_scraped
+        policy.record_failure('a.org', 'timeout')
+        self.assertFalse(await self.scraper.scrape_url(BrowserPage(), 'https://a.org/empty'))
+        policy.record_failure('a.org', 'timeout')
+        self.assertFalse(policy.allow('a.org'))
+
+    async def test_successful_scrape_resets_the_circuit(self):
+        async def scraped(page, url, timer):
+            return True
+
+        policy = self.scraper.fetch_policy
+        self.scraper._scrape_url_once = scraped
+        policy.record_failure('a.org', 'timeout')
+        self.assertTrue(await self.scraper.scrape_url(BrowserPage(), 'https://a.org/'))
+        policy.record_failure('a.org', 'timeout')
+        self.assertTrue(policy.allow('a.org'))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,130 @@
+import gzip
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.config_manager import ConfigManager
+from src.sitemap import SitemapParser, robots_sitemaps
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def urlset(*locations: str) -> bytes:
+    entries = ''.join(f"<url><loc>{location}</loc><lastmod>2024-01-01</lastmod></url>" for location in locations)
+    return f'<?xml version="1.0"?><urlset xmlns="{NAMESPACE}">{entries}</urlset>'.encode('utf-8')
+
+
+def sitemap_index(*locations: str) -> bytes:
+    entries = ''.join(f"<sitemap><loc>{location}</loc></sitemap>" for location in locations)
+    return f'<?xml version="1.0"?><sitemapindex xmlns="{NAMESPACE}">{entries}</sitemapindex>'.encode('utf-8')
+
+
+def setUpModule():
+    os.makedirs('logs', exist_ok=True)
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    files = {}
+
+    def do_GET(self):
+        body = self.files.get(self.path)
+        self.send_response(200 if body is not None else 404)
+        self.end_headers()
+        self.wfile.write(body or b'')
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSitemapParser(unittest.TestCase):
+    def parse(self, data: bytes, chunk_size: int = 7):
+        parser = SitemapParser()
+        entries = []
+        for start in range(0, len(data), chunk_size):
+            entries.extend(parser.feed(data[start:start + chunk_size]))
+        entries.extend(parser.close())
+        return entries
+
+    def test_urlset_in_small_chunks(self):
+        self.assertEqual(self.parse(urlset('https://a.org/1', ' https://a.org/2 ')),
+                         [('url', 'https://a.org/1'), ('url', 'https://a.org/2')])
+
+    def test_gzipped_sitemap_index(self):
+        self.assertEqual(self.parse(gzip.compress(sitemap_index('https://a.org/s1.xml')), 5),
+                         [('sitemap', 'https://a.org/s1.xml')])
+
+    def test_robots_sitemaps(self):
+        robots = "User-agent: *\nDisallow: /x\nSITEMAP: /index.xml # main\nsitemap:https://cdn.a.org/s.xml\n"
+        self.assertEqual(robots_sitemaps(robots, 'https://a.org/robots.txt'),
+                         ['https://a.org/index.xml', 'https://cdn.a.org/s.xml'])
+
+
+class TestReadSitemaps(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), SiteHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.site = f"http://127.0.0.1:{self.server.server_port}"
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def extractor(self, **overrides):
+        from src.link_extractor import LinkExtractor
+
+        config = ConfigManager(os.path.join(ROOT, 'configs', 'config.yaml'))
+        config.update({'max_links': None, **overrides})
+        return LinkExtractor(config)
+
+    async def test_skips_external_and_duplicate_entries(self):
+        site = self.site
+        SiteHandler.files = {
+            '/robots.txt': f"Sitemap: {site}/index.xml\n".encode('utf-8'),
+            '/index.xml': sitemap_index(f"{site}/pages.xml.gz", f"{site}/more.xml", f"{site}/missing.xml"),
+            '/pages.xml.gz': gzip.compress(urlset(*(f"{site}/page/{i}" for i in range(50)))),
+            '/more.xml': urlset(
+                f"{site}/page/1#top",
+                f"{site}/extra?utm_source=x",
+                f"http://127.0.0.1.evil.org:{self.server.server_port}/x",
+                "http://127.0.0.1:1/other-port",
+                f"https://127.0.0.1:{self.server.server_port}/other-scheme",
+                "https://example.org/",
+            ),
+            '/sitemap.xml': urlset(f"{site}/plain"),
+        }
+        extractor = self.extractor()
+        output_file = os.path.join(self.directory.name, 'links.txt')
+        found = []
+
+        async def on_link(link):
+            found.append(link)
+
+        links_written = await extractor.read_sitemaps(site + '/', output_file, on_link=on_link)
+        with open(output_file, encoding='utf-8') as f:
+            links = f.read().splitlines()
+
+        # Breadth-first: both root sitemaps come before the children of the index.
+        expected = [f"{site}/plain"] + [f"{site}/page/{i}" for i in range(50)] + [f"{site}/extra"]
+        self.assertEqual(links, expected)
+        self.assertEqual(found, expected)
+        self.assertEqual(links_written, len(expected))
+        self.assertEqual(extractor.sitemaps_read, 4)
+        self.assertEqual(extractor.duplicate_links, 1)
+
+    async def test_max_links(self):
+        SiteHandler.files = {'/sitemap.xml': urlset(*(f"{self.site}/p{i}" for i in range(20)))}
+        extractor = self.extractor(max_links=5)
+        output_file = os.path.join(self.directory.name, 'links.txt')
+        self.assertEqual(await extractor.read_sitemaps(self.site, output_file), 5)
+
+    async def test_sitemap_mode_without_sitemaps_writes_nothing(self):
+        SiteHandler.files = {}
+        extractor = self.extractor(link_discovery='sitemap')
+        output_file = os.path.join(self.directory.name, 'links.txt')
+        self.assertEqual(await extractor.discover(self.site, output_file), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
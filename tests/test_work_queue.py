@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from src.scrape_journal import JournalState, ScrapeJournal
+from src.work_queue import LeaseRecorder, WorkQueue
+
+
+class TestWorkQueue(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.queue = WorkQueue(os.path.join(directory.name, 'queue.sqlite3'), lease_seconds=60, max_attempts=2)
+        self.addCleanup(self.queue.close)
+        self.queue.add(['https://a.org/1', 'https://a.org/2', 'https://b.org/1'], 2)
+        self.queue.reset_workers(range(2))
+
+    def test_hosts_stay_on_one_shard(self):
+        claimed = {worker_id: [url for _, url in self.queue.claim(worker_id, 10)] for worker_id in range(2)}
+        self.assertEqual(sorted(claimed[0] + claimed[1]), ['https://a.org/1', 'https://a.org/2', 'https://b.org/1'])
+        self.assertIn(sorted(claimed.values(), key=len), [[['https://b.org/1'], ['https://a.org/1', 'https://a.org/2']]])
+
+    def test_failed_urls_are_given_up_after_their_attempts(self):
+        for _ in range(2):
+            for url_id, _ in self.queue.claim(0, 10) + self.queue.claim(1, 10):
+                self.queue.complete(url_id, False)
+        self.assertEqual(self.queue.counts()['failed'], 3)
+        self.assertEqual(self.queue.unfinished(), 0)
+
+    def test_postponed_urls_keep_their_attempts(self):
+        recorder = LeaseRecorder(self.queue)
+        for _ in range(3):
+            for url_id, url in self.queue.claim(0, 10) + self.queue.claim(1, 10):
+                recorder.lease(url_id, url)
+                recorder.skip(url, retry_after=0)
+        self.assertEqual(self.queue.counts()['failed'], 0)
+        self.assertEqual(self.queue.unfinished(), 3)
+
+    def test_postponed_urls_wait(self):
+        (url_id, _), *_ = self.queue.claim(0, 10)
+        self.queue.postpone(url_id, 60)
+        self.assertNotIn(url_id, [claimed_id for claimed_id, _ in self.queue.claim(0, 10) + self.queue.claim(1, 10)])
+
+
+class TestScrapeJournal(unittest.TestCase):
+    def test_skipped_urls_are_not_attempts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            journal = ScrapeJournal(os.path.join(directory, 'run.journal'))
+            journal.open()
+            journal.record('https://a.org/1', False)
+            journal.skip('https://a.org/1', 30)
+            journal.skip('https://a.org/2')
+            journal.record('https://a.org/3', True)
+            journal.close()
+            self.assertEqual(journal.load(), {
+                'https://a.org/1': JournalState(False, 1),
+                'https://a.org/3': JournalState(True, 0),
+            })
\ No newline at end of file